@@ -0,0 +1,219 @@
+"""
+Measure the throughput of the main genotyping stages on a synthetic cohort.
+
+Input data is generated with benchmarks/synthetic.py, so the benchmark runs
+offline and does not need the pypgx-bundle. A CNV caller is trained on the
+synthetic cohort instead of using a pre-trained one. Each stage runs in a
+forked process so that wall time and peak resident memory (RSS) are measured
+separately for every stage. Peak RSS includes the stage's input data. Example:
+
+    $ python benchmarks/stages.py
+    $ python benchmarks/stages.py --gene CYP2D6 --samples 1000 --repeat 3
+    $ python benchmarks/stages.py --samples 500 --json results.json
+
+Results saved with --json include the PyPGx version and can be compared
+across releases.
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import multiprocessing
+import os
+import platform
+import resource
+import statistics
+import sys
+import time
+import warnings
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import synthetic
+
+from pypgx import sdk
+from pypgx.api import core, genotype, utils
+from pypgx.version import __version__
+
+STAGES = [
+    'import_variants',
+    'phase_extension',
+    'create_consolidated_vcf',
+    'predict_alleles',
+    'compute_copy_number',
+    'train_cnv_caller',
+    'predict_cnv',
+    'call_genotypes',
+    'call_phenotypes',
+]
+
+# Stages whose output is needed by other stages.
+DEPENDS = {
+    'predict_alleles': ['import_variants'],
+    'train_cnv_caller': ['compute_copy_number'],
+    'predict_cnv': ['compute_copy_number', 'train_cnv_caller'],
+    'call_genotypes': ['predict_alleles', 'predict_cnv'],
+    'call_phenotypes': ['call_genotypes'],
+}
+
+def run_stage(name, gene, assembly, data):
+    """Run one stage and return its output."""
+    if name == 'import_variants':
+        return utils.import_variants(gene, data['vcf'], assembly=assembly)
+    if name == 'phase_extension':
+        return utils._phase_extension(data['imported'].data, gene, assembly)
+    if name == 'create_consolidated_vcf':
+        return utils.create_consolidated_vcf(data['imported'], data['phased'])
+    if name == 'predict_alleles':
+        return utils.predict_alleles(data['consolidated'])
+    if name == 'compute_copy_number':
+        return utils.compute_copy_number(data['read_depth'],
+            data['control_statistics'])
+    if name == 'train_cnv_caller':
+        return utils.train_cnv_caller(data['copy_number'], data['true_calls'])
+    if name == 'predict_cnv':
+        return utils.predict_cnv(data['copy_number'],
+            cnv_caller=data['cnv_caller'])
+    if name == 'call_genotypes':
+        return genotype.call_genotypes(alleles=data.get('alleles'),
+            cnv_calls=data.get('cnv_calls'))
+    if name == 'call_phenotypes':
+        return utils.call_phenotypes(data['genotypes'])
+    raise ValueError(f'Unknown stage: {name}')
+
+def _child(conn, name, gene, assembly, data):
+    warnings.simplefilter('ignore')
+    with contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        output = run_stage(name, gene, assembly, data)
+        seconds = time.perf_counter() - start
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    conn.send((seconds, rss, output))
+    conn.close()
+
+def measure(name, gene, assembly, data, repeat):
+    """
+    Run a stage ``repeat`` times and return median seconds, peak RSS in
+    bytes, and the stage output.
+    """
+    ctx = multiprocessing.get_context('fork')
+    times, peaks = [], []
+    for i in range(repeat):
+        parent, child = ctx.Pipe(duplex=False)
+        process = ctx.Process(target=_child,
+            args=(child, name, gene, assembly, data))
+        process.start()
+        child.close()
+        try:
+            seconds, rss, output = parent.recv()
+        except EOFError:
+            raise RuntimeError(f"Stage '{name}' failed") from None
+        finally:
+            process.join()
+        times.append(seconds)
+        peaks.append(rss)
+    # ru_maxrss is in kilobytes on Linux and in bytes on macOS.
+    scale = 1 if sys.platform == 'darwin' else 1024
+    return statistics.median(times), max(peaks) * scale, output
+
+def prepare(gene, samples, assembly, seed):
+    """Generate synthetic input data for all stages."""
+    data = {}
+    vf = synthetic.simulate_variants(gene, samples, assembly=assembly,
+        seed=seed)
+    data['vcf'] = vf
+    metadata = {'Platform': 'WGS', 'Gene': gene, 'Assembly': assembly}
+    data['imported'] = sdk.Archive(
+        {**metadata, 'SemanticType': 'VcfFrame[Imported]'},
+        vf.strip('GT:AD:DP').add_af().unphase()
+    )
+    data['phased'] = sdk.Archive(
+        {**metadata, 'SemanticType': 'VcfFrame[Phased]'},
+        vf.strip('GT')
+    )
+    if core.has_sv(gene):
+        copy_number, true_calls = synthetic.simulate_copy_number(gene,
+            samples, assembly=assembly, seed=seed)
+        data['true_calls'] = true_calls
+        data['read_depth'], data['control_statistics'] = \
+            synthetic.simulate_read_depth(copy_number, seed=seed)
+    return data
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--gene', default='CYP2D6',
+        help='Target gene (default: CYP2D6).')
+    parser.add_argument('--samples', type=int, default=200,
+        help='Number of synthetic samples (default: 200).')
+    parser.add_argument('--assembly', default='GRCh37',
+        help='Reference genome assembly (default: GRCh37).')
+    parser.add_argument('--repeat', type=int, default=1,
+        help='Number of runs per stage (default: 1).')
+    parser.add_argument('--seed', type=int, default=0,
+        help='Random seed (default: 0).')
+    parser.add_argument('--stages', nargs='+', choices=STAGES,
+        help='Only run these stages, along with the stages they depend on.')
+    parser.add_argument('--json', metavar='PATH',
+        help='Also write results to this JSON file.')
+    args = parser.parse_args()
+
+    warnings.simplefilter('ignore')
+    gene, assembly = args.gene, args.assembly
+    data = prepare(gene, args.samples, assembly, args.seed)
+
+    # Stages without their input are skipped (e.g. CNV stages for genes
+    # without SV).
+    requires = {
+        'compute_copy_number': 'read_depth',
+        'train_cnv_caller': 'copy_number',
+        'predict_cnv': 'cnv_caller',
+    }
+    outputs = {
+        'import_variants': 'consolidated',
+        'predict_alleles': 'alleles',
+        'compute_copy_number': 'copy_number',
+        'train_cnv_caller': 'cnv_caller',
+        'predict_cnv': 'cnv_calls',
+        'call_genotypes': 'genotypes',
+    }
+
+    selected = set(STAGES if args.stages is None else args.stages)
+    needed = set(selected)
+    for name in reversed(STAGES):
+        if name in needed:
+            needed.update(DEPENDS.get(name, []))
+
+    results = []
+    print(f'{"Stage":<26}{"Seconds":>10}{"Samples/s":>12}{"Peak RSS":>12}')
+    for name in STAGES:
+        if name not in needed:
+            continue
+        if name in requires and requires[name] not in data:
+            continue
+        repeat = args.repeat if name in selected else 1
+        seconds, rss, output = measure(name, gene, assembly, data, repeat)
+        if name in outputs:
+            data[outputs[name]] = output
+        if name not in selected:
+            continue
+        throughput = args.samples / seconds if seconds else float('inf')
+        results.append({
+            'stage': name, 'seconds': seconds,
+            'samples_per_second': throughput, 'peak_rss': rss,
+        })
+        print(f'{name:<26}{seconds:>10.3f}{throughput:>12.1f}'
+              f'{rss / 1024 ** 2:>9.0f} MiB')
+
+    if args.json:
+        report = {
+            'version': __version__, 'python': platform.python_version(),
+            'gene': gene, 'assembly': assembly, 'samples': args.samples,
+            'repeat': args.repeat, 'seed': args.seed, 'results': results,
+        }
+        with open(args.json, 'w') as f:
+            json.dump(report, f, indent=4)
+
+if __name__ == '__main__':
+    main()
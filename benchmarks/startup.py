@@ -0,0 +1,53 @@
+"""
+Measure the startup time of the pypgx command line interface.
+
+Each command is run several times in a fresh interpreter and the median wall
+clock time is reported. Example:
+
+    $ python benchmarks/startup.py
+    $ python benchmarks/startup.py --repeat 10 --archive control-statistics.zip
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+
+COMMANDS = [
+    ['-v'],
+    ['-h'],
+    ['print-metadata', '-h'],
+    ['run-ngs-pipeline', '-h'],
+]
+
+def measure(args, repeat):
+    times = []
+    for i in range(repeat):
+        start = time.perf_counter()
+        subprocess.run(
+            [sys.executable, '-m', 'pypgx'] + args, check=True,
+            stdout=subprocess.DEVNULL
+        )
+        times.append(time.perf_counter() - start)
+    return statistics.median(times)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeat', type=int, default=5,
+        help='Number of runs per command (default: 5).')
+    parser.add_argument('--archive',
+        help='Archive file used to also time print-metadata.')
+    args = parser.parse_args()
+
+    commands = list(COMMANDS)
+    if args.archive:
+        commands.append(['print-metadata', args.archive])
+
+    for command in commands:
+        seconds = measure(command, args.repeat)
+        print(f"{seconds:.3f}s\tpypgx {' '.join(command)}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,257 @@
+"""
+Generate a synthetic cohort for any target gene.
+
+Variants are taken from the allele and variant tables that ship with PyPGx,
+so no pypgx-bundle, reference genome, or BAM file is required. Each sample
+carries two randomly chosen star alleles without SV, and copy number
+profiles are simulated from noise-free templates with
+pypgx.sdk.simulate_copy_number. Example:
+
+    $ python benchmarks/synthetic.py CYP2D6 synthetic --samples 1000
+
+This writes phased variants (variants.vcf), CovFrame[ReadDepth]
+(read-depth.zip), SampleTable[Statistics] (control-statistics.zip), and the
+true CNV calls (cnv-calls.zip) to the output directory.
+"""
+
+import argparse
+import os
+
+import numpy as np
+import pandas as pd
+
+from pypgx.api import core
+from pypgx import sdk
+
+# CNVs with a simple whole-gene copy number, if defined for the gene.
+WHOLE_GENE_CNVS = {
+    'Normal': 2, 'WholeDel1': 1, 'WholeDel1Hom': 0, 'WholeDup1': 3,
+}
+
+def simulate_variants(gene, samples, assembly='GRCh37', depth=30, seed=0):
+    """
+    Simulate phased variants for the gene.
+
+    Parameters
+    ----------
+    gene : str
+        Target gene.
+    samples : int
+        Number of samples.
+    assembly : {'GRCh37', 'GRCh38'}, default: 'GRCh37'
+        Reference genome assembly.
+    depth : int, default: 30
+        Mean read depth.
+    seed : int, default: 0
+        Random seed.
+
+    Returns
+    -------
+    fuc.api.pyvcf.VcfFrame
+        Phased VcfFrame with GT, AD, and DP fields.
+    """
+    from fuc import pyvcf
+
+    rng = np.random.default_rng(seed)
+
+    table = core.load_allele_table()
+    table = table[(table.Gene == gene) & ~table.SV]
+    alleles = [
+        x for x in core.list_alleles(gene, assembly=assembly)
+        if x in set(table.StarAllele)
+    ]
+    definitions = [
+        core.list_variants(gene, alleles=[x], assembly=assembly)
+        for x in alleles
+    ]
+    variants = sorted(
+        set(x for l in definitions for x in l),
+        key=lambda x: int(x.split('-')[1])
+    )
+    index = {x: i for i, x in enumerate(variants)}
+
+    # Variant-by-allele matrix of 0/1 values.
+    carriers = np.zeros((len(variants), len(alleles)), dtype=np.int8)
+    for j, l in enumerate(definitions):
+        carriers[[index[x] for x in l], j] = 1
+
+    haplotypes = rng.integers(len(alleles), size=(2, samples))
+    h1 = carriers[:, haplotypes[0]]
+    h2 = carriers[:, haplotypes[1]]
+
+    dp = rng.poisson(depth, size=h1.shape)
+    fraction = (h1 + h2) / 2
+    fraction = np.clip(fraction + rng.normal(0, 0.03, size=h1.shape), 0, 1)
+    alt = rng.binomial(dp, fraction)
+    ref = dp - alt
+
+    gt = np.char.add(np.char.add(h1.astype(str), '|'), h2.astype(str))
+    ad = np.char.add(np.char.add(ref.astype(str), ','), alt.astype(str))
+    fields = np.char.add(np.char.add(gt, ':'), ad)
+    fields = np.char.add(np.char.add(fields, ':'), dp.astype(str))
+
+    names = [f'S{i:05d}' for i in range(samples)]
+    columns = [x.split('-') for x in variants]
+    df = pd.DataFrame({
+        'CHROM': [x[0] for x in columns],
+        'POS': [int(x[1]) for x in columns],
+        'ID': variants,
+        'REF': [x[2] for x in columns],
+        'ALT': [x[3] for x in columns],
+        'QUAL': '.',
+        'FILTER': '.',
+        'INFO': '.',
+        'FORMAT': 'GT:AD:DP',
+    })
+    df = pd.concat([df, pd.DataFrame(fields, columns=names)], axis=1)
+
+    meta = [
+        '##fileformat=VCFv4.2',
+        '##FORMAT=<ID=GT,Number=1,Type=String,Description="Genotype">',
+        '##FORMAT=<ID=AD,Number=R,Type=Integer,Description="Allelic depths">',
+        '##FORMAT=<ID=DP,Number=1,Type=Integer,Description="Read depth">',
+    ]
+
+    return pyvcf.VcfFrame(meta, df)
+
+def simulate_copy_number(gene, samples, assembly='GRCh37', seed=0):
+    """
+    Simulate copy number profiles and true CNV calls for the gene.
+
+    Returns
+    -------
+    tuple
+        CovFrame[CopyNumber] and SampleTable[CNVCalls] archives.
+    """
+    from fuc import pycov
+
+    np.random.seed(seed)
+
+    cnv_table = core.load_cnv_table()
+    names = [
+        x for x in cnv_table[cnv_table.Gene == gene].Name
+        if x in WHOLE_GENE_CNVS
+    ] or ['Normal']
+
+    chrom, region = core.get_region(gene, assembly=assembly).split(':')
+    start, end = [int(x) for x in region.split('-')]
+    positions = np.arange(start, end + 1)
+    starts = core.get_exon_starts(gene, assembly=assembly)
+    ends = core.get_exon_ends(gene, assembly=assembly)
+    body = (positions >= min(starts)) & (positions <= max(ends))
+
+    templates = {'Chromosome': chrom, 'Position': positions}
+    for name in names:
+        templates[name] = np.where(body, WHOLE_GENE_CNVS[name], 2.0)
+    metadata = {
+        'Gene': gene,
+        'Assembly': assembly,
+        'SemanticType': 'CovFrame[CopyNumber]',
+        'Platform': 'WGS',
+        'Control': 'VDR',
+        'Samples': 'None',
+    }
+    source = sdk.Archive(metadata, pycov.CovFrame(pd.DataFrame(templates)))
+
+    # Most samples are normal, the rest are split evenly between CNVs.
+    counts = {x: samples // (5 * len(names)) for x in names if x != 'Normal'}
+    counts['Normal'] = samples - sum(counts.values())
+
+    target = sdk.Archive(
+        metadata, pycov.CovFrame(source.data.df[['Chromosome', 'Position']])
+    )
+    calls = []
+    for name, n in counts.items():
+        if not n:
+            continue
+        target = sdk.simulate_copy_number(target, source, name, name, n=n)
+        target.data.df = target.data.df.drop(columns=name)
+        calls += [name] * n
+
+    # Use the same sample names as simulate_variants.
+    names = [f'S{i:05d}' for i in range(len(calls))]
+    target.data.df.columns = ['Chromosome', 'Position'] + names
+    copy_number = sdk.Archive(target.copy_metadata(),
+        pycov.CovFrame(target.data.df))
+    cnv_calls = sdk.Archive({
+        'Gene': gene,
+        'Assembly': assembly,
+        'SemanticType': 'SampleTable[CNVCalls]',
+        'Platform': 'WGS',
+        'Control': 'VDR',
+    }, pd.DataFrame({'CNV': calls}, index=names))
+
+    return copy_number, cnv_calls
+
+def simulate_read_depth(copy_number, depth=30, seed=0):
+    """
+    Convert copy number profiles to read depth and control statistics.
+
+    Returns
+    -------
+    tuple
+        CovFrame[ReadDepth] and SampleTable[Statistics] archives.
+    """
+    from fuc import pycov
+
+    rng = np.random.default_rng(seed)
+    samples = copy_number.data.samples
+    medians = rng.uniform(depth * 0.8, depth * 1.2, len(samples))
+    cn = copy_number.data.df[samples].to_numpy()
+    counts = rng.poisson(cn / 2 * medians).astype(np.int32)
+
+    df = copy_number.data.df[['Chromosome', 'Position']].copy()
+    df = pd.concat([df, pd.DataFrame(counts, columns=samples)], axis=1)
+    metadata = {
+        'Gene': copy_number.metadata['Gene'],
+        'Assembly': copy_number.metadata['Assembly'],
+        'SemanticType': 'CovFrame[ReadDepth]',
+        'Platform': 'WGS',
+    }
+    read_depth = sdk.Archive(metadata, pycov.CovFrame(df))
+
+    statistics = pd.DataFrame({
+        'count': 1000.0, 'mean': medians, 'std': np.sqrt(medians),
+        'min': 0.0, '25%': medians * 0.9, '50%': medians,
+        '75%': medians * 1.1, 'max': medians * 2,
+    }, index=samples)
+    metadata = {
+        'Control': 'VDR',
+        'Assembly': copy_number.metadata['Assembly'],
+        'SemanticType': 'SampleTable[Statistics]',
+        'Platform': 'WGS',
+    }
+    control_statistics = sdk.Archive(metadata, statistics)
+
+    return read_depth, control_statistics
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('gene', help='Target gene.')
+    parser.add_argument('output', help='Output directory.')
+    parser.add_argument('--samples', type=int, default=100,
+        help='Number of samples (default: 100).')
+    parser.add_argument('--assembly', default='GRCh37',
+        help='Reference genome assembly (default: GRCh37).')
+    parser.add_argument('--seed', type=int, default=0,
+        help='Random seed (default: 0).')
+    args = parser.parse_args()
+
+    os.makedirs(args.output, exist_ok=True)
+
+    vf = simulate_variants(args.gene, args.samples, assembly=args.assembly,
+        seed=args.seed)
+    vf.to_file(f'{args.output}/variants.vcf')
+
+    if core.has_sv(args.gene):
+        copy_number, cnv_calls = simulate_copy_number(args.gene,
+            args.samples, assembly=args.assembly, seed=args.seed)
+        read_depth, control_statistics = simulate_read_depth(copy_number,
+            seed=args.seed)
+        read_depth.to_file(f'{args.output}/read-depth.zip')
+        control_statistics.to_file(f'{args.output}/control-statistics.zip')
+        cnv_calls.to_file(f'{args.output}/cnv-calls.zip')
+
+if __name__ == '__main__':
+    main()
@@ -482,6 +482,9 @@ currently defined semantic types:
 - ``SampleTable[CNVCalls]``
     * TSV file for storing target gene's CNV call for each sample.
     * Requires following metadata: ``Gene``, ``Assembly``, ``SemanticType``, ``Control``.
+- ``SampleTable[CohortResults]``
+    * Columnar table for storing various results for multiple genes for each sample. Text fields are stored as categorical data.
+    * Requires following metadata: ``Assembly``, ``SemanticType``.
 - ``SampleTable[Genotypes]``
     * TSV file for storing target gene's genotype call for each sample.
     * Requires following metadata: ``Gene``, ``Assembly``, ``SemanticType``.
@@ -842,6 +845,9 @@ Above will create a number of archive files:
     Saved SampleTable[Phenotypes] to: grch37-CYP2D6-pipeline/phenotypes.zip
     Saved SampleTable[Results] to: grch37-CYP2D6-pipeline/results.zip
 
+The wall time, CPU time, peak memory, and input and output sizes of every
+step are also written to ``grch37-CYP2D6-pipeline/run-metrics.json``.
+
 API examples
 ============
 
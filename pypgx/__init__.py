@@ -1,86 +1,114 @@
-from .api.core import (
-    build_definition_table,
-    collapse_alleles,
-    has_phenotype,
-    has_score,
-    has_sv,
-    is_legit_allele,
-    is_target_gene,
-    get_default_allele,
-    get_exon_ends,
-    get_exon_starts,
-    get_function,
-    get_paralog,
-    get_priority,
-    get_recommendation,
-    get_ref_allele,
-    get_region,
-    get_score,
-    get_strand,
-    get_variant_impact,
-    get_variant_synonyms,
-    list_alleles,
-    list_functions,
-    list_genes,
-    list_phenotypes,
-    list_variants,
-    load_allele_table,
-    load_cnv_table,
-    load_cpic_table,
-    load_diplotype_table,
-    load_equation_table,
-    load_gene_table,
-    load_phenotype_table,
-    load_recommendation_table,
-    load_variant_table,
-    predict_phenotype,
-    predict_score,
-    sort_alleles,
-)
+from importlib import import_module
 
-from .api.utils import (
-    call_phenotypes,
-    combine_results,
-    compute_control_statistics,
-    compare_genotypes,
-    compute_copy_number,
-    compute_target_depth,
-    count_alleles,
-    create_consolidated_vcf,
-    create_input_vcf,
-    create_regions_bed,
-    estimate_phase_beagle,
-    filter_samples,
-    import_read_depth,
-    import_variants,
-    predict_alleles,
-    predict_cnv,
-    prepare_depth_of_coverage,
-    print_data,
-    print_metadata,
-    slice_bam,
-    test_cnv_caller,
-    train_cnv_caller,
-)
+# Public methods are imported on first access so that the package, and the
+# command line interface in particular, starts without loading heavy
+# dependencies such as fuc, scikit-learn, and matplotlib.
+_exports = {
+    'api.core': [
+        'build_definition_table',
+        'collapse_alleles',
+        'has_phenotype',
+        'has_score',
+        'has_sv',
+        'is_legit_allele',
+        'is_target_gene',
+        'get_default_allele',
+        'get_exon_ends',
+        'get_exon_starts',
+        'get_function',
+        'get_paralog',
+        'get_priority',
+        'get_recommendation',
+        'get_recommendations',
+        'get_ref_allele',
+        'get_region',
+        'get_score',
+        'get_strand',
+        'get_variant_impact',
+        'get_variant_synonyms',
+        'list_alleles',
+        'list_functions',
+        'list_genes',
+        'list_phenotypes',
+        'list_variants',
+        'load_allele_table',
+        'load_cnv_table',
+        'load_cpic_table',
+        'load_diplotype_table',
+        'load_equation_table',
+        'load_gene_table',
+        'load_phenotype_table',
+        'load_recommendation_table',
+        'load_variant_table',
+        'predict_phenotype',
+        'predict_score',
+        'sort_alleles',
+    ],
+    'api.utils': [
+        'call_phenotypes',
+        'combine_cohort_results',
+        'combine_results',
+        'compute_concordance',
+        'compute_control_statistics',
+        'compare_genotypes',
+        'compute_copy_number',
+        'compute_frequencies',
+        'compute_target_depth',
+        'count_alleles',
+        'create_consolidated_vcf',
+        'create_input_vcf',
+        'create_regions_bed',
+        'estimate_phase_beagle',
+        'filter_samples',
+        'get_flagged_samples',
+        'import_read_depth',
+        'import_variants',
+        'predict_alleles',
+        'predict_cnv',
+        'predict_cnv_batch',
+        'prepare_depth_and_statistics',
+        'prepare_depth_of_coverage',
+        'print_data',
+        'print_metadata',
+        'slice_bam',
+        'slice_bam_batch',
+        'test_cnv_caller',
+        'train_cnv_caller',
+    ],
+    'api.plot': [
+        'plot_bam_copy_number',
+        'plot_bam_read_depth',
+        'plot_cn_af',
+        'plot_cohort_copy_number',
+        'plot_vcf_allele_fraction',
+        'plot_vcf_read_depth',
+    ],
+    'api.genotype': [
+        'call_genotypes',
+    ],
+    'api.pipeline': [
+        'run_chip_pipeline',
+        'run_long_read_pipeline',
+        'run_ngs_pipeline',
+    ],
+    'sdk': [
+        'Archive',
+    ],
+}
 
-from .api.plot import (
-    plot_bam_copy_number,
-    plot_bam_read_depth,
-    plot_cn_af,
-    plot_vcf_allele_fraction,
-    plot_vcf_read_depth,
-)
+_origins = {x: k for k, v in _exports.items() for x in v}
 
-from .api.genotype import (
-    call_genotypes,
-)
+__all__ = list(_origins)
 
-from .api.pipeline import (
-    run_chip_pipeline,
-    run_long_read_pipeline,
-    run_ngs_pipeline,
-)
+def __getattr__(name):
+    if name in _origins:
+        value = getattr(import_module(f'.{_origins[name]}', __name__), name)
+    elif name in ['api', 'cli', 'sdk']:
+        value = import_module(f'.{name}', __name__)
+    else:
+        raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+    globals()[name] = value
+    return value
 
-from .sdk import (
-    Archive,
-)
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
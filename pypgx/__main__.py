@@ -1,9 +1,11 @@
 import argparse
+import os
+import sys
 
 from .version import __version__
 from .cli import commands
 
-def main():
+def create_parser():
     parser = argparse.ArgumentParser(
         add_help=False,
         formatter_class=argparse.RawTextHelpFormatter,
@@ -29,8 +31,40 @@ def main():
     )
     for name, command in commands.items():
         command.create_parser(subparsers)
+    return parser
+
+def _profile_path(args):
+    """Return the directory for profiles of the command."""
+    dest = getattr(args, 'output_argument', None)
+    output = None if dest is None else getattr(args, dest)
+    if not isinstance(output, str):
+        return '.'
+    if os.path.isdir(output):
+        return output
+    return os.path.dirname(output) or '.'
+
+def run(args):
+    """Run the parsed command, profiling it if requested."""
+    if getattr(args, 'profile', None) is None:
+        commands[args.command].main(args)
+        return
+    from .sdk.utils import Profiler
+    profiler = Profiler(kind=args.profile)
+    profiler.start()
+    try:
+        commands[args.command].main(args)
+    finally:
+        profiler.stop()
+        files = profiler.save(path=_profile_path(args),
+            name=f'pypgx-{args.command}.{args.profile}')
+        print(f'Saved profile to: {", ".join(files)}', file=sys.stderr)
+
+def main():
+    parser = create_parser()
     args = parser.parse_args()
-    commands[args.command].main(args)
+    if getattr(args, 'server', None) is not None:
+        sys.exit(commands['serve'].submit(args.server, sys.argv[1:]))
+    run(args)
 
 if __name__ == '__main__':
     main()
@@ -0,0 +1,6 @@
+from importlib import import_module
+
+def __getattr__(name):
+    if name in ['core', 'genotype', 'pipeline', 'plot', 'utils']:
+        return import_module(f'.{name}', __name__)
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
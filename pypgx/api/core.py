@@ -4,6 +4,7 @@ The core submodule is the main suite of tools for PGx research.
 
 import pkgutil
 import pathlib
+import functools
 from io import BytesIO
 import warnings
 
@@ -11,7 +12,6 @@ from .. import sdk
 
 import numpy as np
 import pandas as pd
-from fuc import pyvcf, common
 
 LINK_GENES = 'https://pypgx.readthedocs.io/en/latest/genes.html'
 PROGRAM_PATH = pathlib.Path(__file__).parent.parent.parent.absolute()
@@ -35,6 +35,121 @@ FUNCTION_ORDER = [
     'Class IV (Normal)',
 ]
 
+@functools.lru_cache(maxsize=None)
+def _read_table(name, na_filter=True):
+    """
+    Read a data table once per process. Callers must copy the result.
+    """
+    b = BytesIO(pkgutil.get_data(__name__, f'data/{name}'))
+    return pd.read_csv(b, na_filter=na_filter)
+
+@functools.lru_cache(maxsize=None)
+def _recommendation_index():
+    """
+    Compile the recommendation table into lookup dictionaries once per
+    process.
+
+    Returns a dictionary with the following keys: 'genes' (all genes),
+    'phenotypes' (target gene -> phenotypes), 'drugs' (drug -> genes that
+    determine its recommendations), 'single' ((drug, gene, phenotype) ->
+    recommendation) and 'pairs' ((drug, gene1, phenotype1, gene2,
+    phenotype2) -> recommendation, stored in both gene orders).
+    """
+    genes = _read_table('gene-table.csv')
+    targets = set(genes[genes.Target].Gene)
+    phenotypes = {}
+    for gene, phenotype in _read_table('phenotype-table.csv')[
+        ['Gene', 'Phenotype']].itertuples(index=False):
+        if gene in targets:
+            phenotypes.setdefault(gene, set()).add(phenotype)
+    phenotypes.update({x: [] for x in targets - set(phenotypes)})
+    index = {
+        'genes': set(genes.Gene),
+        'phenotypes': {k: sorted(v) for k, v in phenotypes.items()},
+        'drugs': {},
+        'single': {},
+        'pairs': {},
+    }
+    df = _read_table('recommendation-table.csv', na_filter=False)
+    rows = list(df.itertuples(index=False))
+    # Single-gene lookups return the first matching row, preferring Gene1.
+    for columns in [(1, 2), (3, 4)]:
+        for r in rows:
+            gene, phenotype = r[columns[0]], r[columns[1]]
+            if gene == 'None':
+                continue
+            drug_genes = index['drugs'].setdefault(r.Drug, [])
+            if gene not in drug_genes:
+                drug_genes.append(gene)
+            index['single'].setdefault(
+                (r.Drug, gene, phenotype), r.Recommendation)
+    for r in rows:
+        if r.Gene2 == 'None':
+            continue
+        index['pairs'].setdefault((r.Drug, r.Gene1, r.Phenotype1, r.Gene2,
+            r.Phenotype2), r.Recommendation)
+        index['pairs'].setdefault((r.Drug, r.Gene2, r.Phenotype2, r.Gene1,
+            r.Phenotype1), r.Recommendation)
+    return index
+
+@functools.lru_cache(maxsize=None)
+def _definition_table(gene, assembly):
+    """
+    Build the definition table once per process. Callers must copy the result.
+    """
+    from fuc import pyvcf
+
+    df1 = _read_table('allele-table.csv')
+    df1 = df1[df1.Gene == gene]
+    cores = df1[f'{assembly}Core']
+
+    # Variants are listed in the order they first appear in the allele table,
+    # including alleles with SV.
+    variants = list(dict.fromkeys(
+        x for y in cores.dropna() for x in y.split(',')))
+    fields = [x.split('-') for x in variants]
+
+    # Each variant is looked up by name, keeping the first match.
+    df2 = _read_table('variant-table.csv')
+    df2 = df2[df2.Gene == gene]
+    df2 = df2[~df2[f'{assembly}Name'].duplicated()]
+    df2 = df2.set_index(f'{assembly}Name').loc[variants]
+
+    n = len(variants)
+    data = {
+        'CHROM': df2.Chromosome.to_list(),
+        'POS': [int(x[1]) for x in fields],
+        'ID': df2.rsID.to_list(),
+        'REF': [x[2] for x in fields],
+        'ALT': [x[3] for x in fields],
+        'QUAL': ['.'] * n,
+        'FILTER': ['.'] * n,
+        'INFO': [f'VI={x}' for x in df2.Impact],
+        'FORMAT': ['GT'] * n,
+    }
+    for allele, definition in df1[~df1.SV][['StarAllele', cores.name]].dropna(
+        ).itertuples(index=False):
+        members = set(definition.split(','))
+        data[allele] = ['1' if x in members else '0' for x in variants]
+
+    meta = [
+        '##fileformat=VCFv4.1',
+        '##INFO=<ID=VI,Number=1,Type=String,Description="Variant impact">',
+        '##FORMAT=<ID=GT,Number=1,Type=String,Description="Genotype">',
+    ]
+    return pyvcf.VcfFrame.from_dict(meta, data).sort()
+
+@functools.lru_cache(maxsize=None)
+def _allele_definitions(gene, assembly):
+    """
+    Map each star allele in the definition table to its set of variants once
+    per process.
+    """
+    df = build_definition_table(gene, assembly).df
+    variants = (df.CHROM + '-' + df.POS.astype(str) + '-' + df.REF + '-'
+        + df.ALT)
+    return {x: frozenset(variants[df[x] == '1']) for x in df.columns[9:]}
+
 def build_definition_table(gene, assembly='GRCh37'):
     """
     Build the definition table of star alleles for specified gene.
@@ -70,53 +185,12 @@ def build_definition_table(gene, assembly='GRCh37'):
     0    19  15879621  rs2108622   C   T    .      .  VI=V433M     GT  0  1
     1    19  15897578  rs3093105   A   C    .      .   VI=W12G     GT  1  0
     """
+    from fuc import pyvcf
     if not is_target_gene(gene):
         raise sdk.utils.NotTargetGeneError(gene)
 
-    df1 = load_allele_table()
-    df1 = df1[df1.Gene == gene]
-    variants = []
-    for i, r in df1.iterrows():
-        if pd.isna(r[f'{assembly}Core']):
-            continue
-        for variant in r[f'{assembly}Core'].split(','):
-            if variant not in variants:
-                variants.append(variant)
-    data = {x: [] for x in pyvcf.HEADERS}
-
-    for i, r in df1.iterrows():
-        if r.SV or pd.isna(r[f'{assembly}Core']):
-            continue
-
-        data[r.StarAllele] = [
-            '0' if pd.isna(r[f'{assembly}Core']) else
-            '1' if x in r[f'{assembly}Core'].split(',') else
-            '0' for x in variants
-        ]
-
-    df2 = load_variant_table()
-    df2 = df2[df2.Gene == gene]
-    for variant in variants:
-        pos = int(variant.split('-')[1])
-        ref = variant.split('-')[2]
-        alt = variant.split('-')[3]
-        s = df2[variant == df2[f'{assembly}Name']]
-        data['CHROM'].append(s.Chromosome.values[0])
-        data['POS'].append(pos)
-        data['ID'].append(s.rsID.values[0])
-        data['REF'].append(ref)
-        data['ALT'].append(alt)
-        data['QUAL'].append('.')
-        data['FILTER'].append('.')
-        data['INFO'].append(f'VI={s.Impact.values[0]}')
-        data['FORMAT'].append('GT')
-    meta = [
-        '##fileformat=VCFv4.1',
-        '##INFO=<ID=VI,Number=1,Type=String,Description="Variant impact">',
-        '##FORMAT=<ID=GT,Number=1,Type=String,Description="Genotype">',
-    ]
-    vf = pyvcf.VcfFrame.from_dict(meta, data).sort()
-    return vf
+    vf = _definition_table(gene, assembly)
+    return pyvcf.VcfFrame(vf.meta[:], vf.df.copy())
 
 def collapse_alleles(gene, alleles, assembly='GRCh37'):
     """
@@ -610,28 +684,25 @@ def get_recommendation(drug, gene1, phenotype1, gene2=None, phenotype2=None):
     >>> pypgx.get_recommendation('fluvastatin', 'SLCO1B1', 'Normal Function', 'CYP2C9', 'Normal Metabolizer')
     'Prescribe desired starting dose and adjust doses of fluvastatin based on disease-specific guidelines.'
     """
-    if gene1 not in list_genes(mode='all'):
-        raise sdk.utils.GeneNotFoundError(gene1)
-
-    if gene2 is not None and gene2 not in list_genes(mode='all'):
-        raise sdk.utils.GeneNotFoundError(gene2)
-
-    if phenotype1 not in list_phenotypes(gene1):
-        l = ', '.join([f"'{x}'" for x in list_phenotypes(gene1)])
-        raise sdk.utils.PhenotypeNotFoundError(f"{phenotype1} in {gene1} (choices: {l})")
+    index = _recommendation_index()
 
-    if phenotype2 is not None and phenotype2 not in list_phenotypes(gene2):
-        l = ', '.join([f"'{x}'" for x in list_phenotypes(gene2)])
-        raise sdk.utils.PhenotypeNotFoundError(f"{phenotype2} in {gene2} (choices: {l})")
-
-    df = load_recommendation_table()
+    for gene, phenotype in [(gene1, phenotype1), (gene2, phenotype2)]:
+        if gene is None:
+            continue
+        if gene not in index['genes']:
+            raise sdk.utils.GeneNotFoundError(gene)
+        if phenotype is None:
+            continue
+        if gene not in index['phenotypes']:
+            raise sdk.utils.NotTargetGeneError(gene)
+        if phenotype not in index['phenotypes'][gene]:
+            l = ', '.join([f"'{x}'" for x in index['phenotypes'][gene]])
+            raise sdk.utils.PhenotypeNotFoundError(f"{phenotype} in {gene} (choices: {l})")
 
-    if drug not in df.Drug.unique():
+    if drug not in index['drugs']:
         raise ValueError(f"Drug not found: {drug}")
 
-    df = df[df.Drug == drug]
-
-    target_genes = set(df.Gene1.to_list() + df.Gene2.to_list())
+    target_genes = index['drugs'][drug]
 
     if gene1 not in target_genes:
         raise ValueError(f"{gene1} does not have any recommendations for {drug}")
@@ -639,22 +710,104 @@ def get_recommendation(drug, gene1, phenotype1, gene2=None, phenotype2=None):
     if gene2 is not None and gene2 not in target_genes:
         raise ValueError(f"{gene2} does not have any recommendations for {drug}")
 
-    if df.Gene2.unique() == ['None']:
-        return df[(df.Gene1 == gene1) & (df.Phenotype1 == phenotype1)].Recommendation.values[0]
-
-    if gene2 is None:
+    if len(target_genes) > 1 and gene2 is None:
         message = (f"Recommendations for {drug} are determined by multiple genes "
                    f"({', '.join(target_genes)}); for best results, specify phenotype for each gene")
         warnings.warn(message)
-        if gene1 in df.Gene1.unique():
-            return df[(df.Gene1 == gene1) & (df.Phenotype1 == phenotype1)].Recommendation.values[0]
-        else:
-            return df[(df.Gene2 == gene1) & (df.Phenotype2 == phenotype1)].Recommendation.values[0]
 
-    if gene1 in df.Gene1.unique():
-        return df[(df.Gene1 == gene1) & (df.Phenotype1 == phenotype1) & (df.Gene2 == gene2) & (df.Phenotype2 == phenotype2)].Recommendation.values[0]
+    if len(target_genes) == 1 or gene2 is None:
+        key, table = (drug, gene1, phenotype1), index['single']
     else:
-        return df[(df.Gene2 == gene1) & (df.Phenotype2 == phenotype1) & (df.Gene1 == gene2) & (df.Phenotype1 == phenotype2)].Recommendation.values[0]
+        key, table = (drug, gene1, phenotype1, gene2, phenotype2), index['pairs']
+
+    if key not in table:
+        raise ValueError(f"Recommendation not found: {', '.join(key)}")
+
+    return table[key]
+
+def get_recommendations(phenotypes, drugs=None):
+    """
+    Get recommendations for all drugs from a phenotype profile.
+
+    Unlike :meth:`api.core.get_recommendation`, which looks up one
+    drug-phenotype combination at a time, this method looks up every drug at
+    once for one sample or for a whole cohort. For each drug, phenotypes of
+    all genes that determine its recommendations are used when available;
+    drugs for which none of those genes have a phenotype are skipped. For a
+    cohort, each distinct combination of phenotypes is looked up only once.
+
+    Parameters
+    ----------
+    phenotypes : dict or pandas.DataFrame
+        Mapping of gene to phenotype for one sample, or a DataFrame with
+        samples as rows, genes as columns, and phenotypes as values.
+    drugs : list, optional
+        Drugs to look up. By default, all drugs in the recommendation table
+        are used.
+
+    Returns
+    -------
+    dict or pandas.DataFrame
+        Mapping of drug to recommendation for one sample, or a DataFrame
+        with samples as rows and drugs as columns. Recommendations that are
+        not available for a phenotype combination are missing (or ``NaN``).
+
+    Examples
+    --------
+
+    >>> import pypgx
+    >>> profile = {'CYP2C19': 'Normal Metabolizer', 'CYP2D6': 'Poor Metabolizer'}
+    >>> recommendations = pypgx.get_recommendations(profile)
+    >>> recommendations['codeine']
+    'Avoid codeine use because of possibility of diminished analgesia. If opioid use is warranted, consider a non-tramadol opioid.'
+
+    For a cohort, phenotypes can be taken from the output of
+    :meth:`api.utils.combine_cohort_results`:
+
+    >>> archive = pypgx.Archive.from_file('cohort-results.zip')
+    >>> df = archive.data.xs('Phenotype', axis=1, level='Field')
+    >>> df = pypgx.get_recommendations(df)
+    """
+    index = _recommendation_index()
+
+    if drugs is None:
+        drugs = list(index['drugs'])
+
+    for drug in drugs:
+        if drug not in index['drugs']:
+            raise ValueError(f"Drug not found: {drug}")
+
+    def lookup(drug, genes, values):
+        known = [(g, v) for g, v in zip(genes, values) if isinstance(v, str)]
+        if len(known) == 2:
+            key, table = (drug, *known[0], *known[1]), index['pairs']
+        elif len(known) == 1:
+            key, table = (drug, *known[0]), index['single']
+        else:
+            return None
+        return table.get(key)
+
+    if isinstance(phenotypes, pd.DataFrame):
+        results = {}
+        for drug in drugs:
+            genes = [x for x in index['drugs'][drug] if x in phenotypes]
+            if not genes:
+                continue
+            df = phenotypes[genes].astype(object)
+            combos = df.drop_duplicates()
+            combos['Recommendation'] = [lookup(drug, genes, x)
+                for x in combos.itertuples(index=False)]
+            df = df.merge(combos, on=genes, how='left')
+            results[drug] = df.Recommendation.to_numpy()
+        return pd.DataFrame(results, index=phenotypes.index)
+
+    results = {}
+    for drug in drugs:
+        genes = index['drugs'][drug]
+        recommendation = lookup(drug, genes, [phenotypes.get(x) for x in genes])
+        if recommendation is not None:
+            results[drug] = recommendation
+    return results
 
 def get_ref_allele(gene):
     """
@@ -1047,6 +1200,7 @@ def list_variants(gene, alleles=None, mode='all', assembly='GRCh37'):
     >>> pypgx.list_variants('CYP2B6', alleles=['*6'], mode='tag')
     ['19-41495755-T-C', '19-41496461-T-C']
     """
+    from fuc import common
     if not is_target_gene(gene):
         raise sdk.utils.NotTargetGeneError(gene)
 
@@ -1110,8 +1264,7 @@ def load_allele_table():
     3  CACNA1S   c.520C>T            NaN  Malignant Hyperthermia Associated                               1-201061121-G-A       NaN                               1-201091993-G-A       NaN  False
     4  CACNA1S  c.3257G>A            NaN  Malignant Hyperthermia Associated                               1-201029943-C-T       NaN                               1-201060815-C-T       NaN  False
     """
-    b = BytesIO(pkgutil.get_data(__name__, 'data/allele-table.csv'))
-    return pd.read_csv(b)
+    return _read_table('allele-table.csv').copy()
 
 def load_cnv_table():
     """
@@ -1135,8 +1288,7 @@ def load_cnv_table():
     3  CYP2A6  Deletion2Het
     4  CYP2A6  Deletion3Het
     """
-    b = BytesIO(pkgutil.get_data(__name__, 'data/cnv-table.csv'))
-    return pd.read_csv(b)
+    return _read_table('cnv-table.csv').copy()
 
 def load_cpic_table():
     """
@@ -1164,8 +1316,7 @@ def load_cpic_table():
     3  CYP2C19  amitriptyline     704.0                    N06AA09, N06CA01  https://cpicpgx.org/guidelines/guideline-for-t...         A           Final            1A                  NaN  23486447;27997040
     4   CYP2D6  amitriptyline     704.0                    N06AA09, N06CA01  https://cpicpgx.org/guidelines/guideline-for-t...         A           Final            1A       Actionable PGx  23486447;27997040
     """
-    b = BytesIO(pkgutil.get_data(__name__, 'data/cpic-table.csv'))
-    return pd.read_csv(b)
+    return _read_table('cpic-table.csv').copy()
 
 def load_diplotype_table():
     """
@@ -1189,8 +1340,7 @@ def load_diplotype_table():
     3  CACNA1S    c.520C>T/c.520C>T  Malignant Hyperthermia Susceptibility
     4  CACNA1S   c.520C>T/c.3257G>A  Malignant Hyperthermia Susceptibility
     """
-    b = BytesIO(pkgutil.get_data(__name__, 'data/diplotype-table.csv'))
-    return pd.read_csv(b)
+    return _read_table('diplotype-table.csv').copy()
 
 def load_equation_table():
     """
@@ -1214,8 +1364,7 @@ def load_equation_table():
     3  CYP2D6          Poor Metabolizer     0 <= score < 0.25
     4  CYP2D6  Intermediate Metabolizer  0.25 <= score < 1.25
     """
-    b = BytesIO(pkgutil.get_data(__name__, 'data/equation-table.csv'))
-    return pd.read_csv(b)
+    return _read_table('equation-table.csv').copy()
 
 def load_gene_table():
     """
@@ -1239,8 +1388,7 @@ def load_gene_table():
     3   CYP1A1    True    False     NaN      True  False             NaN         *1            *1            *1      -   15:75008882-75020951   15:74716541-74728528  75011882,75013307,75013539,75013754,75013931,7...  75013115,75013394,75013663,75013844,75014058,7...  74719541,74720966,74721198,74721413,74721590,7...  74720774,74721053,74721322,74721503,74721717,7...
     4   CYP1A2    True    False     NaN      True  False             NaN        *1A           *1A           *1A      +   15:75038183-75051941   15:74745844-74759607  75041183,75042070,75043529,75044105,75044464,7...  75041238,75042910,75043650,75044195,75044588,7...  74748844,74749729,74751188,74751764,74752123,7...  74748897,74750569,74751309,74751854,74752247,7...
     """
-    b = BytesIO(pkgutil.get_data(__name__, 'data/gene-table.csv'))
-    return pd.read_csv(b)
+    return _read_table('gene-table.csv').copy()
 
 def load_phenotype_table():
     """
@@ -1264,8 +1412,7 @@ def load_phenotype_table():
     3     CFTR                   Unfavorable Response                         None
     4     CFTR                          Indeterminate                         None
     """
-    b = BytesIO(pkgutil.get_data(__name__, 'data/phenotype-table.csv'))
-    return pd.read_csv(b)
+    return _read_table('phenotype-table.csv').copy()
 
 def load_recommendation_table():
     """
@@ -1289,8 +1436,7 @@ def load_recommendation_table():
     3  tacrolimus  CYP3A5                   Poor Metabolizer  None       None  Initiate therapy with standard recommended dos...
     4  tacrolimus  CYP3A5                      Indeterminate  None       None                                               None
     """
-    b = BytesIO(pkgutil.get_data(__name__, 'data/recommendation-table.csv'))
-    return pd.read_csv(b, na_filter=False)
+    return _read_table('recommendation-table.csv', na_filter=False).copy()
 
 def load_variant_table():
     """
@@ -1314,8 +1460,7 @@ def load_variant_table():
     3     CFTR                   Unfavorable Response                         None
     4     CFTR                          Indeterminate                         None
     """
-    b = BytesIO(pkgutil.get_data(__name__, 'data/variant-table.csv'))
-    df = pd.read_csv(b)
+    df = _read_table('variant-table.csv').copy()
     df.Chromosome = df.Chromosome.astype(str)
     return df
 
@@ -652,7 +652,8 @@ def call_genotypes(alleles=None, cnv_calls=None):
             r.VariantData = d
         return r
 
-    df = df.apply(one_row, axis=1)
+    # Parsed fields are lists and dicts, which string columns cannot hold.
+    df = df.astype(object).apply(one_row, axis=1)
 
     if gene in sv_genotypers:
         if 'CNV' not in df.columns:
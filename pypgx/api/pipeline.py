@@ -11,13 +11,41 @@ from .. import sdk
 
 from . import utils, plot, genotype, core
 
+###################
+# Private methods #
+###################
+
+def _plotted_samples(archive, flagged):
+    """
+    Return flagged samples present in the archive, or None for all samples.
+    """
+    if flagged is None:
+        return None
+    return [x for x in flagged if x in archive.data.samples]
+
+def _write_metrics(metrics, output, openmetrics):
+    """
+    Write run metrics to the output directory and, optionally, to a file in
+    the OpenMetrics text format.
+    """
+    metrics.to_json(f'{output}/run-metrics.json')
+    if openmetrics is not None:
+        metrics.to_openmetrics(openmetrics)
+
+##################
+# Public methods #
+##################
+
 def run_chip_pipeline(
     gene, output, variants, assembly='GRCh37', panel=None, impute=False,
-    force=False, samples=None, exclude=False
+    force=False, samples=None, exclude=False, openmetrics=None
 ):
     """
     Run genotyping pipeline for chip data.
 
+    Wall time, CPU time, peak memory, and input and output sizes of every
+    step are written to ``run-metrics.json`` in the output directory.
+
     Parameters
     ----------
     gene : str
@@ -44,6 +72,10 @@ def run_chip_pipeline(
         you can provide a list of samples.
     exclude : bool, default: False
         If True, exclude specified samples.
+    openmetrics : str, optional
+        Also write the metrics to this file in the OpenMetrics text format
+        (e.g. ``pypgx.prom`` in the directory read by the textfile collector
+        of the Prometheus node exporter).
     """
     if not core.is_target_gene(gene):
         raise sdk.utils.NotTargetGeneError(gene)
@@ -53,40 +85,53 @@ def run_chip_pipeline(
 
     os.mkdir(output)
 
-    imported_variants = utils.import_variants(gene, variants,
-        assembly=assembly, platform='Chip', samples=samples, exclude=exclude)
-    imported_variants.to_file(f'{output}/imported-variants.zip')
+    metrics = sdk.Metrics(
+        {'Pipeline': 'Chip', 'Gene': gene, 'Assembly': assembly})
+
+    imported_variants = metrics.run('import-variants', utils.import_variants,
+        gene, variants, assembly=assembly, platform='Chip', samples=samples,
+        exclude=exclude)
+    metrics.write(imported_variants, f'{output}/imported-variants.zip')
 
     # Skip statistical phasing if input VCF is already fully phased.
     if imported_variants.type == 'VcfFrame[Consolidated]':
         consolidated_variants = imported_variants
     else:
-        phased_variants = utils.estimate_phase_beagle(
-            imported_variants, panel=panel, impute=impute)
-        phased_variants.to_file(f'{output}/phased-variants.zip')
-        consolidated_variants = utils.create_consolidated_vcf(
-            imported_variants, phased_variants)
-        consolidated_variants.to_file(
+        phased_variants = metrics.run('estimate-phase-beagle',
+            utils.estimate_phase_beagle, imported_variants, panel=panel,
+            impute=impute)
+        metrics.write(phased_variants, f'{output}/phased-variants.zip')
+        consolidated_variants = metrics.run('create-consolidated-vcf',
+            utils.create_consolidated_vcf, imported_variants,
+            phased_variants)
+        metrics.write(consolidated_variants,
             f'{output}/consolidated-variants.zip')
 
-    alleles = utils.predict_alleles(consolidated_variants)
-    alleles.to_file(f'{output}/alleles.zip')
-    genotypes = genotype.call_genotypes(alleles=alleles)
-    genotypes.to_file(f'{output}/genotypes.zip')
-    phenotypes = utils.call_phenotypes(genotypes)
-    phenotypes.to_file(f'{output}/phenotypes.zip')
-    results = utils.combine_results(
-        genotypes=genotypes, phenotypes=phenotypes, alleles=alleles
-    )
-    results.to_file(f'{output}/results.zip')
+    alleles = metrics.run('predict-alleles', utils.predict_alleles,
+        consolidated_variants)
+    metrics.write(alleles, f'{output}/alleles.zip')
+    genotypes = metrics.run('call-genotypes', genotype.call_genotypes,
+        alleles=alleles)
+    metrics.write(genotypes, f'{output}/genotypes.zip')
+    phenotypes = metrics.run('call-phenotypes', utils.call_phenotypes,
+        genotypes)
+    metrics.write(phenotypes, f'{output}/phenotypes.zip')
+    results = metrics.run('combine-results', utils.combine_results,
+        genotypes=genotypes, phenotypes=phenotypes, alleles=alleles)
+    metrics.write(results, f'{output}/results.zip')
+
+    _write_metrics(metrics, output, openmetrics)
 
 def run_long_read_pipeline(
     gene, output, variants, assembly='GRCh37', force=False, samples=None,
-    exclude=False
+    exclude=False, openmetrics=None
 ):
     """
     Run genotyping pipeline for long-read sequencing data.
 
+    Wall time, CPU time, peak memory, and input and output sizes of every
+    step are written to ``run-metrics.json`` in the output directory.
+
     Parameters
     ----------
     gene : str
@@ -106,6 +151,10 @@ def run_long_read_pipeline(
         you can provide a list of samples.
     exclude : bool, default: False
         If True, exclude specified samples.
+    openmetrics : str, optional
+        Also write the metrics to this file in the OpenMetrics text format
+        (e.g. ``pypgx.prom`` in the directory read by the textfile collector
+        of the Prometheus node exporter).
     """
     if not core.is_target_gene(gene):
         raise sdk.utils.NotTargetGeneError(gene)
@@ -115,27 +164,35 @@ def run_long_read_pipeline(
 
     os.mkdir(output)
 
-    consolidated_variants = utils.import_variants(gene, variants,
-        assembly=assembly, platform='LongRead', samples=samples,
-        exclude=exclude)
-    consolidated_variants.to_file(f'{output}/consolidated-variants.zip')
-    alleles = utils.predict_alleles(consolidated_variants)
-    alleles.to_file(f'{output}/alleles.zip')
-    genotypes = genotype.call_genotypes(alleles=alleles)
-    genotypes.to_file(f'{output}/genotypes.zip')
-    phenotypes = utils.call_phenotypes(genotypes)
-    phenotypes.to_file(f'{output}/phenotypes.zip')
-    results = utils.combine_results(
-        genotypes=genotypes, phenotypes=phenotypes, alleles=alleles
-    )
-    results.to_file(f'{output}/results.zip')
+    metrics = sdk.Metrics(
+        {'Pipeline': 'LongRead', 'Gene': gene, 'Assembly': assembly})
+
+    consolidated_variants = metrics.run('import-variants',
+        utils.import_variants, gene, variants, assembly=assembly,
+        platform='LongRead', samples=samples, exclude=exclude)
+    metrics.write(consolidated_variants,
+        f'{output}/consolidated-variants.zip')
+    alleles = metrics.run('predict-alleles', utils.predict_alleles,
+        consolidated_variants)
+    metrics.write(alleles, f'{output}/alleles.zip')
+    genotypes = metrics.run('call-genotypes', genotype.call_genotypes,
+        alleles=alleles)
+    metrics.write(genotypes, f'{output}/genotypes.zip')
+    phenotypes = metrics.run('call-phenotypes', utils.call_phenotypes,
+        genotypes)
+    metrics.write(phenotypes, f'{output}/phenotypes.zip')
+    results = metrics.run('combine-results', utils.combine_results,
+        genotypes=genotypes, phenotypes=phenotypes, alleles=alleles)
+    metrics.write(results, f'{output}/results.zip')
+
+    _write_metrics(metrics, output, openmetrics)
 
 def run_ngs_pipeline(
     gene, output, variants=None, depth_of_coverage=None,
     control_statistics=None, platform='WGS', assembly='GRCh37', panel=None,
     force=False, samples=None, exclude=False, samples_without_sv=None,
     do_not_plot_copy_number=False, do_not_plot_allele_fraction=False,
-    cnv_caller=None
+    cnv_caller=None, plot_flagged_only=False, openmetrics=None
 ):
     """
     Run genotyping pipeline for NGS data.
@@ -145,6 +202,9 @@ def run_ngs_pipeline(
     across all samples. For best results, it is recommended to specify known
     samples without SV using ``samples_without_sv``.
 
+    Wall time, CPU time, peak memory, and input and output sizes of every
+    step are written to ``run-metrics.json`` in the output directory.
+
     Parameters
     ----------
     gene : str
@@ -186,6 +246,15 @@ def run_ngs_pipeline(
         Archive file or object with the semantic type Model[CNV]. By default,
         a pre-trained CNV caller in the ``pypgx-bundle`` directory will be
         used.
+    plot_flagged_only : bool, default: False
+        Only plot copy number and allele fraction profiles for samples
+        flagged for review by :meth:`api.utils.get_flagged_samples` (e.g.
+        non-normal CNV calls, indeterminate genotypes, and unexpected allele
+        fractions) instead of every sample.
+    openmetrics : str, optional
+        Also write the metrics to this file in the OpenMetrics text format
+        (e.g. ``pypgx.prom`` in the directory read by the textfile collector
+        of the Prometheus node exporter).
     """
     if not core.is_target_gene(gene):
         raise sdk.utils.NotTargetGeneError(gene)
@@ -220,51 +289,44 @@ def run_ngs_pipeline(
 
     alleles = None
     cnv_calls = None
+    imported_variants = None
+    copy_number = None
 
     if os.path.exists(output) and force:
         shutil.rmtree(output)
 
     os.mkdir(output)
 
+    metrics = sdk.Metrics(
+        {'Pipeline': 'NGS', 'Gene': gene, 'Assembly': assembly})
+
     if small_var and variants is not None:
-        imported_variants = utils.import_variants(gene, variants,
-            assembly=assembly, platform=platform, samples=samples,
-            exclude=exclude)
-        imported_variants.to_file(f'{output}/imported-variants.zip')
+        imported_variants = metrics.run('import-variants',
+            utils.import_variants, gene, variants, assembly=assembly,
+            platform=platform, samples=samples, exclude=exclude)
+        metrics.write(imported_variants, f'{output}/imported-variants.zip')
 
         # Skip statistical phasing if input VCF is already fully phased.
         if imported_variants.type == 'VcfFrame[Consolidated]':
             consolidated_variants = imported_variants
         else:
-            phased_variants = utils.estimate_phase_beagle(
-                imported_variants, panel=panel)
-            phased_variants.to_file(f'{output}/phased-variants.zip')
-            consolidated_variants = utils.create_consolidated_vcf(
-                imported_variants, phased_variants)
-            consolidated_variants.to_file(
+            phased_variants = metrics.run('estimate-phase-beagle',
+                utils.estimate_phase_beagle, imported_variants, panel=panel)
+            metrics.write(phased_variants, f'{output}/phased-variants.zip')
+            consolidated_variants = metrics.run('create-consolidated-vcf',
+                utils.create_consolidated_vcf, imported_variants,
+                phased_variants)
+            metrics.write(consolidated_variants,
                 f'{output}/consolidated-variants.zip')
 
-        alleles = utils.predict_alleles(consolidated_variants)
-        alleles.to_file(f'{output}/alleles.zip')
-
-        if not do_not_plot_allele_fraction:
-            if imported_variants.data.empty:
-                message = (
-                    "Cannot plot allele fraction because input VCF is empty. "
-                    "Use '--do-not-plot-allele-fraction' to suppress this "
-                    "warning."
-                )
-                warnings.warn(message)
-            else:
-                os.mkdir(f'{output}/allele-fraction-profile')
-                plot.plot_vcf_allele_fraction(
-                    imported_variants,
-                    path=f'{output}/allele-fraction-profile'
-                )
+        alleles = metrics.run('predict-alleles', utils.predict_alleles,
+            consolidated_variants)
+        metrics.write(alleles, f'{output}/alleles.zip')
 
     if large_var and depth_of_coverage is not None:
         if isinstance(depth_of_coverage, str):
-            depth_of_coverage = sdk.Archive.from_file(depth_of_coverage)
+            depth_of_coverage = metrics.run('read-depth-of-coverage',
+                sdk.Archive.from_file, depth_of_coverage)
 
         depth_of_coverage.check_type('CovFrame[DepthOfCoverage]')
         depth_of_coverage.check_metadata('Platform', platform)
@@ -274,7 +336,8 @@ def run_ngs_pipeline(
             raise ValueError('SV detection requires SampleTable[Statistics]')
 
         if isinstance(control_statistics, str):
-            control_statistics = sdk.Archive.from_file(control_statistics)
+            control_statistics = metrics.run('read-control-statistics',
+                sdk.Archive.from_file, control_statistics)
 
         if samples is not None:
             control_statistics = utils.filter_samples(control_statistics,
@@ -284,26 +347,64 @@ def run_ngs_pipeline(
         control_statistics.check_metadata('Platform', platform)
         control_statistics.check_metadata('Assembly', assembly)
 
-        read_depth = utils.import_read_depth(gene, depth_of_coverage,
-            samples=samples, exclude=exclude)
-        read_depth.to_file(f'{output}/read-depth.zip')
-        copy_number = utils.compute_copy_number(read_depth,
-            control_statistics, samples_without_sv=samples_without_sv)
-        copy_number.to_file(f'{output}/copy-number.zip')
-        cnv_calls = utils.predict_cnv(copy_number, cnv_caller=cnv_caller)
-        cnv_calls.to_file(f'{output}/cnv-calls.zip')
-        if not do_not_plot_copy_number:
-            os.mkdir(f'{output}/copy-number-profile')
-            plot.plot_bam_copy_number(
-                copy_number, path=f'{output}/copy-number-profile'
+        read_depth = metrics.run('import-read-depth', utils.import_read_depth,
+            gene, depth_of_coverage, samples=samples, exclude=exclude)
+        metrics.write(read_depth, f'{output}/read-depth.zip')
+        copy_number = metrics.run('compute-copy-number',
+            utils.compute_copy_number, read_depth, control_statistics,
+            samples_without_sv=samples_without_sv)
+        metrics.write(copy_number, f'{output}/copy-number.zip')
+        cnv_calls = metrics.run('predict-cnv', utils.predict_cnv,
+            copy_number, cnv_caller=cnv_caller)
+        metrics.write(cnv_calls, f'{output}/cnv-calls.zip')
+
+    genotypes = metrics.run('call-genotypes', genotype.call_genotypes,
+        alleles=alleles, cnv_calls=cnv_calls)
+    metrics.write(genotypes, f'{output}/genotypes.zip')
+    phenotypes = metrics.run('call-phenotypes', utils.call_phenotypes,
+        genotypes)
+    metrics.write(phenotypes, f'{output}/phenotypes.zip')
+    results = metrics.run('combine-results', utils.combine_results,
+        genotypes=genotypes, phenotypes=phenotypes, alleles=alleles,
+        cnv_calls=cnv_calls)
+    metrics.write(results, f'{output}/results.zip')
+
+    if plot_flagged_only:
+        flagged = metrics.run('get-flagged-samples',
+            utils.get_flagged_samples, results)
+    else:
+        flagged = None
+
+    if imported_variants is not None and not do_not_plot_allele_fraction:
+        if imported_variants.data.empty:
+            message = (
+                "Cannot plot allele fraction because input VCF is empty. "
+                "Use '--do-not-plot-allele-fraction' to suppress this "
+                "warning."
             )
+            warnings.warn(message)
+        else:
+            os.mkdir(f'{output}/allele-fraction-profile')
+            plotted = _plotted_samples(imported_variants, flagged)
+            with metrics.step('plot-allele-fraction') as step:
+                step.input(imported_variants)
+                if plotted is None or plotted:
+                    plot.plot_vcf_allele_fraction(
+                        imported_variants, samples=plotted,
+                        path=f'{output}/allele-fraction-profile'
+                    )
+                step.output(f'{output}/allele-fraction-profile')
+
+    if copy_number is not None and not do_not_plot_copy_number:
+        os.mkdir(f'{output}/copy-number-profile')
+        plotted = _plotted_samples(copy_number, flagged)
+        with metrics.step('plot-copy-number') as step:
+            step.input(copy_number)
+            if plotted is None or plotted:
+                plot.plot_bam_copy_number(
+                    copy_number, samples=plotted,
+                    path=f'{output}/copy-number-profile'
+                )
+            step.output(f'{output}/copy-number-profile')
 
-    genotypes = genotype.call_genotypes(alleles=alleles, cnv_calls=cnv_calls)
-    genotypes.to_file(f'{output}/genotypes.zip')
-    phenotypes = utils.call_phenotypes(genotypes)
-    phenotypes.to_file(f'{output}/phenotypes.zip')
-    results = utils.combine_results(
-        genotypes=genotypes, phenotypes=phenotypes, alleles=alleles,
-        cnv_calls=cnv_calls
-    )
-    results.to_file(f'{output}/results.zip')
+    _write_metrics(metrics, output, openmetrics)
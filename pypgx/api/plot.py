@@ -3,90 +3,259 @@ The plot submodule is used to plot various kinds of profiles such as read
 depth, copy number, and allele fraction.
 """
 
+import functools
+from concurrent.futures import ProcessPoolExecutor
+
 from . import utils, core
 from .. import sdk
 
 from fuc import pyvcf, pycov, common
-import matplotlib.pyplot as plt
+import matplotlib as mpl
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
 import seaborn as sns
+import numpy as np
 import pandas as pd
 
 ###################
 # Private methods #
 ###################
 
-def _plot_exons(gene, assembly, ax, fontsize=25):
-    """Plot a gene model."""
+@functools.lru_cache(maxsize=None)
+def _gene_model(gene, assembly):
+    """Return the region and exon coordinates used to draw a gene model."""
     region = core.get_region(gene, assembly=assembly)
     chrom, start, end = common.parse_region(region)
-    df = core.load_gene_table()
-    starts1 = core.get_exon_starts(gene, assembly=assembly)
-    ends1 = core.get_exon_ends(gene, assembly=assembly)
-    paralog = core.get_paralog(gene)
     strand = core.get_strand(gene)
-    name1 = f'{gene} ({strand})'
-    if paralog:
-        starts2 = core.get_exon_starts(paralog, assembly=assembly)
-        ends2 = core.get_exon_ends(paralog, assembly=assembly)
-        name2 = f'{paralog} ({strand})'
-    common.plot_exons(
-        starts1, ends1, ax=ax, name=name1, fontsize=fontsize, offset=2
-    )
+    genes = [gene]
+    paralog = core.get_paralog(gene)
     if paralog:
+        genes.append(paralog)
+    exons = [(core.get_exon_starts(x, assembly=assembly),
+        core.get_exon_ends(x, assembly=assembly), f'{x} ({strand})')
+        for x in genes]
+    return chrom, start, end, exons
+
+def _plot_exons(gene, assembly, ax, fontsize=25):
+    """Plot a gene model."""
+    chrom, start, end, exons = _gene_model(gene, assembly)
+    for starts, ends, name in exons:
         common.plot_exons(
-            starts2, ends2, ax=ax, name=name2, fontsize=fontsize, offset=2
-    )
+            starts, ends, ax=ax, name=name, fontsize=fontsize, offset=2
+        )
     ax.set_ylim([-1.5, 1.5])
     ax.set_xlim([start, end])
     ax.axis('off')
 
-def _plot_bam_copy_number_one(
-    ax1, ax2, sample, copy_number, gene, assembly, processed_copy_number,
-    ymin, ymax, fontsize
-):
-    region = core.get_region(gene, assembly=assembly)
-    chrom, start, end = common.parse_region(region)
+def _new_figure(ncols, figsize):
+    """Create a figure with a gene model panel above each profile panel."""
+    fig = Figure(figsize=figsize)
+    FigureCanvasAgg(fig)
+    axes = fig.subplots(2, ncols, gridspec_kw={'height_ratios': [1, 10]})
+    return fig, axes
 
-    _plot_exons(gene, assembly, ax1, fontsize=fontsize)
+def _covframe_profile(cf, samples):
+    """Return positions and per-sample values of a CovFrame."""
+    return cf.df.Position.to_numpy(), cf.df[samples].astype(float)
 
-    copy_number.data.plot_region(sample, ax=ax2, legend=False)
+def _vcf_profile(vf, k, samples):
+    """Return positions and per-sample values of a genotype key."""
+    df = vf.extract_format(k)[samples].astype(float)
+    return vf.df.POS.to_numpy(), df
 
-    if processed_copy_number is not None:
-        processed_copy_number.data.plot_region(sample,
-            ax=ax2, legend=False)
+def _line(ax, profile):
+    """
+    Draw an empty line and return a function that shows one sample on it.
+    Missing values are skipped, as with :meth:`seaborn.lineplot`.
+    """
+    x, df = profile
+    line, = ax.plot([], [])
+    def show(sample):
+        y = df[sample].to_numpy()
+        i = ~np.isnan(y)
+        line.set_data(x[i], y[i])
+    return show
+
+def _scatter(ax, profile, label=None):
+    """
+    Draw an empty scatter plot and return a function that shows one sample
+    on it.
+    """
+    x, df = profile
+    points = ax.scatter([], [], label=label)
+    def show(sample):
+        y = df[sample].to_numpy()
+        i = ~np.isnan(y)
+        points.set_offsets(np.column_stack([x[i], y[i]]))
+    return show
+
+def _limits(ax, xlim, ylim):
+    """
+    Return a function that sets axis limits, autoscaling to the current data
+    where a limit is None.
+    """
+    def show(sample):
+        if None in xlim or None in ylim:
+            ax.relim()
+            for collection in ax.collections:
+                ax.update_datalim(collection.get_offsets())
+            ax.set_autoscale_on(True)
+            ax.autoscale_view()
+        ax.set_xlim(xlim)
+        ax.set_ylim(ylim)
+    return show
+
+def _format_profile(ax, chrom, ylabel, fontsize):
+    ax.locator_params(axis='x', nbins=4)
+    ax.set_xlabel(f'Coordinate in chr{chrom} (Mb)', fontsize=fontsize)
+    ax.set_ylabel(ylabel, fontsize=fontsize)
+    ax.tick_params(axis='both', which='major', labelsize=fontsize)
+    ax.ticklabel_format(axis='x', useOffset=False, scilimits=(6, 6))
+    ax.xaxis.get_offset_text().set_fontsize(fontsize)
+
+def _copy_number_panel(
+    ax1, ax2, profiles, gene, assembly, ymin, ymax, fontsize
+):
+    chrom, start, end, _ = _gene_model(gene, assembly)
+    _plot_exons(gene, assembly, ax1, fontsize=fontsize)
+    updates = [_line(ax2, x) for x in profiles]
+    _format_profile(ax2, chrom, 'Copy number', fontsize)
+    return updates + [_limits(ax2, [start, end], [ymin, ymax])]
 
-    ax2.set_xlim([start, end])
-    ax2.locator_params(axis='x', nbins=4)
-    ax2.set_ylim([ymin, ymax])
-    ax2.set_xlabel(f'Coordinate in chr{chrom} (Mb)', fontsize=fontsize)
-    ax2.set_ylabel('Copy number', fontsize=fontsize)
+def _allele_fraction_panel(ax1, ax2, profiles, gene, assembly, fontsize):
+    chrom, start, end, _ = _gene_model(gene, assembly)
+    _plot_exons(gene, assembly, ax1, fontsize=fontsize)
+    updates = [_scatter(ax2, x, label=y) for x, y in zip(profiles, ['REF', 'ALT'])]
+    _format_profile(ax2, chrom, 'Allele fraction', fontsize)
+    return updates + [_limits(ax2, [start, end], [-0.05, 1.05])]
+
+def _build_copy_number(profiles, gene, assembly, ymin, ymax, fontsize):
+    fig, [ax1, ax2] = _new_figure(1, (18, 12))
+    updates = _copy_number_panel(
+        ax1, ax2, profiles, gene, assembly, ymin, ymax, fontsize)
+    return fig, updates
+
+def _build_allele_fraction(profiles, gene, assembly, fontsize):
+    fig, [ax1, ax2] = _new_figure(1, (18, 12))
+    updates = _allele_fraction_panel(
+        ax1, ax2, profiles, gene, assembly, fontsize)
+    return fig, updates
+
+def _build_cn_af(profiles, gene, assembly, ymin, ymax, fontsize):
+    fig, [[ax1, ax2], [ax3, ax4]] = _new_figure(2, (20, 10))
+    updates = _copy_number_panel(
+        ax1, ax3, profiles[:-2], gene, assembly, ymin, ymax, fontsize)
+    updates += _allele_fraction_panel(
+        ax2, ax4, profiles[-2:], gene, assembly, fontsize)
+    return fig, updates
+
+def _build_bam_read_depth(profiles, gene, assembly, ymin, ymax, fontsize):
+    fig, [ax1, ax2] = _new_figure(1, (18, 12))
+    chrom, start, end, _ = _gene_model(gene, assembly)
+    _plot_exons(gene, assembly, ax1)
+    updates = [_line(ax2, x) for x in profiles]
+    ax2.set_xlabel('Coordinate (Mb)', fontsize=fontsize)
+    ax2.set_ylabel('Read depth', fontsize=fontsize)
     ax2.tick_params(axis='both', which='major', labelsize=fontsize)
     ax2.ticklabel_format(axis='x', useOffset=False, scilimits=(6, 6))
-    ax2.xaxis.get_offset_text().set_fontsize(fontsize)
+    return fig, updates + [_limits(ax2, [start, end], [ymin, ymax])]
+
+def _build_vcf_read_depth(profiles, gene, assembly, ymin, ymax):
+    fig, [ax1, ax2] = _new_figure(1, (18, 12))
+    chrom, start, end, _ = _gene_model(gene, assembly)
+    _plot_exons(gene, assembly, ax1)
+    updates = [_scatter(ax2, x, label='ALT') for x in profiles]
+    ax2.set_xlabel(f'Chromosome {chrom}', fontsize=25)
+    ax2.set_ylabel('Read depth', fontsize=25)
+    ax2.tick_params(axis='both', which='major', labelsize=20)
+    return fig, updates + [_limits(ax2, [None, None], [ymin, ymax])]
+
+def _bin_profile(x, df, start, end, bins):
+    """
+    Average per-sample values in equal-width bins across a region.
 
-    return ax1, ax2
+    Returns bin centers and a samples-by-bins array, with NaN for bins
+    without data.
+    """
+    edges = np.linspace(start, end, bins + 1)
+    keep = np.flatnonzero((x >= start) & (x <= end))
+    i = np.clip(np.searchsorted(edges, x[keep], side='right') - 1, 0, bins - 1)
+    order = np.argsort(i, kind='stable')
+    keep, i = keep[order], i[order]
+    bounds = np.flatnonzero(np.r_[True, i[1:] != i[:-1]]) if len(i) else []
+    result = np.full((df.shape[1], bins), np.nan, dtype=np.float32)
+    for j in range(0, df.shape[1] if len(i) else 0, 500):
+        values = df.iloc[keep, j:j+500].to_numpy(dtype=np.float32)
+        missing = np.isnan(values)
+        sums = np.add.reduceat(np.where(missing, 0, values), bounds, axis=0)
+        counts = np.add.reduceat(~missing, bounds, axis=0)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            result[j:j+500, i[bounds]] = (sums / counts).T
+    return (edges[:-1] + edges[1:]) / 2, result
+
+def _order_by_call(samples, calls):
+    """
+    Group samples by call, with the most common call first, keeping the
+    input order within each group.
+    """
+    calls = pd.Series(calls, index=samples).fillna('None').astype(str)
+    rank = calls.map({k: i for i, k in enumerate(calls.value_counts().index)})
+    order = np.lexsort([np.arange(len(samples)), rank.to_numpy()])
+    return [samples[i] for i in order], calls.iloc[order].to_list()
 
-def _plot_vcf_allele_fraction_one(
-    ax1, ax2, sample, imported_variants, gene, assembly, fontsize
-):
-    region = core.get_region(gene, assembly=assembly)
-    chrom, start, end = common.parse_region(region)
+def _render(build, profiles, samples, path, kwargs):
+    """
+    Draw a figure once and update it for each sample.
 
-    _plot_exons(gene, assembly, ax1, fontsize=fontsize)
+    Only the profile data and axis limits change between samples; the gene
+    model, labels, and layout are reused. Figures are rendered with the Agg
+    backend. If ``path`` is '-', a new figure is drawn for each sample and
+    the figures are returned instead.
+    """
+    figs = []
+    with sns.axes_style('darkgrid'):
+        fig = None
+        for sample in samples:
+            if fig is None or path == '-':
+                fig, updates = build(profiles, **kwargs)
+            for update in updates:
+                update(sample)
+            # Start from the default layout, as a new figure would.
+            fig.subplots_adjust(**{k: mpl.rcParams[f'figure.subplot.{k}']
+                for k in ['left', 'right', 'bottom', 'top', 'wspace',
+                'hspace']})
+            fig.tight_layout()
+            # Skip the extra layout pass that savefig makes otherwise.
+            fig.set_layout_engine(None)
+            if path == '-':
+                figs.append(fig)
+            else:
+                if path is None:
+                    output = f'{sample}.png'
+                else:
+                    output = f'{path}/{sample}.png'
+                fig.savefig(output)
+    return figs
 
-    imported_variants.data.plot_region(sample, ax=ax2, k='#AD_FRAC_REF', label='REF')
-    imported_variants.data.plot_region(sample, ax=ax2, k='#AD_FRAC_ALT', label='ALT')
+def _plot_samples(build, profiles, samples, path, n_jobs, **kwargs):
+    """
+    Plot each sample, optionally splitting samples across processes.
+    """
+    samples = list(samples)
 
-    ax2.set_xlim([start, end])
-    ax2.locator_params(axis='x', nbins=4)
-    ax2.set_ylim([-0.05, 1.05])
-    ax2.set_xlabel(f'Coordinate in chr{chrom} (Mb)', fontsize=fontsize)
-    ax2.set_ylabel('Allele fraction', fontsize=fontsize)
-    ax2.tick_params(axis='both', which='major', labelsize=fontsize)
-    ax2.ticklabel_format(axis='x', useOffset=False, scilimits=(6, 6))
-    ax2.xaxis.get_offset_text().set_fontsize(fontsize)
+    if path == '-' or n_jobs == 1 or len(samples) < 2:
+        figs = _render(build, profiles, samples, path, kwargs)
+        return figs if path == '-' else None
 
-    return ax1, ax2
+    n_jobs = min(n_jobs, len(samples))
+    chunks = [x.tolist() for x in np.array_split(samples, n_jobs)]
+
+    with ProcessPoolExecutor(n_jobs) as executor:
+        futures = [executor.submit(_render, build,
+            [(x, df[chunk]) for x, df in profiles], chunk, path, kwargs)
+            for chunk in chunks]
+        for future in futures:
+            future.result()
 
 ##################
 # Public methods #
@@ -94,7 +263,7 @@ def _plot_vcf_allele_fraction_one(
 
 def plot_bam_copy_number(
     copy_number, fitted=False, path=None, samples=None, ymin=-0.3, ymax=6.3,
-    fontsize=25
+    fontsize=25, n_jobs=1
 ):
     """
     Plot copy number profile from CovFrame[CopyNumber].
@@ -119,6 +288,9 @@ def plot_bam_copy_number(
         Y-axis top.
     fontsize : float, default: 25
         Text fontsize.
+    n_jobs : int, default: 1
+        Number of processes to use for writing plots. Ignored when
+        ``path='-'``.
 
     Returns
     -------
@@ -139,42 +311,20 @@ def plot_bam_copy_number(
         samples = common.parse_list_or_file(samples)
         copy_number = utils.filter_samples(copy_number, samples=samples)
 
+    profiles = [_covframe_profile(copy_number.data, samples)]
+
     if fitted:
         processed_copy_number = utils._process_copy_number(copy_number)
-    else:
-        processed_copy_number = None
-
-    figs = []
-
-    with sns.axes_style('darkgrid'):
-        for sample in samples:
-
-            fig, [ax1, ax2] = plt.subplots(2, 1, figsize=(18, 12),
-                gridspec_kw={'height_ratios': [1, 10]})
-
-            ax1, ax2 = _plot_bam_copy_number_one(
-                ax1, ax2, sample, copy_number, gene, assembly,
-                processed_copy_number, ymin, ymax, fontsize
-            )
-
-            plt.tight_layout()
-
-            if path == '-':
-                figs.append(fig)
-            else:
-                if path is None:
-                    output = f'{sample}.png'
-                else:
-                    output = f'{path}/{sample}.png'
-                fig.savefig(output)
-
-            plt.close()
+        profiles.append(_covframe_profile(processed_copy_number.data, samples))
 
-    if path == '-':
-        return figs
+    return _plot_samples(
+        _build_copy_number, profiles, samples, path, n_jobs, gene=gene,
+        assembly=assembly, ymin=ymin, ymax=ymax, fontsize=fontsize
+    )
 
 def plot_bam_read_depth(
-    read_depth, path=None, samples=None, ymin=None, ymax=None, fontsize=25
+    read_depth, path=None, samples=None, ymin=None, ymax=None, fontsize=25,
+    n_jobs=1
 ):
     """
     Plot copy number profile with BAM data.
@@ -197,6 +347,9 @@ def plot_bam_read_depth(
         Y-axis top.
     fontsize : float, default: 25
         Text fontsize.
+    n_jobs : int, default: 1
+        Number of processes to use for writing plots. Ignored when
+        ``path='-'``.
 
     Returns
     -------
@@ -216,46 +369,17 @@ def plot_bam_read_depth(
 
     gene = read_depth.metadata['Gene']
     assembly = read_depth.metadata['Assembly']
-    region = core.get_region(gene, assembly=assembly)
-    chrom, start, end = common.parse_region(region)
 
-    figs = []
+    profiles = [_covframe_profile(read_depth.data, samples)]
 
-    with sns.axes_style('darkgrid'):
-        for sample in samples:
-
-            fig, [ax1, ax2] = plt.subplots(2, 1, figsize=(18, 12), gridspec_kw={'height_ratios': [1, 10]})
-
-            _plot_exons(gene, assembly, ax1)
-
-            read_depth.data.plot_region(sample, ax=ax2, legend=False)
-
-            ax2.set_xlim([start, end])
-            ax2.set_ylim([ymin, ymax])
-            ax2.set_xlabel('Coordinate (Mb)', fontsize=fontsize)
-            ax2.set_ylabel('Read depth', fontsize=fontsize)
-            ax2.tick_params(axis='both', which='major', labelsize=fontsize)
-            ax2.ticklabel_format(axis='x', useOffset=False, scilimits=(6, 6))
-
-            plt.tight_layout()
-
-            if path == '-':
-                figs.append(fig)
-            else:
-                if path is None:
-                    output = f'{sample}.png'
-                else:
-                    output = f'{path}/{sample}.png'
-                fig.savefig(output)
-
-            plt.close()
-
-    if path == '-':
-        return figs
+    return _plot_samples(
+        _build_bam_read_depth, profiles, samples, path, n_jobs, gene=gene,
+        assembly=assembly, ymin=ymin, ymax=ymax, fontsize=fontsize
+    )
 
 def plot_cn_af(
     copy_number, imported_variants, path=None, samples=None, ymin=-0.3,
-    ymax=6.3, fontsize=25
+    ymax=6.3, fontsize=25, n_jobs=1
 ):
     """
     Plot both copy number profile and allele fraction profile in one figure.
@@ -281,6 +405,9 @@ def plot_cn_af(
         Y-axis top.
     fontsize : float, default: 25
         Text fontsize.
+    n_jobs : int, default: 1
+        Number of processes to use for writing plots. Ignored when
+        ``path='-'``.
 
     Returns
     -------
@@ -312,41 +439,181 @@ def plot_cn_af(
     gene = copy_number.metadata['Gene']
     assembly = copy_number.metadata['Assembly']
 
-    figs = []
+    profiles = [
+        _covframe_profile(copy_number.data, samples),
+        _covframe_profile(processed_copy_number.data, samples),
+        _vcf_profile(imported_variants.data, '#AD_FRAC_REF', samples),
+        _vcf_profile(imported_variants.data, '#AD_FRAC_ALT', samples),
+    ]
 
-    with sns.axes_style('darkgrid'):
-        for sample in samples:
+    return _plot_samples(
+        _build_cn_af, profiles, samples, path, n_jobs, gene=gene,
+        assembly=assembly, ymin=ymin, ymax=ymax, fontsize=fontsize
+    )
+
+def plot_cohort_copy_number(
+    copy_number, output, cnv_calls=None, kind='heatmap', flagged=False,
+    bins=1000, nrows=6, ncols=4, ymin=-0.3, ymax=6.3, fontsize=25
+):
+    """
+    Plot copy number profiles of many samples in one file.
+
+    Instead of writing one image per sample, the copy number of all samples
+    is averaged into fixed-width bins across the gene region and drawn
+    either as a single heatmap (one row per sample) or as a multi-page PDF
+    with a grid of small profiles on each page. The plotting cost depends on
+    the number of pages rather than the number of samples.
 
-            fig, [[ax1, ax2], [ax3, ax4]] = plt.subplots(2, 2, figsize=(20, 10),
-                gridspec_kw={'height_ratios': [1, 10]})
+    If CNV calls are provided, samples are grouped by call, with the most
+    common call first.
 
-            ax1, ax3 = _plot_bam_copy_number_one(
-                ax1, ax3, sample, copy_number, gene, assembly,
-                processed_copy_number, ymin, ymax, fontsize
-            )
+    Parameters
+    ----------
+    copy_number : str or pypgx.Archive
+        Archive file or object with the semantic type CovFrame[CopyNumber].
+    output : str
+        Output file. When ``kind='panels'``, this must be a PDF file.
+    cnv_calls : str or pypgx.Archive, optional
+        Archive file or object with the semantic type SampleTable[CNVCalls]
+        or SampleTable[Results].
+    kind : {'heatmap', 'panels'}, default: 'heatmap'
+        Plot all samples as rows of a heatmap, with copy number from 0 to 4
+        as colors, or as a grid of profiles on each page of a PDF file.
+    flagged : bool, default: False
+        If True, only plot samples with a CNV call other than 'Normal' or,
+        when SampleTable[Results] is provided, samples flagged by
+        :meth:`api.utils.get_flagged_samples`. Requires ``cnv_calls``.
+    bins : int, default: 1000
+        Number of bins across the gene region.
+    nrows : int, default: 6
+        Number of profiles per column on each page (``kind='panels'``).
+    ncols : int, default: 4
+        Number of profiles per row on each page (``kind='panels'``).
+    ymin : float, default: -0.3
+        Y-axis bottom (``kind='panels'``).
+    ymax : float, default: 6.3
+        Y-axis top (``kind='panels'``).
+    fontsize : float, default: 25
+        Text fontsize. Profiles on a page use a smaller font.
+    """
+    from matplotlib.backends.backend_pdf import PdfPages
 
-            ax2, ax4 = _plot_vcf_allele_fraction_one(
-                ax2, ax4, sample, imported_variants, gene, assembly, fontsize
-            )
+    if isinstance(copy_number, str):
+        copy_number = sdk.Archive.from_file(copy_number)
 
-            plt.tight_layout()
+    copy_number.check_type('CovFrame[CopyNumber]')
 
-            if path == '-':
-                figs.append(fig)
-            else:
-                if path is None:
-                    output = f'{sample}.png'
-                else:
-                    output = f'{path}/{sample}.png'
-                fig.savefig(output)
+    gene = copy_number.metadata['Gene']
+    assembly = copy_number.metadata['Assembly']
 
-            plt.close()
+    if kind not in ['heatmap', 'panels']:
+        raise ValueError(f"Incorrect kind: '{kind}'")
+
+    if kind == 'panels' and not output.lower().endswith('.pdf'):
+        raise ValueError('Output must be a PDF file for multiple pages')
+
+    samples = copy_number.data.samples
+    calls = None
+
+    if cnv_calls is not None:
+        if isinstance(cnv_calls, str):
+            cnv_calls = sdk.Archive.from_file(cnv_calls)
+        cnv_calls.check_type(['SampleTable[CNVCalls]', 'SampleTable[Results]'])
+        sdk.compare_metadata('Gene', copy_number, cnv_calls)
+        df = cnv_calls.data.reindex(samples)
+        if flagged and cnv_calls.type == 'SampleTable[Results]':
+            i = df.index.isin(utils.get_flagged_samples(cnv_calls))
+        elif flagged:
+            i = df.CNV.notna() & (df.CNV != 'Normal')
+        if flagged:
+            samples = [x for x, y in zip(samples, i) if y]
+            df = df.loc[samples]
+        samples, calls = _order_by_call(samples, df.CNV.to_list())
+    elif flagged:
+        raise ValueError('Flagging samples requires CNV calls')
+
+    if not samples:
+        raise ValueError('No samples to plot')
+
+    chrom, start, end, _ = _gene_model(gene, assembly)
+    x, profile = _covframe_profile(copy_number.data, samples)
+    centers, matrix = _bin_profile(x, profile, start, end, bins)
 
-    if path == '-':
-        return figs
+    with sns.axes_style('darkgrid'):
+        if kind == 'heatmap':
+            fig, [ax1, ax2] = _new_figure(1, (18, 12))
+            _plot_exons(gene, assembly, ax1, fontsize=fontsize)
+            image = ax2.imshow(matrix, aspect='auto', interpolation='none',
+                cmap='coolwarm', vmin=0, vmax=4,
+                extent=[start, end, len(samples), 0])
+            if calls is not None:
+                groups = pd.Series(calls).groupby(calls, sort=False).indices
+                ticks = []
+                for call, i in groups.items():
+                    ticks.append((i.min() + i.max() + 1) / 2)
+                    if i.min() > 0:
+                        ax2.axhline(i.min(), color='black', linewidth=2)
+                ax2.set_yticks(ticks)
+                ax2.set_yticklabels(list(groups))
+            else:
+                ax2.set_yticks([])
+            ax2.grid(False)
+            ax2.locator_params(axis='x', nbins=4)
+            ax2.set_xlabel(f'Coordinate in chr{chrom} (Mb)', fontsize=fontsize)
+            ax2.set_ylabel(f'Samples (n={len(samples)})', fontsize=fontsize)
+            ax2.tick_params(axis='both', which='major', labelsize=fontsize)
+            ax2.ticklabel_format(axis='x', useOffset=False, scilimits=(6, 6))
+            ax2.xaxis.get_offset_text().set_fontsize(fontsize)
+            colorbar = fig.colorbar(image, ax=[ax1, ax2], pad=0.01)
+            colorbar.set_label('Copy number', fontsize=fontsize)
+            colorbar.ax.tick_params(labelsize=fontsize)
+            fig.set_layout_engine('constrained')
+            fig.savefig(output)
+            return
+
+        fig = Figure(figsize=(ncols * 5, nrows * 3.5))
+        FigureCanvasAgg(fig)
+        axes = fig.subplots(nrows, ncols, squeeze=False).flatten()
+        small = fontsize * 0.5
+        lines = []
+        for ax in axes:
+            line, = ax.plot([], [])
+            lines.append(line)
+            ax.set_xlim([start, end])
+            ax.set_ylim([ymin, ymax])
+            ax.locator_params(axis='x', nbins=3)
+            ax.ticklabel_format(axis='x', useOffset=False, scilimits=(6, 6))
+            ax.tick_params(axis='both', which='major', labelsize=small)
+            ax.xaxis.get_offset_text().set_fontsize(small)
+            ax.label_outer()
+        fig.supxlabel(f'Coordinate in chr{chrom} (Mb)', fontsize=fontsize)
+        fig.supylabel('Copy number', fontsize=fontsize)
+        with PdfPages(output) as pdf:
+            for page in range(0, len(samples), len(axes)):
+                for k, ax in enumerate(axes):
+                    i = page + k
+                    ax.set_visible(i < len(samples))
+                    if i >= len(samples):
+                        continue
+                    # Label the x-axis of profiles with no profile below.
+                    ax.xaxis.set_tick_params(labelbottom=
+                        k + ncols >= len(axes) or i + ncols >= len(samples))
+                    lines[k].set_data(centers, matrix[i])
+                    title = samples[i]
+                    if calls is not None:
+                        title += f' ({calls[i]})'
+                    ax.set_title(title, fontsize=small)
+                fig.suptitle(f'{gene} ({page // len(axes) + 1} of '
+                    f'{-(-len(samples) // len(axes))})', fontsize=fontsize)
+                if page == 0:
+                    # Leave room for the figure title and axis labels.
+                    w, h = fig.get_size_inches() * 72 / (fontsize * 2)
+                    fig.tight_layout(rect=(1 / w, 1 / h, 1, 1 - 1 / h))
+                    fig.set_layout_engine(None)
+                pdf.savefig(fig)
 
 def plot_vcf_allele_fraction(
-    imported_variants, path=None, samples=None, fontsize=25
+    imported_variants, path=None, samples=None, fontsize=25, n_jobs=1
 ):
     """
     Plot allele fraction profile with VCF data.
@@ -366,6 +633,9 @@ def plot_vcf_allele_fraction(
         line. Alternatively, you can provide a list of samples.
     fontsize : float, default: 25
         Text fontsize.
+    n_jobs : int, default: 1
+        Number of processes to use for writing plots. Ignored when
+        ``path='-'``.
 
     Returns
     -------
@@ -386,36 +656,19 @@ def plot_vcf_allele_fraction(
     else:
         samples = common.parse_list_or_file(samples)
 
-    figs = []
-
-    with sns.axes_style('darkgrid'):
-        for sample in samples:
-
-            fig, [ax1, ax2] = plt.subplots(2, 1, figsize=(18, 12), gridspec_kw={'height_ratios': [1, 10]})
+    profiles = [
+        _vcf_profile(imported_variants.data, '#AD_FRAC_REF', samples),
+        _vcf_profile(imported_variants.data, '#AD_FRAC_ALT', samples),
+    ]
 
-            ax1, ax2 = _plot_vcf_allele_fraction_one(
-                ax1, ax2, sample, imported_variants, gene, assembly, fontsize
-            )
-
-            plt.tight_layout()
-
-            if path == '-':
-                figs.append(fig)
-            else:
-                if path is None:
-                    output = f'{sample}.png'
-                else:
-                    output = f'{path}/{sample}.png'
-                fig.savefig(output)
-
-            plt.close()
-
-    if path == '-':
-        return figs
+    return _plot_samples(
+        _build_allele_fraction, profiles, samples, path, n_jobs, gene=gene,
+        assembly=assembly, fontsize=fontsize
+    )
 
 def plot_vcf_read_depth(
     gene, vcf, assembly='GRCh37', path=None, samples=None, ymin=None,
-    ymax=None
+    ymax=None, n_jobs=1
 ):
     """
     Plot read depth profile with VCF data.
@@ -440,6 +693,9 @@ def plot_vcf_read_depth(
         Y-axis bottom.
     ymax : float, optional
         Y-axis top.
+    n_jobs : int, default: 1
+        Number of processes to use for writing plots. Ignored when
+        ``path='-'``.
 
     Returns
     -------
@@ -449,46 +705,15 @@ def plot_vcf_read_depth(
     vf = pyvcf.VcfFrame.from_file(vcf)
 
     region = core.get_region(gene, assembly=assembly)
-    chrom, start, end = common.parse_region(region)
 
     if samples is None:
-        samples = cf.samples
+        samples = vf.samples
     else:
         samples = common.parse_list_or_file(samples)
 
-    figs = []
-
-    with sns.axes_style('darkgrid'):
-        for sample in samples:
-
-            fig, [ax1, ax2] = plt.subplots(2, 1, figsize=(18, 12), gridspec_kw={'height_ratios': [1, 10]})
-
-            _plot_exons(gene, assembly, ax1)
-
-            vf.plot_region(sample, region=region, ax=ax2, label='ALT')
+    profiles = [_vcf_profile(vf.slice(region), '#DP', samples)]
 
-            if path is None:
-                output = f'{sample}.png'
-            else:
-                output = f'{path}/{sample}.png'
-
-            ax2.set_ylim([ymin, ymax])
-            ax2.set_xlabel(f'Chromosome {chrom}', fontsize=25)
-            ax2.set_ylabel('Read depth', fontsize=25)
-            ax2.tick_params(axis='both', which='major', labelsize=20)
-
-            plt.tight_layout()
-
-            if path == '-':
-                figs.append(fig)
-            else:
-                if path is None:
-                    output = f'{sample}.png'
-                else:
-                    output = f'{path}/{sample}.png'
-                fig.savefig(output)
-
-            plt.close()
-
-    if path == '-':
-        return figs
+    return _plot_samples(
+        _build_vcf_read_depth, profiles, samples, path, n_jobs, gene=gene,
+        assembly=assembly, ymin=ymin, ymax=ymax
+    )
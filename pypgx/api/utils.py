@@ -3,31 +3,108 @@ The utils submodule contains main actions of PyPGx.
 """
 
 import pkgutil
+import re
 from io import BytesIO
 import tempfile
 import zipfile
 import subprocess
 import os
 import sys
+import glob
 import pickle
 import warnings
+import functools
+from concurrent.futures import ThreadPoolExecutor
 
 from . import core
 from .. import sdk
 
 import numpy as np
 import pandas as pd
-import pysam
-from fuc import pybam, pyvcf, pycov, common, pybed
-from sklearn import metrics
-from sklearn.multiclass import OneVsRestClassifier
-from sklearn.svm import SVC
-from scipy.ndimage import median_filter
+
+# Heavy dependencies (fuc, pysam, scikit-learn, and SciPy) are imported by
+# the methods that use them so that importing this module is fast.
 
 ###################
 # Private methods #
 ###################
 
+def _split_values(s, width, dtype, missing):
+    """
+    Split comma-separated genotype values into a typed array.
+    """
+    df = s.str.split(',', expand=True)
+    a = np.full((len(s), width), missing, dtype=dtype)
+    if df.shape[1]:
+        values = df.apply(pd.to_numeric, errors='coerce').to_numpy(dtype=float)
+        values = values[:, :width]
+        i = ~np.isnan(values)
+        a[:, :values.shape[1]][i] = values[i]
+    return a
+
+def _parse_genotypes(vf):
+    """
+    Parse the per-sample fields of VcfFrame into typed arrays.
+
+    Each FORMAT key is split once for the entire VcfFrame so that downstream
+    methods can look up genotype data with array indexing instead of
+    re-splitting strings such as '0|1:15,15:30:0.5,0.5' for every variant and
+    sample. Missing alleles and integer values are encoded as -1 and missing
+    fractions as NaN.
+
+    Parameters
+    ----------
+    vf : fuc.api.pyvcf.VcfFrame
+        VcfFrame object.
+
+    Returns
+    -------
+    dict
+        Typed arrays with the following keys:
+
+        * 'GT': Allele indices with the shape (variants, samples, 2).
+        * 'Phased': Whether the genotype is phased with the shape
+          (variants, samples).
+        * 'AD': Allelic depths with the shape (variants, samples, alleles).
+        * 'DP': Read depth with the shape (variants, samples).
+        * 'AF': Allele fractions with the shape (variants, samples, alleles).
+        * 'PE': Phase-extension scores with the shape (variants, samples, 4).
+    """
+    n, m = vf.shape
+    if n:
+        width = 1 + vf.df.ALT.str.count(',').max() + 1
+    else:
+        width = 1
+    genotypes = {
+        'GT': np.full((n, m, 2), -1, dtype=np.int16),
+        'Phased': np.zeros((n, m), dtype=bool),
+        'AD': np.full((n, m, width), -1, dtype=np.int32),
+        'DP': np.full((n, m), -1, dtype=np.int32),
+        'AF': np.full((n, m, width), np.nan, dtype=np.float64),
+        'PE': np.full((n, m, 4), -1, dtype=np.int16),
+    }
+    missing = {'AD': -1, 'AF': np.nan, 'PE': -1}
+    for format, rows in vf.df.groupby('FORMAT', sort=False).indices.items():
+        keys = format.split(':')
+        for j, sample in enumerate(vf.samples):
+            fields = vf.df[sample].iloc[rows].str.split(':', expand=True)
+            for k, key in enumerate(keys):
+                if k >= fields.shape[1] or key not in genotypes:
+                    continue
+                s = fields[k].fillna('.')
+                if key == 'GT':
+                    genotypes['Phased'][rows, j] = s.str.contains('|', regex=False)
+                    s = s.str.replace('|', ',', regex=False)
+                    s = s.str.replace('/', ',', regex=False)
+                    a = _split_values(s, 2, np.int16, -1)
+                elif key == 'DP':
+                    a = _split_values(s, 1, np.int32, -1)[:, 0]
+                else:
+                    a = genotypes[key]
+                    a = _split_values(s, a.shape[2], a.dtype, missing[key])
+                genotypes[key][rows, j] = a
+    return genotypes
+
 def _phase_extension(vf, gene, assembly):
     """
     Apply the phase-extension algorithm.
@@ -44,61 +121,77 @@ def _phase_extension(vf, gene, assembly):
     have the most overlapping with the *2 allele, then PE will assign the
     phase of the variant of interest to '0|1'.
     """
+    from fuc import pyvcf
+    genotypes = _parse_genotypes(vf)
+    gt = genotypes['GT']
+    phased = genotypes['Phased']
+
+    names = [[f'{r.CHROM}-{r.POS}-{r.REF}-{x}' for x in r.ALT.split(',')]
+        for r in vf.df[['CHROM', 'POS', 'REF', 'ALT']].itertuples()]
+
     anchors = {}
 
-    for i, r in vf.df.iterrows():
-        for allele in r.ALT.split(','):
-            variant = f'{r.CHROM}-{r.POS}-{r.REF}-{allele}'
-            for sample in vf.samples:
-                if sample not in anchors:
-                    anchors[sample] = [[], []]
-                gt = r[sample].split(':')[0]
-                if '|' not in gt:
-                    continue
-                gt = gt.split('|')
-                if gt[0] != '0':
-                    anchors[sample][0].append(variant)
-                if gt[1] != '0':
-                    anchors[sample][1].append(variant)
+    for j, sample in enumerate(vf.samples):
+        anchors[sample] = [[], []]
+        for k in [0, 1]:
+            for i in np.flatnonzero(phased[:, j] & (gt[:, j, k] != 0)):
+                anchors[sample][k] += names[i]
 
     variant_synonyms = core.get_variant_synonyms(gene, assembly=assembly)
 
-    def one_row(r):
-        if pyvcf.row_phased(r):
-            return r
+    # Star allele definitions are looked up once per variant and allele
+    # instead of once per variant, sample, and haplotype.
+    star_alleles = {}
+    allele_variants = {}
+
+    def list_star_alleles(variant):
+        if variant not in star_alleles:
+            star_alleles[variant] = core.list_alleles(gene, variants=variant, assembly=assembly)
+        return star_alleles[variant]
 
-        r.FORMAT += ':PE'
+    def list_allele_variants(star_allele):
+        if star_allele not in allele_variants:
+            allele_variants[star_allele] = set(core.list_variants(gene, alleles=star_allele, assembly=assembly, mode='all'))
+        return allele_variants[star_allele]
 
-        for sample in vf.samples:
-            if not pyvcf.gt_het(r[sample]):
-                r[sample] = pyvcf.gt_pseudophase(r[sample]) + ':0,0,0,0'
+    def format_allele(x):
+        return '.' if x < 0 else str(x)
+
+    df = vf.copy_df()
+    unphased = ~phased.all(axis=1)
+    rows = np.flatnonzero(unphased)
+    df.loc[unphased, 'FORMAT'] = df.loc[unphased, 'FORMAT'] + ':PE'
+
+    if not len(rows):
+        return pyvcf.VcfFrame([], df)
+
+    for j, sample in enumerate(vf.samples):
+        values = df[sample].iloc[rows].str.partition(':')
+        results = []
+        for i, g, rest in zip(rows, values[0], values[1] + values[2]):
+            x1, x2 = gt[i, j]
+
+            if phased[i, j] or x1 == x2 or ('/' not in g and '|' not in g):
+                results.append(g.replace('/', '|') + rest + ':0,0,0,0')
                 continue
 
             scores = [[0, 0], [0, 0]]
 
-            gt = r[sample].split(':')[0].split('/')
-
-            for i in [0, 1]:
-                if gt[i] == '0':
+            for k, x in enumerate([x1, x2]):
+                if x <= 0:
                     continue
 
-                alt_allele = r.ALT.split(',')[int(gt[i]) - 1]
-
-                variant = f'{r.CHROM}-{r.POS}-{r.REF}-{alt_allele}'
+                variant = names[i][x - 1]
 
                 if variant in variant_synonyms:
                     variant = variant_synonyms[variant]
 
-                star_alleles = core.list_alleles(gene, variants=variant, assembly=assembly)
-
-                for j in [0, 1]:
-                    for star_allele in star_alleles:
-                        score = 0
-                        for x in anchors[sample][j]:
-                            if x in core.list_variants(gene, alleles=star_allele, assembly=assembly, mode='all'):
-                                score += 1
-                        if score > scores[i][j]:
-                            scores[i][j] = score
+                for h in [0, 1]:
+                    for star_allele in list_star_alleles(variant):
+                        variants = list_allele_variants(star_allele)
+                        score = sum([y in variants for y in anchors[sample][h]])
+                        if score > scores[k][h]:
+                            scores[k][h] = score
 
             a = scores[0][0]
             b = scores[0][1]
@@ -127,36 +220,401 @@ def _phase_extension(vf, gene, assembly):
                         flip = False
 
             if flip:
-                result = f'{gt[1]}|{gt[0]}'
+                result = f'{format_allele(x2)}|{format_allele(x1)}'
             else:
-                result = f'{gt[0]}|{gt[1]}'
+                result = f'{format_allele(x1)}|{format_allele(x2)}'
+
+            results.append(result + rest + ':' + ','.join([str(x) for x in scores[0] + scores[1]]))
 
-            result = result + ':' + ':'.join(r[sample].split(':')[1:])
-            r[sample] = result + ':' + ','.join([str(x) for x in scores[0] + scores[1]])
+        df.iloc[rows, df.columns.get_loc(sample)] = results
 
-        return r
+    return pyvcf.VcfFrame([], df)
 
-    return pyvcf.VcfFrame([], vf.df.apply(one_row, axis=1))
+def _fill_missing(a):
+    """
+    Forward-fill and then back-fill missing values in each row.
+    """
+    rows = np.arange(a.shape[0])[:, None]
+    cols = np.arange(a.shape[1])
+    i = np.where(np.isnan(a), 0, cols)
+    np.maximum.accumulate(i, axis=1, out=i)
+    a = a[rows, i]
+    i = np.where(np.isnan(a), a.shape[1] - 1, cols)
+    i = np.minimum.accumulate(i[:, ::-1], axis=1)[:, ::-1]
+    return a[rows, i]
 
 def _process_copy_number(copy_number):
-    df = copy_number.data.copy_df()
+    """
+    Impute missing positions and smooth copy number with a median filter.
+
+    Copy number of all samples is processed as one contiguous float32 array
+    with one row per sample, so that the running median filter is applied to
+    contiguous memory.
+    """
+    from fuc import pycov, common
+    from scipy.ndimage import median_filter
+    df = copy_number.data.df
+
     region = core.get_region(copy_number.metadata['Gene'], assembly=copy_number.metadata['Assembly'])
     chrom, start, end = common.parse_region(region)
 
+    positions = df.Position.to_numpy()
+    samples = df.columns[2:]
+
     if (end - start + 1) > copy_number.data.shape[0]:
-        temp = pd.DataFrame.from_dict({'Temp': range(int(df.Position.iat[0]-1), int(df.Position.iat[-1])+1)})
-        temp = temp.merge(df, left_on='Temp', right_on='Position', how='outer')
-        df = temp.drop(columns='Temp')
+        full = np.arange(int(positions[0]) - 1, int(positions[-1]) + 1)
+        columns = np.searchsorted(full, positions)
+        a = np.full((len(samples), full.size), np.nan, dtype=np.float32)
+        positions = full
+    else:
+        columns = slice(None)
+        a = np.empty((len(samples), positions.size), dtype=np.float32)
+
+    # Copy, impute, and smooth one sample at a time so that temporary
+    # arrays are the size of one row.
+    for i, sample in enumerate(samples):
+        a[i, columns] = df[sample].to_numpy()
+        if np.isnan(a[i]).any():
+            a[i] = _fill_missing(a[i:i+1])[0]
+        a[i] = median_filter(a[i], size=1000)
+        if np.isnan(a[i]).any():
+            raise ValueError('Missing values detected')
+
+    data = pd.DataFrame(a.T, columns=samples, copy=False)
+    data.insert(0, 'Position', positions)
+    data.insert(0, 'Chromosome', df.Chromosome.iat[0])
+
+    return sdk.Archive(copy_number.copy_metadata(), pycov.CovFrame(data))
+
+def _normalize_read_depth(
+    depth, medians, reference=None, chunk_size=100000, n_jobs=1, out=None
+):
+    """
+    Convert read depth to copy number block by block in float32.
+
+    The read depth matrix (positions x samples) is split into blocks of
+    ``chunk_size`` positions that are normalized independently, optionally
+    in parallel with ``n_jobs`` threads. Blocks are divided directly into
+    the float32 output, so the input can also be a memory-mapped array.
+
+    If ``reference`` is given (i.e. targeted sequencing), every position is
+    additionally divided by the median copy number of the reference samples
+    (column indices) at that position.
+
+    If ``out`` is given, copy number is written to it instead of a new
+    array. It may be ``depth`` itself to normalize a float32 array in place.
+    """
+    medians = np.asarray(medians, dtype=np.float32)
+    if out is None:
+        result = np.empty(depth.shape, dtype=np.float32)
+    else:
+        result = out
+
+    def one_block(start):
+        end = min(start + chunk_size, depth.shape[0])
+        a = result[start:end]
+        # Halving is exact in floating point, so dividing by half the
+        # median gives the same result as dividing and then doubling,
+        # without temporary arrays.
+        with np.errstate(divide='ignore', invalid='ignore'):
+            np.divide(depth[start:end], medians / 2, out=a,
+                dtype=np.float32, casting='unsafe')
+            if reference is not None:
+                with warnings.catch_warnings():
+                    warnings.simplefilter('ignore', category=RuntimeWarning)
+                    m = np.nanmedian(a[:, reference], axis=1)
+                m[m == 0] = np.nan
+                np.divide(a, m[:, None] / 2, out=a)
+
+    starts = range(0, depth.shape[0], chunk_size)
+
+    if n_jobs == 1:
+        for start in starts:
+            one_block(start)
+    else:
+        with ThreadPoolExecutor(max_workers=n_jobs) as executor:
+            list(executor.map(one_block, starts))
+
+    return result
+
+@functools.lru_cache(maxsize=32)
+def _load_cnv_caller(model_file):
+    """
+    Load a pre-trained CNV caller, caching recently used models.
+    """
+    return sdk.Archive.from_file(model_file)
+
+def _extract_features(copy_number, bin_size=None):
+    """
+    Return the CNV caller feature matrix with one row per sample.
 
-    df = df.fillna(method='ffill')
-    df = df.fillna(method='bfill')
+    By default, each position of the processed copy number profile is a
+    feature. If ``bin_size`` is given, the profile is summarized as the mean
+    copy number of consecutive bins of that many positions (the last bin may
+    be shorter).
+    """
+    X = copy_number.data.df.iloc[:, 2:].T.to_numpy()
+    if bin_size is not None:
+        bin_size = int(bin_size)
+        starts = np.arange(0, X.shape[1], bin_size)
+        widths = np.diff(np.append(starts, X.shape[1]))
+        X = np.add.reduceat(X, starts, axis=1) / widths
+    return X
+
+def _match_chr_prefix(bf, cf):
+    """
+    Add or remove the 'chr' prefix in BedFrame to match CovFrame.
+    """
+    if cf.has_chr_prefix and not bf.has_chr_prefix:
+        bf = bf.update_chr_prefix(mode='add')
+    elif not cf.has_chr_prefix and bf.has_chr_prefix:
+        bf = bf.update_chr_prefix(mode='remove')
+    return bf
 
-    df.iloc[:, 2:] = df.iloc[:, 2:].apply(lambda c: median_filter(c, size=1000), axis=0)
+def _in_bed(chroms, positions, bf):
+    """
+    Return a boolean mask of positions overlapping BED intervals.
 
-    if df.isnull().values.any():
-        raise ValueError('Missing values detected')
+    This is a vectorized equivalent of the per-row overlap test used by
+    :meth:`fuc.pycov.CovFrame.mask_bed`.
+    """
+    chroms = np.asarray(chroms, dtype=str)
+    positions = np.asarray(positions)
+    mask = np.zeros(positions.size, dtype=bool)
+    intervals = bf.gr.merge().df
+    intervals['Chromosome'] = intervals['Chromosome'].astype(str)
+    for chrom, df in intervals.groupby('Chromosome'):
+        i = np.flatnonzero(chroms == chrom)
+        if not i.size:
+            continue
+        starts = df.Start.to_numpy()
+        ends = df.End.to_numpy()
+        j = np.searchsorted(starts, positions[i], side='right') - 1
+        mask[i] = (j >= 0) & (positions[i] < ends[np.maximum(j, 0)])
+    return mask
+
+def _add_histogram(histogram, values):
+    """
+    Add non-negative integer values to a running histogram.
+    """
+    counts = np.bincount(values)
+    if counts.size > histogram.size:
+        counts[:histogram.size] += histogram
+        return counts
+    histogram[:counts.size] += counts
+    return histogram
+
+def _describe_histogram(histogram):
+    """
+    Compute summary statistics from a histogram of integer values.
 
-    return sdk.Archive(copy_number.copy_metadata(), pycov.CovFrame(df))
+    The output matches :meth:`pandas.DataFrame.describe` on the underlying
+    values, including linearly interpolated quantiles.
+    """
+    n = int(histogram.sum())
+    if n == 0:
+        return [0] + [np.nan] * 7
+    values = np.arange(histogram.size, dtype=np.float64)
+    cumulative = np.cumsum(histogram)
+    def kth(k):
+        return values[np.searchsorted(cumulative, k, side='right')]
+    mean = (values * histogram).sum() / n
+    if n > 1:
+        std = np.sqrt(((values - mean) ** 2 * histogram).sum() / (n - 1))
+    else:
+        std = np.nan
+    quantiles = []
+    for q in [0.25, 0.5, 0.75]:
+        k, fraction = divmod(q * (n - 1), 1)
+        lower, upper = kth(k), kth(min(k + 1, n - 1))
+        quantiles.append(lower + (upper - lower) * fraction)
+    return [n, mean, std, kth(0), *quantiles, kth(n - 1)]
+
+def _split_genotype(genotype):
+    """
+    Return the two alleles of a genotype call.
+    """
+    if genotype == 'Indeterminate':
+        return ['Indeterminate', 'Indeterminate']
+    return genotype.split('/')
+
+def _load_cohort_results(results):
+    """
+    Return SampleTable[CohortResults] from a cohort archive, a directory of
+    pipeline runs, or one or more SampleTable[Results] archives.
+    """
+    from fuc import common
+
+    if isinstance(results, str) and os.path.isdir(results):
+        files = sorted(glob.glob(f'{results}/**/results.zip', recursive=True))
+        if not files:
+            raise ValueError(f'No results.zip files found in: {results}')
+        results = files
+    elif isinstance(results, str):
+        results = common.parse_list_or_file(results)
+
+    if isinstance(results, list) and len(results) == 1:
+        results = results[0]
+
+    if isinstance(results, str):
+        results = sdk.Archive.from_file(results)
+
+    if (isinstance(results, sdk.Archive) and
+        results.metadata['SemanticType'] == 'SampleTable[CohortResults]'):
+        return results
+
+    return combine_cohort_results(results)
+
+def _predict_cnv_rows(
+    depth, start, end, chrom, positions, samples, metadata
+):
+    """
+    Predict CNV for one gene from rows of a normalized depth matrix.
+
+    The copy number profile is a zero-copy view of ``depth[start:end]``.
+    """
+    from fuc import pycov
+    df = pd.DataFrame(depth[start:end], columns=samples, copy=False)
+    df.insert(0, 'Position', positions)
+    df.insert(0, 'Chromosome', chrom)
+    return predict_cnv(sdk.Archive(metadata, pycov.CovFrame(df)))
+
+def _predict_cnv_shared(name, shape, *args):
+    """
+    Run :func:`_predict_cnv_rows` in a worker process on a depth matrix in
+    shared memory.
+    """
+    from multiprocessing import shared_memory
+    shm = shared_memory.SharedMemory(name=name)
+    try:
+        depth = np.ndarray(shape, dtype=np.float32, buffer=shm.buf)
+        return _predict_cnv_rows(depth, *args)
+    finally:
+        del depth
+        shm.close()
+
+def _quick_checksum(path, size=2**20):
+    """
+    Return an MD5 checksum of the file size and its first and last ``size``
+    bytes, which is cheap to compute even for very large files.
+    """
+    import hashlib
+    md5 = hashlib.md5()
+    total = os.path.getsize(path)
+    md5.update(str(total).encode())
+    with open(path, 'rb') as f:
+        md5.update(f.read(size))
+        if total > size:
+            f.seek(max(total - size, size))
+            md5.update(f.read())
+    return md5.hexdigest()
+
+def _file_checksum(path):
+    """
+    Return an MD5 checksum of the whole file.
+    """
+    import hashlib
+    md5 = hashlib.md5()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(2**20), b''):
+            md5.update(block)
+    return md5.hexdigest()
+
+def _slice_and_index(input, output, regions, threads=1, reference=()):
+    """
+    Slice one BAM/CRAM file to BAM, index it, and return its checksum.
+
+    The output is written to a temporary file first so that an interrupted
+    run never leaves a partial file under the final name.
+    """
+    import pysam
+    temp = f'{output}.tmp'
+    _slice(input, temp, regions, threads=threads, reference=reference)
+    os.replace(temp, output)
+    pysam.index('-@', str(threads), output)
+    return _file_checksum(output)
+
+def _ref_cache_path(pattern, md5):
+    """
+    Return the path of a reference sequence in an htslib REF_CACHE pattern
+    (e.g. /cache/%2s/%2s/%s).
+    """
+    if '%' not in pattern:
+        pattern += '/%s'
+    rest = md5
+
+    def expand(match):
+        nonlocal rest
+        width = int(match.group(1)) if match.group(1) else len(rest)
+        head, rest = rest[:width], rest[width:]
+        return head
+
+    return re.sub(r'%(\d*)s', expand, pattern)
+
+def _reference_options(input, fasta, regions):
+    """
+    Return samtools options to decode a CRAM file with the reference FASTA.
+
+    If the REF_CACHE environment variable is set, the reference sequences of
+    the contigs in ``regions`` are copied from FASTA to the cache once,
+    after checking them against the MD5 checksums (M5 tags) in the CRAM
+    header. htslib then memory-maps them from the cache, so that processes
+    share one copy of each sequence instead of loading it from FASTA. BAM
+    files need no options.
+    """
+    import hashlib
+    import pysam
+
+    if fasta is None or not input.endswith('.cram'):
+        return []
+
+    cache = os.environ.get('REF_CACHE')
+
+    if not cache:
+        return ['-T', fasta]
+
+    contigs = {x.split(':')[0].replace('chr', '') for x in regions}
+
+    with pysam.AlignmentFile(input) as f:
+        sequences = [
+            x for x in f.header.to_dict().get('SQ', [])
+            if x['SN'].replace('chr', '') in contigs
+        ]
+
+    if not sequences or any('M5' not in x for x in sequences):
+        return ['-T', fasta]
+
+    with pysam.FastaFile(fasta) as f:
+        for sequence in sequences:
+            path = _ref_cache_path(cache, sequence['M5'])
+            if os.path.exists(path):
+                continue
+            names = [x for x in f.references
+                if x.replace('chr', '') == sequence['SN'].replace('chr', '')]
+            if not names:
+                return ['-T', fasta]
+            data = f.fetch(names[0]).upper().encode()
+            if hashlib.md5(data).hexdigest() != sequence['M5']:
+                raise ValueError(f"Reference sequence '{names[0]}' in "
+                    f"{fasta} does not match {input}")
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            temp = f'{path}.{os.getpid()}.tmp'
+            with open(temp, 'wb') as g:
+                g.write(data)
+            os.replace(temp, path)
+
+    return []
+
+def _slice(input, output, regions, threads=1, reference=()):
+    """
+    Slice one BAM or CRAM file to BAM with samtools.
+    """
+    import pysam
+    from fuc import common, pybam
+    mode = 'add' if pybam.has_chr_prefix(input) else 'remove'
+    regions = common.update_chr_prefix(regions, mode=mode)
+    pysam.view(input, *regions, '-h', '--no-PG', '-b', '-@', str(threads),
+        *reference, '-o', output, catch_stdout=False)
 
 ##################
 # Public methods #
@@ -200,6 +658,98 @@ def call_phenotypes(genotypes):
 
     return sdk.utils.Archive(metadata, data)
 
+def combine_cohort_results(results):
+    """
+    Combine results for multiple genes into a cohort-wide table.
+
+    The output is a sample-by-gene table with genotype, phenotype, CNV, and
+    activity score for each gene. Columns are indexed by gene and field,
+    so that all genes for one sample can be retrieved with
+    ``data.loc[sample].unstack()`` and one gene can be aggregated with, for
+    example, ``data['CYP2D6', 'Phenotype'].value_counts()``. Text fields are
+    stored as categorical data, which keeps the table compact in memory and
+    on disk.
+
+    Parameters
+    ----------
+    results : str, pypgx.Archive, or list
+        One or more archive files or objects with the semantic type
+        SampleTable[Results]. Results for the same gene from different
+        batches are concatenated, as long as no sample appears in more than
+        one of them. Alternatively, you can provide a text file (.txt,
+        .tsv, .csv, or .list) containing one archive file per line.
+
+    Returns
+    -------
+    pypgx.Archive
+        Archive object with the semantic type SampleTable[CohortResults].
+    """
+    from fuc import common
+
+    if isinstance(results, sdk.Archive):
+        results = [results]
+    elif isinstance(results, str) or all(
+        [isinstance(x, str) for x in results]
+    ):
+        results = common.parse_list_or_file(results)
+
+    fields = ['Genotype', 'Phenotype', 'CNV']
+    tables = {}
+    assemblies = set()
+
+    for archive in results:
+        if isinstance(archive, str):
+            archive = sdk.Archive.from_file(archive)
+
+        archive.check_type('SampleTable[Results]')
+
+        gene = archive.metadata['Gene']
+
+        assemblies.add(archive.metadata['Assembly'])
+
+        df = archive.data[fields].astype(object).astype('category')
+
+        if core.has_score(gene):
+            genotypes = [x for x in df.Genotype.cat.categories
+                if x != 'Indeterminate']
+            alleles = {a for x in genotypes for a in x.split('/')}
+            alleles = {a: core.predict_score(gene, a) for a in alleles}
+            scores = {x: sum(alleles[a] for a in x.split('/'))
+                for x in genotypes}
+            score = df.Genotype.map(scores).astype(float)
+        else:
+            score = np.nan
+
+        df['ActivityScore'] = score
+        tables.setdefault(gene, []).append(df)
+
+    if not tables:
+        raise ValueError('No input data detected')
+
+    for gene, batches in tables.items():
+        df = pd.concat(batches) if len(batches) > 1 else batches[0]
+        duplicated = df.index[df.index.duplicated()]
+        if not duplicated.empty:
+            raise ValueError(f'Found multiple results for sample '
+                f'{duplicated[0]} and gene: {gene}')
+        tables[gene] = df
+
+    if len(assemblies) > 1:
+        raise ValueError(f'Found incompatible inputs: {sorted(assemblies)}')
+
+    data = pd.concat(tables, axis=1, names=['Gene', 'Field'])
+
+    for column in data.columns:
+        if column[1] in fields:
+            data[column] = data[column].astype('category')
+
+    metadata = {
+        'Assembly': assemblies.pop(),
+        'SemanticType': 'SampleTable[CohortResults]',
+    }
+
+    return sdk.Archive(metadata, data)
+
 def combine_results(
     genotypes=None, phenotypes=None, alleles=None, cnv_calls=None
 ):
@@ -339,6 +889,93 @@ def compare_genotypes(first, second, verbose=False):
     for col in ['Genotype', 'CNV']:
         show_comparison(col)
 
+def compute_concordance(first, second):
+    """
+    Calculate concordance between two sets of results for multiple genes.
+
+    Samples and genes are aligned by name, and genotype, phenotype, and CNV
+    calls are compared for every sample-gene pair present in both inputs.
+    Calls that are missing in either input are not compared. If no calls
+    can be compared, both returned tables are empty.
+
+    Parameters
+    ----------
+    first : str, pypgx.Archive, or list
+        First set of results. Archive file or object with the semantic type
+        SampleTable[CohortResults], or one or more archive files or objects
+        with the semantic type SampleTable[Results]. Alternatively, you can
+        provide a directory, in which case all results.zip files under it
+        (e.g. from :meth:`api.pipeline.run_ngs_pipeline`) will be used, or a
+        text file (.txt, .tsv, .csv, or .list) containing one archive file
+        per line.
+    second : str, pypgx.Archive, or list
+        Second set of results, in the same format as ``first``.
+
+    Returns
+    -------
+    pandas.DataFrame
+        Concordance for each gene and field, with the columns Gene, Field,
+        Compared, Concordant, and Concordance.
+    pandas.DataFrame
+        Discordant calls, with the columns Sample, Gene, Field, First, and
+        Second.
+
+    See Also
+    --------
+    compare_genotypes
+        Calculate concordance between two genotype results.
+
+    Examples
+    --------
+
+    >>> import pypgx
+    >>> concordance, discordance = pypgx.compute_concordance('wgs-runs', 'chip-runs')
+    """
+    first = _load_cohort_results(first)
+    second = _load_cohort_results(second)
+
+    if first.metadata['Assembly'] != second.metadata['Assembly']:
+        warnings.warn('Comparing results from different assemblies')
+
+    a, b = first.data, second.data
+    samples = a.index.intersection(b.index)
+
+    if samples.empty:
+        raise ValueError('No samples found in both inputs')
+
+    genes = a.columns.get_level_values('Gene').unique()
+    genes = genes.intersection(b.columns.get_level_values('Gene').unique(),
+        sort=False)
+
+    if genes.empty:
+        raise ValueError('No genes found in both inputs')
+
+    rows, discordant = [], []
+
+    for gene in genes:
+        for field in ['Genotype', 'Phenotype', 'CNV']:
+            x = a.loc[samples, (gene, field)].astype(object).to_numpy()
+            y = b.loc[samples, (gene, field)].astype(object).to_numpy()
+            compared = ~(pd.isna(x) | pd.isna(y))
+            if not compared.any():
+                continue
+            concordant = compared & (x == y)
+            n, k = compared.sum(), concordant.sum()
+            rows.append([gene, field, n, k, k / n])
+            i = compared & ~concordant
+            discordant.append(pd.DataFrame({'Sample': samples[i],
+                'Gene': gene, 'Field': field, 'First': x[i], 'Second': y[i]}))
+
+    concordance = pd.DataFrame(rows,
+        columns=['Gene', 'Field', 'Compared', 'Concordant', 'Concordance'])
+    if discordant:
+        discordance = pd.concat(discordant, ignore_index=True)
+    else:
+        discordance = pd.DataFrame(
+            columns=['Sample', 'Gene', 'Field', 'First', 'Second'])
+
+    return concordance, discordance
+
 def compute_control_statistics(
     gene, bams, assembly='GRCh37', bed=None
 ):
@@ -356,8 +993,9 @@ def compute_control_statistics(
         Alternatively, you can provide a custom region (format:
         chrom:start-end).
     bams : str or list
-        One or more input BAM files. Alternatively, you can provide a text
-        file (.txt, .tsv, .csv, or .list) containing one BAM file per line.
+        One or more input BAM or CRAM files. Alternatively, you can provide
+        a text file (.txt, .tsv, .csv, or .list) containing one file per
+        line.
     assembly : {'GRCh37', 'GRCh38'}, default: 'GRCh37'
         Reference genome assembly.
     bed : str, optional
@@ -369,6 +1007,7 @@ def compute_control_statistics(
     pypgx.Archive
         Archive object with the semantic type SampleTable[Statistics].
     """
+    from fuc import pycov, pybed
     gene_table = core.load_gene_table()
 
     if gene in core.list_genes(mode='all'):
@@ -405,7 +1044,8 @@ def compute_control_statistics(
     return result
 
 def compute_copy_number(
-    read_depth, control_statistics, samples_without_sv=None
+    read_depth, control_statistics, samples_without_sv=None,
+    chunk_size=100000, n_jobs=1
 ):
     """
     Compute copy number from read depth for target gene.
@@ -419,6 +1059,11 @@ def compute_copy_number(
     statistics across all samples. For best results, it is recommended to
     manually specify a list of known reference samples that do not have SV.
 
+    Normalization is performed in float32 on blocks of ``chunk_size``
+    positions, which can be processed in parallel with ``n_jobs``. Copy
+    number is stored in float32 and agrees with a float64 computation to
+    within a relative tolerance of 1e-6.
+
     Parameters
     ----------
     read_depth : str or pypgx.Archive
@@ -428,12 +1073,17 @@ def compute_copy_number(
         SampleTable[Statistics].
     samples_without_sv : list, optional
         List of known samples without SV.
+    chunk_size : int, default: 100000
+        Number of genomic positions to normalize at a time.
+    n_jobs : int, default: 1
+        Number of threads used to normalize blocks in parallel.
 
     Returns
     -------
     pypgx.Archive
         Archive file with the semandtic type CovFrame[CopyNumber].
     """
+    from fuc import pycov
     if isinstance(read_depth, str):
         read_depth = sdk.Archive.from_file(read_depth)
 
@@ -447,21 +1097,28 @@ def compute_copy_number(
     if set(read_depth.data.samples) != set(control_statistics.data.index):
         raise ValueError('Different sample sets found')
 
-    # Make sure samples are in the same order.
-    control_statistics.data = control_statistics.data.loc[read_depth.data.samples]
+    samples = read_depth.data.samples
 
-    # Apply intra-sample normalization.
-    df = read_depth.data.copy_df()
-    medians = control_statistics.data['50%']
-    df.iloc[:, 2:] = df.iloc[:, 2:] / medians * 2
+    # Make sure samples are in the same order.
+    medians = control_statistics.data.loc[samples, '50%']
 
-    # Apply inter-sample normalization.
+    # Apply inter-sample normalization as well for targeted sequencing.
     if read_depth.metadata['Platform'] == 'Targeted':
         if samples_without_sv is None:
-            medians = df.iloc[:, 2:].median(axis=1).replace(0, np.nan)
+            reference = np.arange(len(samples))
         else:
-            medians = df[samples_without_sv].median(axis=1).replace(0, np.nan)
-        df.iloc[:, 2:] = df.iloc[:, 2:].div(medians, axis=0) * 2
+            reference = np.array([samples.index(x) for x in samples_without_sv])
+    else:
+        reference = None
+
+    depth = read_depth.data.df.iloc[:, 2:].to_numpy()
+
+    a = _normalize_read_depth(depth, medians.to_numpy(), reference=reference,
+        chunk_size=chunk_size, n_jobs=n_jobs)
+
+    df = pd.DataFrame(a, columns=samples)
+    df.insert(0, 'Position', read_depth.data.df.Position.to_numpy())
+    df.insert(0, 'Chromosome', read_depth.data.df.Chromosome.to_numpy())
 
     cf = pycov.CovFrame(df)
     metadata = read_depth.copy_metadata()
@@ -474,6 +1131,106 @@ def compute_copy_number(
 
     return sdk.Archive(metadata, cf)
 
+def compute_frequencies(results, groups=None):
+    """
+    Compute allele, diplotype, and phenotype frequencies for multiple genes.
+
+    Each column of genotype and phenotype calls is counted once over its
+    categories, and allele counts are derived from diplotype counts, so the
+    cost grows with the number of distinct calls rather than the number of
+    samples.
+
+    Parameters
+    ----------
+    results : str, pypgx.Archive, or list
+        Archive file or object with the semantic type
+        SampleTable[CohortResults], or one or more archive files or objects
+        with the semantic type SampleTable[Results], each for a different
+        gene. Alternatively, you can provide a directory, in which case all
+        results.zip files under it (e.g. from :meth:`api.pipeline.run_ngs_pipeline`)
+        will be used, or a text file (.txt, .tsv, .csv, or .list) containing
+        one archive file per line.
+    groups : str, dict, or pandas.Series, optional
+        Population label for each sample. Frequencies will be computed
+        separately for each label. If a file is provided, it must be
+        tab-delimited with two columns (sample and label) and no header.
+        Samples without a label will be ignored.
+
+    Returns
+    -------
+    pandas.DataFrame
+        Table with the columns Gene, Type ('Allele', 'Diplotype', or
+        'Phenotype'), Group (only when ``groups`` is provided), Value, Count,
+        and Frequency. Frequency is computed among called values only, so it
+        is missing for 'Indeterminate'.
+
+    See Also
+    --------
+    combine_cohort_results
+        Combine results for multiple genes into a cohort-wide table.
+    """
+    data = _load_cohort_results(results).data
+
+    if groups is None:
+        labels = np.zeros(data.shape[0], dtype=np.int64)
+        names = [None]
+    else:
+        if isinstance(groups, str):
+            groups = pd.read_table(groups, header=None, index_col=0,
+                dtype=str).iloc[:, 0]
+        groups = pd.Series(groups).reindex(data.index).astype('category')
+        if groups.isna().all():
+            raise ValueError('No samples found with a group label')
+        labels = groups.cat.codes.to_numpy().astype(np.int64)
+        names = groups.cat.categories.to_list()
+
+    def tabulate(s):
+        s = s.astype('category')
+        codes = s.cat.codes.to_numpy().astype(np.int64)
+        keep = (codes >= 0) & (labels >= 0)
+        n = len(s.cat.categories)
+        counts = np.bincount(labels[keep] * n + codes[keep],
+            minlength=len(names) * n).reshape(len(names), n)
+        return s.cat.categories.astype(str).to_list(), counts
+
+    tables = []
+
+    for gene in data.columns.get_level_values('Gene').unique():
+        genotypes, counts = tabulate(data[gene, 'Genotype'])
+        alleles = core.sort_alleles(sorted({a for x in genotypes
+            for a in _split_genotype(x)}), by='name')
+        matrix = np.zeros((len(genotypes), len(alleles)), dtype=np.int64)
+        for i, genotype in enumerate(genotypes):
+            for allele in _split_genotype(genotype):
+                matrix[i, alleles.index(allele)] += 1
+        types = [
+            ('Allele', alleles, counts @ matrix),
+            ('Diplotype', genotypes, counts),
+            ('Phenotype', *tabulate(data[gene, 'Phenotype'])),
+        ]
+        for type_, values, counts in types:
+            values = np.array(values, dtype=object)
+            called = values != 'Indeterminate'
+            totals = counts[:, called].sum(axis=1, keepdims=True)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                frequencies = np.where(called, counts / totals, np.nan)
+            i, j = np.nonzero(counts)
+            tables.append(pd.DataFrame({
+                'Gene': gene,
+                'Type': type_,
+                'Group': np.array(names, dtype=object)[i],
+                'Value': values[j],
+                'Count': counts[i, j],
+                'Frequency': frequencies[i, j],
+            }))
+
+    df = pd.concat(tables, ignore_index=True)
+
+    if groups is None:
+        df = df.drop(columns='Group')
+
+    return df
+
 def compute_target_depth(
     gene, bams, assembly='GRCh37', bed=None
 ):
@@ -489,8 +1246,9 @@ def compute_target_depth(
     gene : str
         Target gene.
     bams : str or list
-        One or more input BAM files. Alternatively, you can provide a text
-        file (.txt, .tsv, .csv, or .list) containing one BAM file per line.
+        One or more input BAM or CRAM files. Alternatively, you can provide
+        a text file (.txt, .tsv, .csv, or .list) containing one file per
+        line.
     assembly : {'GRCh37', 'GRCh38'}, default: 'GRCh37'
         Reference genome assembly.
     bed : str, optional
@@ -501,6 +1259,7 @@ def compute_target_depth(
     pypgx.Archive
         Archive object with the semantic type CovFrame[ReadDepth].
     """
+    from fuc import pycov, pybed
     metadata = {
         'Gene': gene,
         'Assembly': assembly,
@@ -539,16 +1298,12 @@ def count_alleles(results):
 
     results.check_type('SampleTable[Results]')
 
-    df = results.data.copy()
-
-    def one_row(r):
-        if r.Genotype == 'Indeterminate':
-            return ['Indeterminate', 'Indeterminate']
-        return r.Genotype.split('/')
-    df = df.apply(one_row, axis=1, result_type='expand')
-    s = pd.concat([df[0], df[1]])
-    s = s.reset_index(drop=True)
-    s = s.value_counts()
+    counts = {}
+    for genotype, count in results.data.Genotype.value_counts().items():
+        for allele in _split_genotype(genotype):
+            counts[allele] = counts.get(allele, 0) + count
+    s = pd.Series(counts, name='count')
+    s = s.sort_values(ascending=False, kind='stable')
     s = s[core.sort_alleles(s.index.to_list(), by='name')]
     return s
 
@@ -568,6 +1323,7 @@ def create_consolidated_vcf(imported_variants, phased_variants):
     pypgx.Archive
         Archive object with the semantic type VcfFrame[Consolidated].
     """
+    from fuc import pyvcf
     if isinstance(imported_variants, str):
         imported_variants = sdk.Archive.from_file(imported_variants)
 
@@ -603,26 +1359,32 @@ def create_consolidated_vcf(imported_variants, phased_variants):
 
     # For every variant in VcfFrame[Phased] (e.g. '0|1'), find and append its
     # accompanying data from VcfFrame[Imported] (e.g. '0|1:15,15:30:0.5').
-    def one_row(r):
-        variant = f'{r.CHROM}-{r.POS}-{r.REF}-{r.ALT}'
-        s = vf1.fetch(variant)
-        if s.empty:
-            return r
-        def one_gt(g):
-            return ':'.join(g.split(':')[1:])
-        s[9:] = s[9:].apply(one_gt)
-        r[9:] = r[9:].str.cat(s[9:], sep=':')
-        return r
-
-    vf3 = pyvcf.VcfFrame([], vf2.df.apply(one_row, axis=1))
-    vf3.df.INFO = 'Phased'
-    vf3.df.FORMAT = format
+    # Both VcfFrames are keyed by (CHROM, POS, REF, ALT) and joined over
+    # whole columns at once.
+    cols = ['CHROM', 'POS', 'REF', 'ALT']
+    key1 = pd.MultiIndex.from_frame(vf1.df[cols])
+    key2 = pd.MultiIndex.from_frame(vf2.df[cols])
+
+    df1 = pd.DataFrame(index=key1)
+    for sample in vf1.samples:
+        df1[sample] = vf1.df[sample].str.partition(':')[2].to_numpy()
+    df1 = df1[~df1.index.duplicated()].reindex(key2)
+    found = key2.isin(key1)
+
+    df3 = vf2.copy_df()
+    for sample in vf2.samples:
+        if sample not in df1.columns:
+            continue
+        s = df3[sample] + ':' + df1[sample].to_numpy()
+        df3[sample] = np.where(found, s, df3[sample])
+    df3.INFO = 'Phased'
+    df3.FORMAT = format
 
     # Remove variants that are in both VcfFrame[Imported] and
     # VcfFrame[Phased]. Append remaining unphased variants to
     # VcfFrame[Phased].
-    vf4 = vf1.filter_vcf(vf2, opposite=True)
-    vf5 = pyvcf.VcfFrame([], pd.concat([vf3.df, vf4.df])).sort()
+    df4 = vf1.df[~key1.isin(key2)]
+    vf5 = pyvcf.VcfFrame([], pd.concat([df3, df4])).sort()
 
     vf6 = _phase_extension(vf5, gene, assembly)
 
@@ -648,10 +1410,11 @@ def create_input_vcf(
     vcf : str
         Output VCF file. It must have .vcf.gz as suffix.
     fasta : str
-        Reference FASTA file.
+        Reference FASTA file. It is also used to decode CRAM files.
     bams : str or list
-        One or more input BAM files. Alternatively, you can provide a text
-        file (.txt, .tsv, .csv, or .list) containing one BAM file per line.
+        One or more input BAM or CRAM files. Alternatively, you can provide
+        a text file (.txt, .tsv, .csv, or .list) containing one file per
+        line.
     assembly : {'GRCh37', 'GRCh38'}, default: 'GRCh37'
         Reference genome assembly.
     genes : list, optional
@@ -670,6 +1433,8 @@ def create_input_vcf(
         ultra-deep coverage (e.g. 500X), then you need to increase the
         maximum depth.
     """
+    import pysam
+    from fuc import pyvcf
     if not vcf.endswith('.vcf.gz'):
         raise ValueError(f"VCF file must have .vcf.gz as suffix: {vcf}")
     vcf = vcf.replace('.vcf.gz', '.vcf')
@@ -752,6 +1517,7 @@ def create_regions_bed(
     4          1  97540298  98389615
 
     """
+    from fuc import common, pybed
     df = core.load_gene_table()
     if genes is not None:
         if exclude:
@@ -804,6 +1570,7 @@ def estimate_phase_beagle(
     pypgx.Archive
         Archive object with the semantic type VcfFrame[Phased].
     """
+    from fuc import pyvcf, common
     if isinstance(imported_variants, str):
         imported_variants = sdk.Archive.from_file(imported_variants)
 
@@ -930,6 +1697,7 @@ def filter_samples(archive, samples, exclude=False):
     pypgx.Archive
         Fitlered Archive object.
     """
+    from fuc import common
     if isinstance(archive, str):
         archive = sdk.Archive.from_file(archive)
 
@@ -948,6 +1716,61 @@ def filter_samples(archive, samples, exclude=False):
 
     return sdk.Archive(archive.copy_metadata(), data)
 
+def get_flagged_samples(results, af_tolerance=0.15):
+    """
+    Return samples whose calls should be reviewed.
+
+    A sample is flagged if at least one of the following is true:
+
+    - The CNV call is not 'Normal' (or 'AssumeNormal').
+    - The genotype call is 'Indeterminate'.
+    - An allele fraction in VariantData is further than ``af_tolerance``
+      from both 0.5 (heterozygous) and 1.0 (homozygous). Missing allele
+      fractions are ignored.
+
+    Parameters
+    ----------
+    results : str or pypgx.Archive
+        Archive file or object with the semantic type SampleTable[Results].
+    af_tolerance : float, default: 0.15
+        Maximum distance of an allele fraction from 0.5 or 1.0.
+
+    Returns
+    -------
+    list
+        Flagged samples, in the same order as the input.
+
+    Examples
+    --------
+
+    >>> import pypgx
+    >>> results = pypgx.Archive.from_file('results.zip')
+    >>> pypgx.get_flagged_samples(results)
+    ['NA19207', 'NA19785']
+    """
+    if isinstance(results, str):
+        results = sdk.Archive.from_file(results)
+
+    results.check_type('SampleTable[Results]')
+
+    df = results.data
+    flagged = pd.Series(False, index=df.index)
+
+    if 'CNV' in df.columns:
+        flagged |= df.CNV.notna() & ~df.CNV.isin(['Normal', 'AssumeNormal'])
+
+    flagged |= df.Genotype == 'Indeterminate'
+
+    # Each allele is stored as 'allele:variants:fractions;' in VariantData.
+    fractions = df.VariantData.dropna().astype(str).str.findall(r'[^:;]+:[^:;]+:([^:;]+)')
+    fractions = fractions.explode().dropna().str.split(',').explode()
+    fractions = pd.to_numeric(fractions, errors='coerce').dropna()
+    distance = np.minimum(abs(fractions - 0.5), abs(fractions - 1.0))
+    outliers = distance[distance > af_tolerance].index
+    flagged |= df.index.isin(outliers)
+
+    return df.index[flagged].to_list()
+
 def import_read_depth(
     gene, depth_of_coverage, samples=None, exclude=False
 ):
@@ -973,6 +1796,7 @@ def import_read_depth(
     pypgx.Archive
         Archive object with the semantic type CovFrame[ReadDepth].
     """
+    from fuc import pycov, common
     if isinstance(depth_of_coverage, str):
         depth_of_coverage = sdk.Archive.from_file(depth_of_coverage)
 
@@ -984,8 +1808,13 @@ def import_read_depth(
 
     region = core.get_region(gene, assembly=metadata['Assembly'])
 
-    cf = depth_of_coverage.data.update_chr_prefix(mode='remove')
-    cf = cf.slice(region)
+    # Select the target contig before removing the 'chr' prefix so that only
+    # the rows of interest are copied.
+    chrom = common.parse_region(region)[0]
+    df = depth_of_coverage.data.df
+    df = df[df.Chromosome.str.replace('chr', '') == chrom].copy()
+    df['Chromosome'] = chrom
+    cf = pycov.CovFrame(df).slice(region)
 
     if samples is not None:
         samples = common.parse_list_or_file(samples)
@@ -1035,6 +1864,7 @@ def import_variants(
         Archive object with the semantic type VcfFrame[Imported] or
         VcfFrame[Consolidated].
     """
+    from fuc import pyvcf, common
     region = core.get_region(gene, assembly=assembly)
 
     if isinstance(vcf, str):
@@ -1108,7 +1938,7 @@ def predict_alleles(consolidated_variants):
     gene = consolidated_variants.metadata['Gene']
     assembly = consolidated_variants.metadata['Assembly']
 
-    definition_table = core.build_definition_table(gene, assembly)
+    star_alleles = core._allele_definitions(gene, assembly)
     ref_allele = core.get_ref_allele(gene)
     default_allele = core.get_default_allele(gene, assembly)
     defining_variants = core.list_variants(gene, assembly=assembly)
@@ -1122,12 +1952,6 @@ def predict_alleles(consolidated_variants):
             if y in reformatted_variants:
                 warnings.warn(f"Multiple variant synonyms detected for {y}: PyPGx will report information for {x}")
             reformatted_variants[y] = x
-    star_alleles = {}
-
-    for allele in definition_table.samples:
-        df = definition_table.df[definition_table.df[allele] == '1']
-        star_alleles[allele] = set(df.apply(lambda r: f'{r.CHROM}-{r.POS}-{r.REF}-{r.ALT}', axis=1))
-
     samples = {}
 
     def one_haplotype(observed):
@@ -1146,26 +1970,39 @@ def predict_alleles(consolidated_variants):
         candidates = core.sort_alleles(candidates, by='priority', gene=gene, assembly=assembly)
         return candidates
 
-    def one_row(r, sample, i):
-        gt = r[sample].split(':')[0]
-        if '.' in gt:
-            return ''
-        j = int(gt.split('|')[i])
-        if j == 0:
-            return ''
-        alt = r.ALT.split(',')[j-1]
-        variant = f'{r.CHROM}-{r.POS}-{r.REF}-{alt}'
-        if variant in variant_synonyms:
-            variant = variant_synonyms[variant]
-        if variant not in defining_variants:
-            return ''
-        return variant
-
-    for sample in consolidated_variants.data.samples:
+    vf = consolidated_variants.data
+    genotypes = _parse_genotypes(vf)
+
+    # Resolve every ALT allele to its variant name once. The AF lookup table
+    # points to the first record carrying the variant, as VcfFrame.get_af does.
+    names = []
+    af_index = {}
+
+    for i, r in enumerate(vf.df[['CHROM', 'POS', 'REF', 'ALT']].itertuples()):
+        l = []
+        for j, alt in enumerate(r.ALT.split(',')):
+            variant = f'{r.CHROM}-{r.POS}-{r.REF}-{alt}'
+            if variant not in af_index:
+                af_index[variant] = (i, j + 1)
+            if variant in variant_synonyms:
+                variant = variant_synonyms[variant]
+            l.append(variant if variant in defining_variants else '')
+        names.append(l)
+
+    def get_af(j, variant):
+        if variant not in af_index:
+            return np.nan
+        i, k = af_index[variant]
+        return float(genotypes['AF'][i, j, k])
+
+    for j, sample in enumerate(vf.samples):
         results = []
         alt_phase = []
         all_alleles = []
 
+        gt = genotypes['GT'][:, j, :]
+        missing = (gt < 0).any(axis=1)
+
         for i in [0, 1, 2]:
             if i == 2:
                 candidates = one_haplotype(set(alt_phase))
@@ -1173,7 +2010,8 @@ def predict_alleles(consolidated_variants):
                 all_alleles += [x for x in candidates if x not in all_alleles]
                 all_alleles = core.sort_alleles(all_alleles, by='priority', gene=gene, assembly=assembly)
             else:
-                observed = consolidated_variants.data.df.apply(one_row, args=(sample, i), axis=1)
+                rows = np.flatnonzero(~missing & (gt[:, i] > 0))
+                observed = [names[k][gt[k, i] - 1] for k in rows]
                 observed = [x for x in observed if x]
                 alt_phase += [x for x in observed if x not in alt_phase]
                 candidates = one_haplotype(observed)
@@ -1188,7 +2026,7 @@ def predict_alleles(consolidated_variants):
                 af_list.append(f'{allele}:default')
             else:
                 variants = ','.join(star_alleles[allele])
-                fractions = ','.join([str(consolidated_variants.data.get_af(sample, reformatted_variants[x])) if x in reformatted_variants else str(consolidated_variants.data.get_af(sample, x)) for x in star_alleles[allele]])
+                fractions = ','.join([str(get_af(j, reformatted_variants[x])) if x in reformatted_variants else str(get_af(j, x)) for x in star_alleles[allele]])
                 af_list.append(f'{allele}:{variants}:{fractions}')
 
         results.append(';'.join(af_list) + ';')
@@ -1229,10 +2067,10 @@ def predict_cnv(copy_number, cnv_caller=None):
 
     gene = copy_number.metadata['Gene']
     assembly = copy_number.metadata['Assembly']
-    model_file = f'{sdk.get_bundle_path()}/cnv/{assembly}/{gene}.zip'
 
     if cnv_caller is None:
-        cnv_caller = sdk.Archive.from_file(model_file)
+        model_file = f'{sdk.get_bundle_path()}/cnv/{assembly}/{gene}.zip'
+        cnv_caller = _load_cnv_caller(model_file)
     else:
         if isinstance(cnv_caller, str):
             cnv_caller = sdk.Archive.from_file(cnv_caller)
@@ -1240,8 +2078,9 @@ def predict_cnv(copy_number, cnv_caller=None):
         cnv_caller.check_type('Model[CNV]')
 
     copy_number = _process_copy_number(copy_number)
-    df = copy_number.data.df.iloc[:, 2:]
-    X = df.T.to_numpy()
+    X = _extract_features(
+        copy_number, bin_size=cnv_caller.metadata.get('BinSize')
+    )
     predictions = cnv_caller.data.predict(X)
     cnv_table = core.load_cnv_table()
     cnv_table = cnv_table[cnv_table.Gene == copy_number.metadata['Gene']]
@@ -1254,6 +2093,326 @@ def predict_cnv(copy_number, cnv_caller=None):
 
     return sdk.Archive(metadata, data)
 
+def predict_cnv_batch(
+    depth_of_coverage, control_statistics, genes=None,
+    samples_without_sv=None, chunk_size=100000, n_jobs=1
+):
+    """
+    Predict CNV for multiple target genes from depth of coverage data.
+
+    For each target gene with SV, the method will import read depth, compute
+    copy number, and predict CNV as in :meth:`api.utils.predict_cnv`. The
+    input archives are read only once, and pre-trained CNV callers in the
+    ``pypgx-bundle`` directory are loaded lazily and cached for the lifetime
+    of the process, with the least recently used models evicted first.
+
+    Read depth of the target genes is copied once into a single float32
+    matrix and normalized to copy number in place, in blocks of
+    ``chunk_size`` positions. Each gene's copy number is a view of its rows
+    in this matrix, so no per-gene copies of the depth data are made. With
+    ``n_jobs`` greater than 1, the matrix is placed in shared memory and
+    genes are processed by that many worker processes, which view the
+    matrix without copying it.
+
+    Parameters
+    ----------
+    depth_of_coverage : str or pypgx.Archive
+        Archive file or object with the semantic type
+        CovFrame[DepthOfCoverage].
+    control_statistics : str or pypgx.Archive
+        Archive file or object with the semantic type
+        SampleTable[Statistics].
+    genes : list, optional
+        List of genes to include. By default, all target genes with SV that
+        are present in the depth of coverage data will be used.
+    samples_without_sv : list, optional
+        List of known samples without SV.
+    chunk_size : int, default: 100000
+        Number of genomic positions to normalize at a time.
+    n_jobs : int, default: 1
+        Number of worker processes used to predict CNV for genes in
+        parallel. The same number of threads is used for normalization.
+
+    Returns
+    -------
+    dict
+        Dictionary mapping each gene to an Archive object with the semantic
+        type SampleTable[CNVCalls].
+    """
+    from fuc import common
+
+    if isinstance(depth_of_coverage, str):
+        depth_of_coverage = sdk.Archive.from_file(depth_of_coverage)
+
+    depth_of_coverage.check_type('CovFrame[DepthOfCoverage]')
+
+    if isinstance(control_statistics, str):
+        control_statistics = sdk.Archive.from_file(control_statistics)
+
+    control_statistics.check_type('SampleTable[Statistics]')
+
+    sdk.compare_metadata('Assembly', depth_of_coverage, control_statistics)
+    sdk.compare_metadata('Platform', depth_of_coverage, control_statistics)
+
+    samples = depth_of_coverage.data.samples
+
+    if set(samples) != set(control_statistics.data.index):
+        raise ValueError('Different sample sets found')
+
+    if genes is None:
+        gene_table = core.load_gene_table()
+        genes = gene_table[gene_table.SV].Gene.to_list()
+        skip_missing = True
+    else:
+        skip_missing = False
+
+    assembly = depth_of_coverage.metadata['Assembly']
+    df = depth_of_coverage.data.df
+
+    # Sort rows by contig and position so that each gene is a contiguous
+    # range of rows.
+    codes, contigs = pd.factorize(df.Chromosome)
+    contigs = [str(x).replace('chr', '') for x in contigs]
+    order = np.lexsort((df.Position.to_numpy(), codes))
+    codes = codes[order]
+    positions = df.Position.to_numpy()[order]
+
+    spans = {}
+
+    for gene in genes:
+        region = core.get_region(gene, assembly=assembly)
+        chrom, start, end = common.parse_region(region)
+        lo = hi = 0
+        if chrom in contigs:
+            a, b = np.searchsorted(codes, [contigs.index(chrom),
+                contigs.index(chrom) + 1])
+            lo = a + np.searchsorted(positions[a:b], start)
+            hi = a + np.searchsorted(positions[a:b], end, side='right')
+        if lo == hi:
+            if skip_missing:
+                continue
+            raise ValueError(f"No read depth found for gene '{gene}'")
+        spans[gene] = (chrom, lo, hi)
+
+    # Merge overlapping genes so that shared rows are stored only once.
+    merged = []
+    for chrom, lo, hi in sorted(spans.values(), key=lambda x: x[1]):
+        if merged and lo <= merged[-1][1]:
+            merged[-1][1] = max(merged[-1][1], hi)
+        else:
+            merged.append([lo, hi])
+    rows = np.concatenate(
+        [order[lo:hi] for lo, hi in merged] or [np.array([], dtype=int)])
+    offsets = np.cumsum([0] + [hi - lo for lo, hi in merged])
+
+    def locate(lo, hi):
+        i = max(i for i, x in enumerate(merged) if x[0] <= lo)
+        return offsets[i] + lo - merged[i][0], offsets[i] + hi - merged[i][0]
+
+    shape = (len(rows), len(samples))
+
+    if n_jobs == 1:
+        shm = None
+        depth = np.empty(shape, dtype=np.float32)
+    else:
+        from multiprocessing import shared_memory
+        shm = shared_memory.SharedMemory(create=True,
+            size=max(int(np.prod(shape)) * 4, 1))
+        depth = np.ndarray(shape, dtype=np.float32, buffer=shm.buf)
+
+    try:
+        # Copy column by column in tiles of rows, because the input frame
+        # usually stores each sample as a separate block.
+        columns = [df[x].to_numpy() for x in samples]
+        for start in range(0, len(rows), 4096):
+            tile = rows[start:start + 4096]
+            for j, column in enumerate(columns):
+                depth[start:start + len(tile), j] = column[tile]
+        del columns
+
+        # Make sure samples are in the same order.
+        medians = control_statistics.data.loc[samples, '50%'].to_numpy()
+
+        # Apply inter-sample normalization as well for targeted sequencing.
+        if depth_of_coverage.metadata['Platform'] == 'Targeted':
+            if samples_without_sv is None:
+                reference = np.arange(len(samples))
+            else:
+                reference = np.array(
+                    [samples.index(x) for x in samples_without_sv])
+        else:
+            reference = None
+
+        _normalize_read_depth(depth, medians, reference=reference,
+            chunk_size=chunk_size, n_jobs=n_jobs, out=depth)
+
+        jobs = {}
+
+        for gene, (chrom, lo, hi) in spans.items():
+            metadata = depth_of_coverage.copy_metadata()
+            metadata['Gene'] = gene
+            metadata['SemanticType'] = 'CovFrame[CopyNumber]'
+            metadata['Control'] = control_statistics.metadata['Control']
+            if samples_without_sv is None:
+                metadata['Samples'] = 'None'
+            else:
+                metadata['Samples'] = ','.join(samples_without_sv)
+            jobs[gene] = (*locate(lo, hi), chrom, positions[lo:hi], samples,
+                metadata)
+
+        # Release the input data before predicting.
+        df = depth_of_coverage = None
+
+        if shm is None:
+            results = {
+                gene: _predict_cnv_rows(depth, *args)
+                for gene, args in jobs.items()
+            }
+        else:
+            from concurrent.futures import ProcessPoolExecutor
+            with ProcessPoolExecutor(max_workers=n_jobs) as executor:
+                futures = {
+                    gene: executor.submit(_predict_cnv_shared, shm.name,
+                        shape, *args)
+                    for gene, args in jobs.items()
+                }
+                results = {k: v.result() for k, v in futures.items()}
+    finally:
+        if shm is not None:
+            del depth
+            shm.close()
+            shm.unlink()
+
+    return results
+
+def prepare_depth_and_statistics(
+    bams, control, assembly='GRCh37', bed=None, genes=None, exclude=False,
+    window_size=100000
+):
+    """
+    Prepare a depth of coverage file and control statistics together.
+
+    This method combines :meth:`api.utils.prepare_depth_of_coverage` and
+    :meth:`api.utils.compute_control_statistics` so that each region of the
+    input BAM files is read only once. Read depth is counted with one
+    ``samtools depth`` run per target region, as in
+    :meth:`api.utils.prepare_depth_of_coverage`, and one run for the whole
+    control gene. The control gene's output is streamed from a temporary
+    file in windows of ``window_size`` positions and accumulated into
+    per-sample histograms of integer depth, so the per-base matrix of the
+    control region is never held in memory. Because depth is an integer,
+    summary statistics including quantiles are exact and identical to those
+    from :meth:`api.utils.compute_control_statistics`.
+
+    Note that for the arguments ``control`` and ``bed``, the 'chr' prefix in
+    contig names (e.g. 'chr1' vs. '1') will be automatically added or
+    removed as necessary to match the input BAM's contig names.
+
+    Parameters
+    ----------
+    bams : str or list
+        One or more input BAM or CRAM files. Alternatively, you can provide
+        a text file (.txt, .tsv, .csv, or .list) containing one file per
+        line.
+    control : str
+        Control gene (recommended choices: 'EGFR', 'RYR1', 'VDR').
+        Alternatively, you can provide a custom region (format:
+        chrom:start-end).
+    assembly : {'GRCh37', 'GRCh38'}, default: 'GRCh37'
+        Reference genome assembly.
+    bed : str, optional
+        By default, the input data is assumed to be WGS. If it's targeted
+        sequencing, you must provide a BED file to indicate probed regions.
+    genes : list, optional
+        List of genes to include.
+    exclude : bool, default: False
+        Exclude specified genes. Ignored when ``genes=None``.
+    window_size : int, default: 100000
+        Number of control positions to count at a time.
+
+    Returns
+    -------
+    tuple
+        Archive objects with the semantic types CovFrame[DepthOfCoverage]
+        and SampleTable[Statistics], respectively.
+    """
+    import pysam
+    from fuc import pybam, pycov, common, pybed
+    platform = 'Targeted' if bed else 'WGS'
+
+    regions = create_regions_bed(
+        merge=True, sv_genes=True, assembly=assembly, genes=genes,
+        exclude=exclude
+    ).to_regions()
+
+    cf = pycov.CovFrame.from_bam(bams, regions=regions, zero=True)
+
+    if bed:
+        bf = _match_chr_prefix(pybed.BedFrame.from_file(bed), cf)
+        df = cf.copy_df()
+        mask = _in_bed(df.Chromosome, df.Position, bf)
+        df[df.columns[2:]] = df.iloc[:, 2:].astype(float)
+        df.loc[~mask, df.columns[2:]] = np.nan
+        cf = pycov.CovFrame(df)
+
+    metadata = {
+        'Assembly': assembly,
+        'SemanticType': 'CovFrame[DepthOfCoverage]',
+        'Platform': platform,
+    }
+
+    depth_of_coverage = sdk.Archive(metadata, cf)
+
+    if control in core.list_genes(mode='all'):
+        region = core.get_region(control, assembly=assembly)
+    else:
+        region = control
+
+    # Match the 'chr' prefix of the input BAM files.
+    bams = common.parse_list_or_file(bams)
+    if all([pybam.has_chr_prefix(x) for x in bams]):
+        region = 'chr' + region.replace('chr', '')
+    else:
+        region = region.replace('chr', '')
+
+    histograms = [np.zeros(1, dtype=np.int64) for x in cf.samples]
+
+    with tempfile.TemporaryDirectory() as t:
+        pysam.depth(*bams, '-a', '-r', region, '-o', f'{t}/depth.tsv')
+        if os.path.getsize(f'{t}/depth.tsv'):
+            chunks = pd.read_csv(
+                f'{t}/depth.tsv', sep='\t', header=None,
+                dtype={0: str}, chunksize=window_size
+            )
+        else:
+            chunks = []
+        for chunk in chunks:
+            depth = chunk.iloc[:, 2:].to_numpy(dtype=np.int64)
+            # Positions with zero depth in all samples are not counted.
+            keep = depth.any(axis=1)
+            if bed:
+                keep &= _in_bed(chunk[0], chunk[1], bf)
+            depth = depth[keep]
+            for j in range(depth.shape[1]):
+                histograms[j] = _add_histogram(histograms[j], depth[:, j])
+
+    data = pd.DataFrame(
+        [_describe_histogram(x) for x in histograms], index=cf.samples,
+        columns=['count', 'mean', 'std', 'min', '25%', '50%', '75%', 'max'],
+        dtype=float
+    )
+
+    metadata = {
+        'Control': control,
+        'Assembly': assembly,
+        'SemanticType': 'SampleTable[Statistics]',
+        'Platform': platform,
+    }
+
+    control_statistics = sdk.Archive(metadata, data)
+
+    return depth_of_coverage, control_statistics
+
 def prepare_depth_of_coverage(
     bams, assembly='GRCh37', bed=None, genes=None, exclude=False
 ):
@@ -1269,8 +2428,9 @@ def prepare_depth_of_coverage(
     Parameters
     ----------
     bams : str or list
-        One or more input BAM files. Alternatively, you can provide a text
-        file (.txt, .tsv, .csv, or .list) containing one BAM file per line.
+        One or more input BAM or CRAM files. Alternatively, you can provide
+        a text file (.txt, .tsv, .csv, or .list) containing one file per
+        line.
     assembly : {'GRCh37', 'GRCh38'}, default: 'GRCh37'
         Reference genome assembly.
     bed : str, optional
@@ -1289,6 +2449,7 @@ def prepare_depth_of_coverage(
     pypgx.Archive
         Archive object with the semantic type CovFrame[DepthOfCoverage].
     """
+    from fuc import pycov, pybed
     metadata = {
         'Assembly': assembly,
         'SemanticType': 'CovFrame[DepthOfCoverage]',
@@ -1360,7 +2521,7 @@ def print_metadata(input):
         print(f.read().decode('utf-8').strip())
 
 def slice_bam(
-    input, output, assembly='GRCh37', genes=None, exclude=False
+    input, output, assembly='GRCh37', genes=None, exclude=False, fasta=None
 ):
     """
     Slice BAM file for all genes used by PyPGx.
@@ -1368,7 +2529,8 @@ def slice_bam(
     Parameters
     ----------
     input
-        Input BAM file. It must be already indexed to allow random access.
+        Input BAM or CRAM file. It must be already indexed to allow random
+        access.
     output : str
         Output BAM file.
     assembly : {'GRCh37', 'GRCh38'}, default: 'GRCh37'
@@ -1377,10 +2539,165 @@ def slice_bam(
         List of genes to include.
     exclude : bool, default: False
         Exclude specified genes. Ignored when ``genes=None``.
+    fasta : str, optional
+        Reference FASTA file used to decode CRAM input. If the REF_CACHE
+        environment variable is set, the reference sequences are read from
+        this htslib cache, which is filled from the FASTA file as needed.
     """
-    bf = create_regions_bed(merge=True, assembly=assembly,
-        genes=genes, exclude=exclude)
-    pybam.slice(input, bf, path=output)
+    regions = create_regions_bed(merge=True, assembly=assembly,
+        genes=genes, exclude=exclude).to_regions()
+    _slice(input, output, regions,
+        reference=_reference_options(input, fasta, regions))
+
+def slice_bam_batch(
+    bams, output, assembly='GRCh37', genes=None, exclude=False, padding=0,
+    n_jobs=1, threads=1, fasta=None
+):
+    """
+    Slice many BAM or CRAM files for all genes used by PyPGx.
+
+    Each input file is sliced to an indexed BAM file in the output directory
+    with the same name as the input (e.g. 1.cram becomes 1.bam). Files are
+    sliced in parallel with ``n_jobs`` worker processes, each of which uses
+    ``threads`` threads for BGZF compression and indexing.
+
+    The output directory will also contain a manifest (manifest.tsv) with a
+    quick checksum of each input file, a checksum of the sliced regions,
+    and an MD5 checksum of each output file. The manifest is updated as soon
+    as a file is done, and files whose input, regions, and output still
+    match the manifest are skipped, so that an interrupted run can be
+    resumed by running the same command again.
+
+    Parameters
+    ----------
+    bams : str or list
+        One or more input BAM or CRAM files. They must be already indexed to
+        allow random access. Alternatively, you can provide a text file
+        (.txt, .tsv, .csv, or .list) containing one file per line.
+    output : str
+        Output directory.
+    assembly : {'GRCh37', 'GRCh38'}, default: 'GRCh37'
+        Reference genome assembly.
+    genes : list, optional
+        List of genes to include.
+    exclude : bool, default: False
+        Exclude specified genes. Ignored when ``genes=None``.
+    padding : int, default: 0
+        Number of base pairs to add on both sides of each gene.
+    n_jobs : int, default: 1
+        Number of files to slice in parallel.
+    threads : int, default: 1
+        Number of additional threads used by each worker for compression
+        and indexing.
+    fasta : str, optional
+        Reference FASTA file used to decode CRAM input. If the REF_CACHE
+        environment variable is set, the reference sequences are read from
+        this htslib cache, which is filled from the FASTA file as needed and
+        shared by all workers.
+
+    Returns
+    -------
+    pandas.DataFrame
+        Manifest of the input files.
+    """
+    import json
+    import hashlib
+    from concurrent.futures import ProcessPoolExecutor, as_completed
+    from fuc import common, pybed
+
+    bams = common.parse_list_or_file(bams)
+
+    names = [os.path.splitext(os.path.basename(x))[0] for x in bams]
+    if len(set(names)) != len(names):
+        raise ValueError('Duplicate input file names found')
+
+    bf = create_regions_bed(assembly=assembly, genes=genes, exclude=exclude)
+    df = bf.gr.df
+    df['Start'] = (df.Start - padding).clip(lower=0)
+    df['End'] = df.End + padding
+    regions = pybed.BedFrame.from_frame([], df).merge().to_regions()
+    regions_checksum = hashlib.md5(json.dumps(regions).encode()).hexdigest()
+
+    os.makedirs(output, exist_ok=True)
+    manifest = f'{output}/manifest.tsv'
+    columns = ['Input', 'Output', 'InputChecksum', 'RegionsChecksum',
+        'Checksum']
+
+    if os.path.exists(manifest):
+        previous = pd.read_table(manifest, dtype=str)
+        previous = previous.drop_duplicates('Input', keep='last')
+        previous = previous.set_index('Input').to_dict('index')
+    else:
+        previous = {}
+
+    rows = {}
+    jobs = {}
+
+    for bam, name in zip(bams, names):
+        row = {
+            'Input': bam, 'Output': f'{output}/{name}.bam',
+            'InputChecksum': _quick_checksum(bam),
+            'RegionsChecksum': regions_checksum,
+        }
+        done = previous.get(bam)
+        if (done is not None
+            and done['InputChecksum'] == row['InputChecksum']
+            and done['RegionsChecksum'] == row['RegionsChecksum']
+            and os.path.exists(row['Output'])
+            and os.path.exists(f"{row['Output']}.bai")
+            and done['Checksum'] == _file_checksum(row['Output'])):
+            rows[bam] = {**row, 'Checksum': done['Checksum']}
+        else:
+            jobs[bam] = row
+
+    def record(row):
+        rows[row['Input']] = row
+        new = not os.path.exists(manifest)
+        with open(manifest, 'a') as f:
+            if new:
+                f.write('\t'.join(columns) + '\n')
+            f.write('\t'.join(row[x] for x in columns) + '\n')
+
+    error = None
+
+    # Fill the reference cache before starting the workers.
+    references = {
+        bam: _reference_options(bam, fasta, regions) for bam in jobs
+    }
+
+    if n_jobs == 1:
+        for bam, row in jobs.items():
+            row['Checksum'] = _slice_and_index(bam, row['Output'], regions,
+                threads=threads, reference=references[bam])
+            record(row)
+    else:
+        with ProcessPoolExecutor(max_workers=n_jobs) as executor:
+            futures = {
+                executor.submit(_slice_and_index, bam, row['Output'],
+                    regions, threads=threads, reference=references[bam]): row
+                for bam, row in jobs.items()
+            }
+            for future in as_completed(futures):
+                try:
+                    futures[future]['Checksum'] = future.result()
+                except Exception as e:
+                    error = error or e
+                    continue
+                record(futures[future])
+
+    # Rewrite the manifest in input order, keeping other files' entries.
+    others = [{'Input': k, **v} for k, v in previous.items() if k not in rows]
+    result = pd.DataFrame([rows[x] for x in bams if x in rows],
+        columns=columns)
+    temp = f'{manifest}.tmp'
+    pd.DataFrame(others + result.to_dict('records'), columns=columns).to_csv(
+        temp, sep='\t', index=False)
+    os.replace(temp, manifest)
+
+    if error is not None:
+        raise error
+
+    return result
 
 def test_cnv_caller(
     cnv_caller, copy_number, cnv_calls, confusion_matrix=None,
@@ -1404,6 +2721,7 @@ def test_cnv_caller(
         Write a CSV file comparing actual vs. predicted CNV calls for each
         sample.
     """
+    from sklearn import metrics
     if isinstance(cnv_caller, str):
         cnv_caller = sdk.Archive.from_file(cnv_caller)
 
@@ -1433,7 +2751,9 @@ def test_cnv_caller(
     samples = cnv_calls.data.index.to_list()
     columns = ['Chromosome', 'Position'] + samples
     copy_number.data.df = copy_number.data.df[columns]
-    X = copy_number.data.df.iloc[:, 2:].T.to_numpy()
+    X = _extract_features(
+        copy_number, bin_size=cnv_caller.metadata.get('BinSize')
+    )
     Y = cnv_calls.data['Code'].to_numpy()
     predictions = cnv_caller.data.predict(X)
     results = predictions == Y
@@ -1455,7 +2775,8 @@ def test_cnv_caller(
         df.to_csv(comparison_table, index=False)
 
 def train_cnv_caller(
-    copy_number, cnv_calls, confusion_matrix=None, comparison_table=None
+    copy_number, cnv_calls, confusion_matrix=None, comparison_table=None,
+    bin_size=None, param_grid=None, cv=5, n_jobs=1
 ):
     """
     Train a CNV caller for the target gene.
@@ -1463,6 +2784,11 @@ def train_cnv_caller(
     This method will return a SVM-based multiclass classifier that makes CNV
     calls using the one-vs-rest strategy.
 
+    If ``param_grid`` is provided, SVM hyperparameters are selected by
+    cross-validated grid search before the final model is fitted to all
+    samples. Copy number is processed only once and the resulting features
+    are shared by all folds and candidates.
+
     Parameters
     ----------
     copy_number : str or pypgx.Archive
@@ -1475,12 +2801,31 @@ def train_cnv_caller(
     comparison_table : str, optional
         Write a CSV file comparing actual vs. predicted CNV calls for each
         sample.
+    bin_size : int, optional
+        By default, copy number at every position is used as a feature. If
+        provided, the copy number profile is summarized as mean copy number
+        in bins of this many positions, which makes training and prediction
+        faster and use less memory. The bin size is stored in the model's
+        metadata as 'BinSize' so that prediction applies the same transform.
+    param_grid : dict or list, optional
+        Hyperparameters of :class:`sklearn.svm.SVC` to search over, such as
+        ``{'C': [0.1, 1, 10], 'kernel': ['rbf', 'linear']}``. A list of
+        dictionaries can be used to search separate grids.
+    cv : int, default: 5
+        Number of stratified cross-validation folds for the grid search.
+    n_jobs : int, default: 1
+        Number of CPU cores used to fit the one-vs-rest classifiers, or the
+        cross-validation candidates when ``param_grid`` is provided.
 
     Returns
     -------
     pypgx.Archive
         Archive object with the semantic type Model[CNV].
     """
+    from sklearn import metrics
+    from sklearn.model_selection import GridSearchCV
+    from sklearn.multiclass import OneVsRestClassifier
+    from sklearn.svm import SVC
     if isinstance(copy_number, str):
         copy_number = sdk.Archive.from_file(copy_number)
 
@@ -1505,11 +2850,35 @@ def train_cnv_caller(
     samples = cnv_calls.data.index.to_list()
     columns = ['Chromosome', 'Position'] + samples
     copy_number.data.df = copy_number.data.df[columns]
-    X = copy_number.data.df.iloc[:, 2:].T.to_numpy()
+    X = _extract_features(copy_number, bin_size=bin_size)
     Y = cnv_calls.data['Code'].to_numpy()
-    model = OneVsRestClassifier(SVC(random_state=1)).fit(X, Y)
+
+    if param_grid is None:
+        model = OneVsRestClassifier(SVC(random_state=1), n_jobs=n_jobs)
+        model.fit(X, Y)
+    else:
+        if isinstance(param_grid, dict):
+            param_grid = [param_grid]
+        param_grid = [
+            {f'estimator__{k}': v for k, v in x.items()} for x in param_grid
+        ]
+        search = GridSearchCV(
+            OneVsRestClassifier(SVC(random_state=1)), param_grid, cv=cv,
+            n_jobs=n_jobs
+        )
+        search.fit(X, Y)
+        params = {
+            k.replace('estimator__', ''): v
+            for k, v in search.best_params_.items()
+        }
+        print(f'Best parameters: {params}')
+        print(f'Cross-validation accuracy: {search.best_score_:.3f}')
+        model = search.best_estimator_
+
     metadata = copy_number.copy_metadata()
     metadata['SemanticType'] = 'Model[CNV]'
+    if bin_size is not None:
+        metadata['BinSize'] = bin_size
     predictions = model.predict(X)
     results = predictions == Y
     print(f'Accuracy: {sum(results)/len(Y):.3f} ({sum(results)}/{len(Y)})')
@@ -1517,6 +2886,10 @@ def train_cnv_caller(
     Y = [code2name[x] for x in Y]
     predictions = [code2name[x] for x in predictions]
 
+    labels = [x for x in cnv_table.Name if x in Y or x in predictions]
+    print(metrics.classification_report(Y, predictions, labels=labels,
+        zero_division=0))
+
     if confusion_matrix is not None:
         labels = cnv_table.Name.to_list()
         df = pd.DataFrame(metrics.confusion_matrix(Y, predictions, labels=labels))
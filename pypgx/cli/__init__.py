@@ -4,6 +4,6 @@ from pathlib import Path
 commands = {}
 
 for f in sorted(Path(__file__).parent.glob('*.py')):
-    if '__' in f.stem:
+    if f.stem.startswith('_'):
         continue
     commands[f.stem.replace('_', '-')] = import_module(f'.{f.stem}', __package__)
@@ -0,0 +1,55 @@
+"""
+Helpers for building command parsers without importing heavy dependencies.
+"""
+
+import sys
+from argparse import RawTextHelpFormatter, SUPPRESS
+from pathlib import Path
+
+def script_name():
+    """Return the command name of the calling script."""
+    return Path(sys._getframe(1).f_code.co_filename).stem.replace('_', '-')
+
+def add_parser(subparsers, name, output=None, **kwargs):
+    """
+    Return the pre-formatted parser.
+
+    The optional ``output`` is the destination of the argument holding the
+    command's output file or directory, which is where profiles are written.
+    """
+    parser = subparsers.add_parser(
+        name,
+        add_help=False,
+        formatter_class=RawTextHelpFormatter,
+        **kwargs,
+    )
+    parser._positionals.title = 'Positional arguments'
+    parser._optionals.title = 'Optional arguments'
+    parser.add_argument(
+        '-h',
+        '--help',
+        action='help',
+        default=SUPPRESS,
+        help='Show this help message and exit.',
+    )
+    if name != 'serve':
+        parser.set_defaults(output_argument=output)
+        parser.add_argument(
+            '--server',
+            metavar='PATH',
+            help=
+"""Submit the command to a running 'pypgx serve' process
+listening on this socket instead of running it here."""
+        )
+        parser.add_argument(
+            '--profile',
+            metavar='TEXT',
+            choices=['cprofile', 'tracemalloc', 'sampling'],
+            help=
+"""Profile the command with this profiler ('cprofile',
+'tracemalloc', or 'sampling'). The profile and a summary
+of the top functions are written to the output directory,
+next to the output file, or to the current directory.
+The 'sampling' profiler has low overhead."""
+        )
+    return parser
@@ -1,17 +1,14 @@
-import sys
-
-from ..api import genotype
-
-import fuc
+from ._common import add_parser, script_name
 
 description = f"""
 Call genotypes for target gene.
 """
 
 def create_parser(subparsers):
-    parser = fuc.api.common._add_parser(
+    parser = add_parser(
         subparsers,
-        fuc.api.common._script_name(),
+        script_name(),
+        output='genotypes',
         description=description,
         help=
 """Call genotypes for target gene."""
@@ -38,6 +35,7 @@ SampleTable[CNVCalls]."""
     )
 
 def main(args):
+    from ..api import genotype
     archive = genotype.call_genotypes(
         alleles=args.alleles, cnv_calls=args.cnv_calls
     )
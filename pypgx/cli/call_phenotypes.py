@@ -1,17 +1,14 @@
-import sys
-
-from ..api import utils
-
-import fuc
+from ._common import add_parser, script_name
 
 description = f"""
 Call phenotypes for target gene.
 """
 
 def create_parser(subparsers):
-    parser = fuc.api.common._add_parser(
+    parser = add_parser(
         subparsers,
-        fuc.api.common._script_name(),
+        script_name(),
+        output='phenotypes',
         description=description,
         help=
 """Call phenotypes for target gene."""
@@ -30,5 +27,6 @@ SampleTable[Phenotypes]."""
     )
 
 def main(args):
+    from ..api import utils
     archive = utils.call_phenotypes(args.genotypes)
     archive.to_file(args.phenotypes)
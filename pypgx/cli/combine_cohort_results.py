@@ -0,0 +1,56 @@
+from ._common import add_parser, script_name
+
+description = f"""
+Combine results for multiple genes into a cohort-wide table.
+
+The output is a sample-by-gene table with genotype, phenotype, CNV, and
+activity score for each gene, stored in a columnar format that can be loaded
+in a fraction of the time it takes to read the individual archives.
+"""
+
+epilog = f"""
+[Example] From results archives:
+  $ pypgx {script_name()} \\
+  cohort-results.zip \\
+  CYP2D6-results.zip CYP2C19-results.zip
+
+[Example] From a text file listing results archives:
+  $ pypgx {script_name()} \\
+  cohort-results.zip \\
+  results.list
+"""
+
+def create_parser(subparsers):
+    parser = add_parser(
+        subparsers,
+        script_name(),
+        output='cohort_results',
+        description=description,
+        epilog=epilog,
+        help=
+"""Combine results for multiple genes into a cohort-wide table."""
+    )
+    parser.add_argument(
+        'cohort_results',
+        metavar='cohort-results',
+        help=
+"""Output archive file with the semantic type
+SampleTable[CohortResults]."""
+    )
+    parser.add_argument(
+        'results',
+        nargs='+',
+        help=
+"""Input archive files with the semantic type
+SampleTable[Results]. Results for the same gene from
+different batches are concatenated, as long as no
+sample appears in more than one of them.
+Alternatively, you can provide a text file (.txt,
+.tsv, .csv, or .list) containing one archive file
+per line."""
+    )
+
+def main(args):
+    from ..api import utils
+    archive = utils.combine_cohort_results(args.results)
+    archive.to_file(args.cohort_results)
@@ -1,17 +1,14 @@
-import sys
-
-from ..api import utils
-
-import fuc
+from ._common import add_parser, script_name
 
 description = f"""
 Combine various results for target gene.
 """
 
 def create_parser(subparsers):
-    parser = fuc.api.common._add_parser(
+    parser = add_parser(
         subparsers,
-        fuc.api.common._script_name(),
+        script_name(),
+        output='results',
         description=description,
         help=
 """Combine various results for target gene."""
@@ -52,6 +49,7 @@ SampleTable[CNVCalls]."""
     )
 
 def main(args):
+    from ..api import utils
     archive = utils.combine_results(
         genotypes=args.genotypes, phenotypes=args.phenotypes,
         alleles=args.alleles, cnv_calls=args.cnv_calls
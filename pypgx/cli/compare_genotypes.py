@@ -1,8 +1,4 @@
-import sys
-
-from ..api import utils
-
-import fuc
+from ._common import add_parser, script_name
 
 description = f"""
 Calculate concordance between two genotype results.
@@ -12,9 +8,9 @@ concordance for genotype calls as well as CNV calls.
 """
 
 def create_parser(subparsers):
-    parser = fuc.api.common._add_parser(
+    parser = add_parser(
         subparsers,
-        fuc.api.common._script_name(),
+        script_name(),
         description=description,
         help=
 """Calculate concordance between two genotype results."""
@@ -41,4 +37,5 @@ discordant calls."""
     )
 
 def main(args):
+    from ..api import utils
     utils.compare_genotypes(args.first, args.second, verbose=args.verbose)
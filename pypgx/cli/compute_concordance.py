@@ -0,0 +1,67 @@
+from ._common import add_parser, script_name
+
+description = f"""
+Calculate concordance between two sets of results for multiple genes.
+
+Samples and genes are aligned by name, and genotype, phenotype, and CNV calls
+are compared for every sample-gene pair present in both inputs. Each input
+can be a directory of pipeline runs (all results.zip files under it will be
+used), an archive file with the semantic type SampleTable[CohortResults], an
+archive file with the semantic type SampleTable[Results], or a text file
+(.txt, .tsv, .csv, or .list) containing one archive file per line.
+
+The output is a TSV file with the columns Gene, Field, Compared, Concordant,
+and Concordance.
+"""
+
+epilog = f"""
+[Example] Compare two batches of pipeline runs:
+  $ pypgx {script_name()} \\
+  concordance.tsv \\
+  wgs-runs \\
+  chip-runs \\
+  --discordance discordance.tsv
+"""
+
+def create_parser(subparsers):
+    parser = add_parser(
+        subparsers,
+        script_name(),
+        output='concordance',
+        description=description,
+        epilog=epilog,
+        help=
+"""Calculate concordance between two sets of results for
+multiple genes."""
+    )
+    parser.add_argument(
+        'concordance',
+        help=
+"""Output TSV file."""
+    )
+    parser.add_argument(
+        'first',
+        help=
+"""First set of results."""
+    )
+    parser.add_argument(
+        'second',
+        help=
+"""Second set of results."""
+    )
+    parser.add_argument(
+        '--discordance',
+        metavar='PATH',
+        help=
+"""Output TSV file for discordant calls, with the columns
+Sample, Gene, Field, First, and Second."""
+    )
+
+def main(args):
+    from ..api import utils
+    concordance, discordance = utils.compute_concordance(
+        args.first, args.second
+    )
+    concordance.to_csv(args.concordance, sep='\t', index=False)
+    if args.discordance:
+        discordance.to_csv(args.discordance, sep='\t', index=False)
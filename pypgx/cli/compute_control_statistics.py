@@ -1,9 +1,4 @@
-import sys
-
-from ..api import utils
-
-import fuc
-import pysam
+from ._common import add_parser, script_name
 
 description = """
 Compute summary statistics for control gene from BAM files.
@@ -15,13 +10,13 @@ match the input BAM's contig names.
 
 epilog = f"""
 [Example] For the VDR gene from WGS data:
-  $ pypgx {fuc.api.common._script_name()} \\
+  $ pypgx {script_name()} \\
   VDR \\
   control-statistics.zip \\
   1.bam 2.bam
 
 [Example] For a custom region from targeted sequencing data:
-  $ pypgx {fuc.api.common._script_name()} \\
+  $ pypgx {script_name()} \\
   chr1:100-200 \\
   control-statistics.zip \\
   bam.list \\
@@ -29,9 +24,10 @@ epilog = f"""
 """
 
 def create_parser(subparsers):
-    parser = fuc.api.common._add_parser(
+    parser = add_parser(
         subparsers,
-        fuc.api.common._script_name(),
+        script_name(),
+        output='control_statistics',
         description=description,
         epilog=epilog,
         help=
@@ -56,9 +52,9 @@ SampleTable[Statistics]."""
         'bams',
         nargs='+',
         help=
-"""One or more input BAM files. Alternatively, you can
-provide a text file (.txt, .tsv, .csv, or .list)
-containing one BAM file per line."""
+"""One or more input BAM or CRAM files. Alternatively,
+you can provide a text file (.txt, .tsv, .csv, or .list)
+containing one file per line."""
     )
     parser.add_argument(
         '--assembly',
@@ -78,6 +74,7 @@ to indicate probed regions."""
     )
 
 def main(args):
+    from ..api import utils
     result = utils.compute_control_statistics(
         args.gene, args.bams, assembly=args.assembly, bed=args.bed
     )
@@ -1,9 +1,4 @@
-import sys
-
-from ..api import utils
-
-import fuc
-import pysam
+from ._common import add_parser, script_name
 
 description = f"""
 Compute copy number from read depth for target gene.
@@ -18,9 +13,10 @@ without SV using --samples-without-sv.
 """
 
 def create_parser(subparsers):
-    parser = fuc.api.common._add_parser(
+    parser = add_parser(
         subparsers,
-        fuc.api.common._script_name(),
+        script_name(),
+        output='copy_number',
         description=description,
         help=
 """Compute copy number from read depth for target gene."""
@@ -53,10 +49,30 @@ CovFrame[CopyNumber]."""
         help=
 """List of known samples with no SV."""
     )
+    parser.add_argument(
+        '--chunk-size',
+        metavar='INT',
+        type=int,
+        default=100000,
+        help=
+"""Number of positions to normalize at a time (default:
+100000)."""
+    )
+    parser.add_argument(
+        '--n-jobs',
+        metavar='INT',
+        type=int,
+        default=1,
+        help=
+"""Number of threads used to normalize chunks in parallel
+(default: 1)."""
+    )
 
 def main(args):
+    from ..api import utils
     result = utils.compute_copy_number(
         args.read_depth, args.control_statistics,
-        samples_without_sv=args.samples_without_sv
+        samples_without_sv=args.samples_without_sv,
+        chunk_size=args.chunk_size, n_jobs=args.n_jobs
     )
     result.to_file(args.copy_number)
@@ -0,0 +1,63 @@
+from ._common import add_parser, script_name
+
+description = f"""
+Compute allele, diplotype, and phenotype frequencies for multiple genes.
+
+The output is a TSV file with the columns Gene, Type, Group (only with
+--groups), Value, Count, and Frequency. Frequency is computed among called
+values only, so it is empty for 'Indeterminate'.
+"""
+
+epilog = f"""
+[Example] From a cohort-wide results archive:
+  $ pypgx {script_name()} \\
+  frequencies.tsv \\
+  cohort-results.zip
+
+[Example] From results archives, by population:
+  $ pypgx {script_name()} \\
+  frequencies.tsv \\
+  CYP2D6-results.zip CYP2C19-results.zip \\
+  --groups populations.tsv
+"""
+
+def create_parser(subparsers):
+    parser = add_parser(
+        subparsers,
+        script_name(),
+        output='frequencies',
+        description=description,
+        epilog=epilog,
+        help=
+"""Compute allele, diplotype, and phenotype frequencies for
+multiple genes."""
+    )
+    parser.add_argument(
+        'frequencies',
+        help=
+"""Output TSV file."""
+    )
+    parser.add_argument(
+        'results',
+        nargs='+',
+        help=
+"""Input archive file with the semantic type
+SampleTable[CohortResults], or one or more archive files
+with the semantic type SampleTable[Results], each for a
+different gene. Alternatively, you can provide a text
+file (.txt, .tsv, .csv, or .list) containing one archive
+file per line."""
+    )
+    parser.add_argument(
+        '--groups',
+        metavar='PATH',
+        help=
+"""Tab-delimited file with two columns (sample and
+population label) and no header. Frequencies will be
+computed separately for each label."""
+    )
+
+def main(args):
+    from ..api import utils
+    df = utils.compute_frequencies(args.results, groups=args.groups)
+    df.to_csv(args.frequencies, sep='\t', index=False)
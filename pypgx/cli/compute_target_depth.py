@@ -1,9 +1,4 @@
-import tempfile
-
-from ..api import utils
-
-import fuc
-import pysam
+from ._common import add_parser, script_name
 
 description = f"""
 Compute read depth for target gene from BAM files.
@@ -11,13 +6,13 @@ Compute read depth for target gene from BAM files.
 
 epilog = f"""
 [Example] For the CYP2D6 gene from WGS data:
-  $ pypgx {fuc.api.common._script_name()} \\
+  $ pypgx {script_name()} \\
   CYP2D6 \\
   read-depth.zip \\
   1.bam 2.bam
 
 [Example] For the CYP2D6 gene from targeted sequencing data:
-  $ pypgx {fuc.api.common._script_name()} \\
+  $ pypgx {script_name()} \\
   CYP2D6 \\
   read-depth.zip \\
   bam.list \\
@@ -25,9 +20,10 @@ epilog = f"""
 """
 
 def create_parser(subparsers):
-    parser = fuc.api.common._add_parser(
+    parser = add_parser(
         subparsers,
-        fuc.api.common._script_name(),
+        script_name(),
+        output='read_depth',
         description=description,
         epilog=epilog,
         help=
@@ -49,9 +45,9 @@ CovFrame[ReadDepth]."""
         'bams',
         nargs='+',
         help=
-"""One or more input BAM files. Alternatively, you can
-provide a text file (.txt, .tsv, .csv, or .list)
-containing one BAM file per line."""
+"""One or more input BAM or CRAM files. Alternatively,
+you can provide a text file (.txt, .tsv, .csv, or .list)
+containing one file per line."""
     )
     parser.add_argument(
         '--assembly',
@@ -71,6 +67,7 @@ indicate probed regions."""
     )
 
 def main(args):
+    from ..api import utils
     archive = utils.compute_target_depth(
         args.gene, args.bams, assembly=args.assembly, bed=args.bed
     )
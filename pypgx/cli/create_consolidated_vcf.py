@@ -1,18 +1,14 @@
-import sys
-
-from ..api import utils
-
-import fuc
-import pysam
+from ._common import add_parser, script_name
 
 description = f"""
 Create a consolidated VCF file.
 """
 
 def create_parser(subparsers):
-    parser = fuc.api.common._add_parser(
+    parser = add_parser(
         subparsers,
-        fuc.api.common._script_name(),
+        script_name(),
+        output='consolidated_variants',
         description=description,
         help=
 """Create a consolidated VCF file."""
@@ -40,6 +36,7 @@ VcfFrame[Consolidated]."""
     )
 
 def main(args):
+    from ..api import utils
     archive = utils.create_consolidated_vcf(
         args.imported_variants, args.phased_variants
     )
@@ -1,8 +1,4 @@
-import sys
-
-from ..api import utils
-
-import fuc
+from ._common import add_parser, script_name
 
 description = f"""
 Call SNVs/indels from BAM files for all target genes.
@@ -14,9 +10,10 @@ only by structural variation (e.g. UGT2B17).
 """
 
 def create_parser(subparsers):
-    parser = fuc.api.common._add_parser(
+    parser = add_parser(
         subparsers,
-        fuc.api.common._script_name(),
+        script_name(),
+        output='vcf',
         description=description,
         help=
 """Call SNVs/indels from BAM files for all target genes."""
@@ -35,9 +32,9 @@ def create_parser(subparsers):
         'bams',
         nargs='+',
         help=
-"""One or more input BAM files. Alternatively, you can
-provide a text file (.txt, .tsv, .csv, or .list)
-containing one BAM file per line."""
+"""One or more input BAM or CRAM files. Alternatively,
+you can provide a text file (.txt, .tsv, .csv, or .list)
+containing one file per line."""
     )
     parser.add_argument(
         '--assembly',
@@ -87,6 +84,7 @@ to increase the maximum depth."""
     )
 
 def main(args):
+    from ..api import utils
     utils.create_input_vcf(
         args.vcf, args.fasta, args.bams, assembly=args.assembly,
         genes=args.genes, exclude=args.exclude, dir_path=args.dir_path,
@@ -1,18 +1,15 @@
 import sys
 
-from ..api import utils
-
-import fuc
-import pysam
+from ._common import add_parser, script_name
 
 description = f"""
 Create a BED file which contains all regions used by PyPGx.
 """
 
 def create_parser(subparsers):
-    parser = fuc.api.common._add_parser(
+    parser = add_parser(
         subparsers,
-        fuc.api.common._script_name(),
+        script_name(),
         description=description,
         help=
 """Create a BED file which contains all regions used by
@@ -76,6 +73,7 @@ used."""
     )
 
 def main(args):
+    from ..api import utils
     bf = utils.create_regions_bed(
         assembly=args.assembly, add_chr_prefix=args.add_chr_prefix,
         merge=args.merge, target_genes=args.target_genes,
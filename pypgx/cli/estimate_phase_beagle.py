@@ -1,18 +1,14 @@
-import sys
-
-from ..api import utils
-
-import fuc
-import pysam
+from ._common import add_parser, script_name
 
 description = f"""
 Estimate haplotype phase of observed variants with the Beagle program.
 """
 
 def create_parser(subparsers):
-    parser = fuc.api.common._add_parser(
+    parser = add_parser(
         subparsers,
-        fuc.api.common._script_name(),
+        script_name(),
+        output='phased_variants',
         description=description,
         help=
 """Estimate haplotype phase of observed variants with
@@ -51,6 +47,7 @@ the pypgx-bundle directory will be used."""
     )
 
 def main(args):
+    from ..api import utils
     result = utils.estimate_phase_beagle(
         args.imported_variants, args.panel, impute=args.impute
     )
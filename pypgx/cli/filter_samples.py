@@ -1,18 +1,14 @@
-import sys
-
-from ..api import utils
-
-import fuc
-import pysam
+from ._common import add_parser, script_name
 
 description = f"""
 Filter Archive file for specified samples.
 """
 
 def create_parser(subparsers):
-    parser = fuc.api.common._add_parser(
+    parser = add_parser(
         subparsers,
-        fuc.api.common._script_name(),
+        script_name(),
+        output='output',
         description=description,
         help=
 """Filter Archive file for specified samples."""
@@ -44,6 +40,7 @@ provide a list of samples."""
     )
 
 def main(args):
+    from ..api import utils
     archive = utils.filter_samples(
         args.input, args.samples, exclude=args.exclude
     )
@@ -1,18 +1,14 @@
-import sys
-
-from ..api import utils
-
-import fuc
-import pysam
+from ._common import add_parser, script_name
 
 description = f"""
 Import read depth data for target gene.
 """
 
 def create_parser(subparsers):
-    parser = fuc.api.common._add_parser(
+    parser = add_parser(
         subparsers,
-        fuc.api.common._script_name(),
+        script_name(),
+        output='read_depth',
         description=description,
         help=
 """Import read depth data for target gene."""
@@ -54,6 +50,7 @@ provide a list of samples."""
     )
 
 def main(args):
+    from ..api import utils
     archive = utils.import_read_depth(
         args.gene, args.depth_of_coverage, samples=args.samples,
         exclude=args.exclude
@@ -1,9 +1,4 @@
-import sys
-
-from ..api import utils
-
-import fuc
-import pysam
+from ._common import add_parser, script_name
 
 description = f"""
 Import SNV/indel data for target gene.
@@ -13,9 +8,10 @@ file with the semantic type VcfFrame[Imported] or VcfFrame[Consolidated].
 """
 
 def create_parser(subparsers):
-    parser = fuc.api.common._add_parser(
+    parser = add_parser(
         subparsers,
-        fuc.api.common._script_name(),
+        script_name(),
+        output='imported_variants',
         description=description,
         help=
 """Import SNV/indel data for target gene."""
@@ -83,6 +79,7 @@ can provide a list of samples."""
     )
 
 def main(args):
+    from ..api import utils
     archive = utils.import_variants(
         args.gene, args.vcf, assembly=args.assembly, platform=args.platform,
         samples=args.samples, exclude=args.exclude
@@ -1,18 +1,14 @@
-import sys
-
-from ..api import plot
-
-import fuc
-import pysam
+from ._common import add_parser, script_name
 
 description = f"""
 Plot copy number profile from CovFrame[CopyNumber].
 """
 
 def create_parser(subparsers):
-    parser = fuc.api.common._add_parser(
+    parser = add_parser(
         subparsers,
-        fuc.api.common._script_name(),
+        script_name(),
+        output='path',
         description=description,
         help=
 """Plot copy number profile from CovFrame[CopyNumber]."""
@@ -71,10 +67,20 @@ provide a list of samples."""
         help=
 """Text fontsize (default: 25)."""
     )
+    parser.add_argument(
+        '--n-jobs',
+        metavar='INT',
+        type=int,
+        default=1,
+        help=
+"""Number of processes used to write plots in parallel
+(default: 1)."""
+    )
 
 def main(args):
+    from ..api import plot
     plot.plot_bam_copy_number(
         args.copy_number, fitted=args.fitted, path=args.path,
         samples=args.samples, ymin=args.ymin, ymax=args.ymax,
-        fontsize=args.fontsize
+        fontsize=args.fontsize, n_jobs=args.n_jobs
     )
@@ -0,0 +1,135 @@
+from ._common import add_parser, script_name
+
+description = f"""
+Plot copy number profiles of many samples in one file from
+CovFrame[CopyNumber].
+
+The copy number of all samples is averaged into fixed-width bins across the
+gene region and drawn either as a single heatmap with one row per sample
+(--kind heatmap) or as a multi-page PDF file with a grid of profiles on each
+page (--kind panels). If CNV calls are provided, samples are grouped by call,
+with the most common call first.
+"""
+
+epilog = f"""
+[Example] Plot all samples as a heatmap:
+  $ pypgx {script_name()} \\
+  copy-number.zip \\
+  copy-number.png \\
+  --cnv-calls cnv-calls.zip
+
+[Example] Plot only flagged samples as pages of profiles:
+  $ pypgx {script_name()} \\
+  copy-number.zip \\
+  flagged.pdf \\
+  --cnv-calls results.zip \\
+  --kind panels \\
+  --flagged
+"""
+
+def create_parser(subparsers):
+    parser = add_parser(
+        subparsers,
+        script_name(),
+        output='output',
+        description=description,
+        epilog=epilog,
+        help=
+"""Plot copy number profiles of many samples in one file
+from CovFrame[CopyNumber]."""
+    )
+    parser.add_argument(
+        'copy_number',
+        metavar='copy-number',
+        help=
+"""Input archive file with the semantic type
+CovFrame[CopyNumber]."""
+    )
+    parser.add_argument(
+        'output',
+        help=
+"""Output image file. Must be a PDF file when --kind is
+'panels'."""
+    )
+    parser.add_argument(
+        '--cnv-calls',
+        metavar='PATH',
+        help=
+"""Archive file with the semantic type SampleTable[CNVCalls]
+or SampleTable[Results]."""
+    )
+    parser.add_argument(
+        '--kind',
+        metavar='TEXT',
+        choices=['heatmap', 'panels'],
+        default='heatmap',
+        help=
+"""Type of plot to create ('heatmap' or 'panels')
+(default: 'heatmap')."""
+    )
+    parser.add_argument(
+        '--flagged',
+        action='store_true',
+        help=
+"""Only plot samples with a CNV call other than 'Normal'
+or, when SampleTable[Results] is provided, samples
+flagged for review (e.g. indeterminate genotypes and
+unexpected allele fractions). Requires --cnv-calls."""
+    )
+    parser.add_argument(
+        '--bins',
+        metavar='INT',
+        type=int,
+        default=1000,
+        help=
+"""Number of bins across the gene region (default: 1000)."""
+    )
+    parser.add_argument(
+        '--nrows',
+        metavar='INT',
+        type=int,
+        default=6,
+        help=
+"""Number of profiles per column on each page (default: 6)."""
+    )
+    parser.add_argument(
+        '--ncols',
+        metavar='INT',
+        type=int,
+        default=4,
+        help=
+"""Number of profiles per row on each page (default: 4)."""
+    )
+    parser.add_argument(
+        '--ymin',
+        metavar='FLOAT',
+        type=float,
+        default=-0.3,
+        help=
+"""Y-axis bottom (default: -0.3)."""
+    )
+    parser.add_argument(
+        '--ymax',
+        metavar='FLOAT',
+        type=float,
+        default=6.3,
+        help=
+"""Y-axis top (default: 6.3)."""
+    )
+    parser.add_argument(
+        '--fontsize',
+        metavar='FLOAT',
+        type=float,
+        default=25,
+        help=
+"""Text fontsize (default: 25)."""
+    )
+
+def main(args):
+    from ..api import plot
+    plot.plot_cohort_copy_number(
+        args.copy_number, args.output, cnv_calls=args.cnv_calls,
+        kind=args.kind, flagged=args.flagged, bins=args.bins,
+        nrows=args.nrows, ncols=args.ncols, ymin=args.ymin, ymax=args.ymax,
+        fontsize=args.fontsize
+    )
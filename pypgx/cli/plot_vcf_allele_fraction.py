@@ -1,18 +1,14 @@
-import sys
-
-from ..api import plot
-
-import fuc
-import pysam
+from ._common import add_parser, script_name
 
 description = f"""
 Plot allele fraction profile from VcfFrame[Imported].
 """
 
 def create_parser(subparsers):
-    parser = fuc.api.common._add_parser(
+    parser = add_parser(
         subparsers,
-        fuc.api.common._script_name(),
+        script_name(),
+        output='path',
         description=description,
         help=
 """Plot allele fraction profile with VCF data."""
@@ -49,9 +45,19 @@ provide a list of samples."""
         help=
 """Text fontsize (default: 25)."""
     )
+    parser.add_argument(
+        '--n-jobs',
+        metavar='INT',
+        type=int,
+        default=1,
+        help=
+"""Number of processes used to write plots in parallel
+(default: 1)."""
+    )
 
 def main(args):
+    from ..api import plot
     plot.plot_vcf_allele_fraction(
         args.imported_variants, path=args.path, samples=args.samples,
-        fontsize=args.fontsize
+        fontsize=args.fontsize, n_jobs=args.n_jobs
     )
@@ -1,18 +1,14 @@
-import sys
-
-from ..api import plot
-
-import fuc
-import pysam
+from ._common import add_parser, script_name
 
 description = f"""
 Plot read depth profile with VCF data.
 """
 
 def create_parser(subparsers):
-    parser = fuc.api.common._add_parser(
+    parser = add_parser(
         subparsers,
-        fuc.api.common._script_name(),
+        script_name(),
+        output='path',
         description=description,
         help=
 """Plot read depth profile with VCF data."""
@@ -66,9 +62,20 @@ provide a list of samples."""
         help=
 """Y-axis top."""
     )
+    parser.add_argument(
+        '--n-jobs',
+        metavar='INT',
+        type=int,
+        default=1,
+        help=
+"""Number of processes used to write plots in parallel
+(default: 1)."""
+    )
 
 def main(args):
+    from ..api import plot
     plot.plot_vcf_read_depth(
         args.gene, args.vcf, assembly=args.assembly, path=args.path,
-        samples=args.samples, ymin=args.ymin, ymax=args.ymax
+        samples=args.samples, ymin=args.ymin, ymax=args.ymax,
+        n_jobs=args.n_jobs
     )
@@ -1,18 +1,14 @@
-import sys
-
-from ..api import utils
-
-import fuc
-import pysam
+from ._common import add_parser, script_name
 
 description = f"""
 Predict candidate star alleles based on observed variants.
 """
 
 def create_parser(subparsers):
-    parser = fuc.api.common._add_parser(
+    parser = add_parser(
         subparsers,
-        fuc.api.common._script_name(),
+        script_name(),
+        output='alleles',
         description=description,
         help=
 """Predict candidate star alleles based on observed
@@ -33,5 +29,6 @@ SampleTable[Alleles]."""
     )
 
 def main(args):
+    from ..api import utils
     alleles = utils.predict_alleles(args.consolidated_variants)
     alleles.to_file(args.alleles)
@@ -1,9 +1,4 @@
-import sys
-
-from ..api import utils
-
-import fuc
-import pysam
+from ._common import add_parser, script_name
 
 description = f"""
 Predict CNV from copy number data for target gene.
@@ -13,9 +8,10 @@ input data is targeted sequencing will be imputed with forward filling.
 """
 
 def create_parser(subparsers):
-    parser = fuc.api.common._add_parser(
+    parser = add_parser(
         subparsers,
-        fuc.api.common._script_name(),
+        script_name(),
+        output='cnv_calls',
         description=description,
         help=
 """Predict CNV from copy number data for target gene."""
@@ -44,5 +40,6 @@ directory will be used."""
     )
 
 def main(args):
+    from ..api import utils
     archive = utils.predict_cnv(args.copy_number, cnv_caller=args.cnv_caller)
     archive.to_file(args.cnv_calls)
@@ -0,0 +1,108 @@
+import os
+
+from ._common import add_parser, script_name
+
+description = """
+Predict CNV for multiple target genes from depth of coverage data.
+
+For each target gene with SV, the command will import read depth, compute copy
+number, and predict CNV in one run. Pre-trained CNV callers are loaded once and
+cached, which avoids repeated model loading when many genes are analyzed. Read
+depth of all genes is held in one float32 matrix that is normalized in place,
+and with --n-jobs it is shared with worker processes instead of copied.
+
+The output directory will contain one archive file per gene with the semantic
+type SampleTable[CNVCalls] (e.g. CYP2D6-cnv-calls.zip).
+"""
+
+epilog = f"""
+[Example] For all target genes with SV:
+  $ pypgx {script_name()} \\
+  depth-of-coverage.zip \\
+  control-statistics.zip \\
+  cnv-calls
+
+[Example] For selected genes:
+  $ pypgx {script_name()} \\
+  depth-of-coverage.zip \\
+  control-statistics.zip \\
+  cnv-calls \\
+  --genes CYP2D6 GSTM1
+"""
+
+def create_parser(subparsers):
+    parser = add_parser(
+        subparsers,
+        script_name(),
+        output='output',
+        description=description,
+        epilog=epilog,
+        help=
+"""Predict CNV for multiple target genes from depth of
+coverage data."""
+    )
+    parser.add_argument(
+        'depth_of_coverage',
+        metavar='depth-of-coverage',
+        help=
+"""Input archive file with the semantic type
+CovFrame[DepthOfCoverage]."""
+    )
+    parser.add_argument(
+        'control_statistics',
+        metavar='control-statistics',
+        help=
+"""Input archive file with the semantic type
+SampleTable[Statistics]."""
+    )
+    parser.add_argument(
+        'output',
+        help=
+"""Output directory."""
+    )
+    parser.add_argument(
+        '--genes',
+        metavar='TEXT',
+        nargs='+',
+        help=
+"""List of genes to include. By default, all target
+genes with SV that are present in the input data will
+be used."""
+    )
+    parser.add_argument(
+        '--samples-without-sv',
+        metavar='TEXT',
+        nargs='+',
+        help=
+"""List of known samples with no SV."""
+    )
+    parser.add_argument(
+        '--chunk-size',
+        metavar='INT',
+        type=int,
+        default=100000,
+        help=
+"""Number of positions to normalize at a time (default:
+100000)."""
+    )
+    parser.add_argument(
+        '--n-jobs',
+        metavar='INT',
+        type=int,
+        default=1,
+        help=
+"""Number of worker processes used to predict CNV for genes
+in parallel. Read depth is shared between processes
+without copying (default: 1)."""
+    )
+
+def main(args):
+    from ..api import utils
+    results = utils.predict_cnv_batch(
+        args.depth_of_coverage, args.control_statistics, genes=args.genes,
+        samples_without_sv=args.samples_without_sv,
+        chunk_size=args.chunk_size, n_jobs=args.n_jobs
+    )
+    os.makedirs(args.output, exist_ok=True)
+    for gene, archive in results.items():
+        archive.to_file(f'{args.output}/{gene}-cnv-calls.zip')
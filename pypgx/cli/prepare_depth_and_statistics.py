@@ -0,0 +1,123 @@
+from ._common import add_parser, script_name
+
+description = """
+Prepare a depth of coverage file and control statistics together.
+
+This command combines prepare-depth-of-coverage and compute-control-statistics
+so that each region of the input BAM files is read only once. Read depth for
+the control gene is counted in one run, streamed in windows, and accumulated
+into per-sample histograms instead of being stored per position, which keeps
+memory usage low while producing identical summary statistics.
+
+Note that for the arguments control and --bed, the 'chr' prefix in contig
+names (e.g. 'chr1' vs. '1') will be automatically added or removed as
+necessary to match the input BAM's contig names.
+"""
+
+epilog = f"""
+[Example] For the VDR gene from WGS data:
+  $ pypgx {script_name()} \\
+  VDR \\
+  depth-of-coverage.zip \\
+  control-statistics.zip \\
+  1.bam 2.bam
+
+[Example] For a custom region from targeted sequencing data:
+  $ pypgx {script_name()} \\
+  chr1:100-200 \\
+  depth-of-coverage.zip \\
+  control-statistics.zip \\
+  bam.list \\
+  --bed probes.bed
+"""
+
+def create_parser(subparsers):
+    parser = add_parser(
+        subparsers,
+        script_name(),
+        output='depth_of_coverage',
+        description=description,
+        epilog=epilog,
+        help=
+"""Prepare a depth of coverage file and control
+statistics together."""
+    )
+    parser.add_argument(
+        'control',
+        help=
+"""Control gene (recommended choices: 'EGFR', 'RYR1',
+'VDR'). Alternatively, you can provide a custom region
+(format: chrom:start-end)."""
+    )
+    parser.add_argument(
+        'depth_of_coverage',
+        metavar='depth-of-coverage',
+        help=
+"""Output archive file with the semantic type
+CovFrame[DepthOfCoverage]."""
+    )
+    parser.add_argument(
+        'control_statistics',
+        metavar='control-statistics',
+        help=
+"""Output archive file with the semantic type
+SampleTable[Statistics]."""
+    )
+    parser.add_argument(
+        'bams',
+        nargs='+',
+        help=
+"""One or more input BAM or CRAM files. Alternatively,
+you can provide a text file (.txt, .tsv, .csv, or .list)
+containing one file per line."""
+    )
+    parser.add_argument(
+        '--assembly',
+        metavar='TEXT',
+        default='GRCh37',
+        help=
+"""Reference genome assembly (default: 'GRCh37')
+(choices: 'GRCh37', 'GRCh38')."""
+    )
+    parser.add_argument(
+        '--bed',
+        metavar='PATH',
+        help=
+"""By default, the input data is assumed to be WGS. If
+it's targeted sequencing, you must provide a BED file
+to indicate probed regions."""
+    )
+    parser.add_argument(
+        '--genes',
+        metavar='TEXT',
+        nargs='+',
+        help=
+"""List of genes to include."""
+    )
+    parser.add_argument(
+        '--exclude',
+        action='store_true',
+        help=
+"""Exclude specified genes. Ignored when --genes is not
+used."""
+    )
+    parser.add_argument(
+        '--window-size',
+        metavar='INT',
+        type=int,
+        default=100000,
+        help=
+"""Number of control positions to count at a time
+(default: 100000)."""
+    )
+
+def main(args):
+    from ..api import utils
+    depth_of_coverage, control_statistics = \
+        utils.prepare_depth_and_statistics(
+            args.bams, args.control, assembly=args.assembly, bed=args.bed,
+            genes=args.genes, exclude=args.exclude,
+            window_size=args.window_size
+        )
+    depth_of_coverage.to_file(args.depth_of_coverage)
+    control_statistics.to_file(args.control_statistics)
@@ -1,9 +1,4 @@
-import tempfile
-
-from ..api import utils
-
-import fuc
-import pysam
+from ._common import add_parser, script_name
 
 description = """
 Prepare a depth of coverage file for all target genes with SV from BAM files.
@@ -16,21 +11,22 @@ have star alleles defined only by SNVs/indels (e.g. CYP3A5).
 
 epilog = f"""
 [Example] From WGS data:
-  $ pypgx {fuc.api.common._script_name()} \\
+  $ pypgx {script_name()} \\
   depth-of-coverage.zip \\
   1.bam 2.bam
 
 [Example] From targeted sequencing data:
-  $ pypgx {fuc.api.common._script_name()} \\
+  $ pypgx {script_name()} \\
   depth-of-coverage.zip \\
   bam.list \\
   --bed probes.bed
 """
 
 def create_parser(subparsers):
-    parser = fuc.api.common._add_parser(
+    parser = add_parser(
         subparsers,
-        fuc.api.common._script_name(),
+        script_name(),
+        output='depth_of_coverage',
         description=description,
         epilog=epilog,
         help=
@@ -48,9 +44,9 @@ CovFrame[DepthOfCoverage]."""
         'bams',
         nargs='+',
         help=
-"""One or more input BAM files. Alternatively, you can
-provide a text file (.txt, .tsv, .csv, or .list)
-containing one BAM file per line."""
+"""One or more input BAM or CRAM files. Alternatively,
+you can provide a text file (.txt, .tsv, .csv, or .list)
+containing one file per line."""
     )
     parser.add_argument(
         '--assembly',
@@ -87,6 +83,7 @@ used."""
     )
 
 def main(args):
+    from ..api import utils
     archive = utils.prepare_depth_of_coverage(
         args.bams, assembly=args.assembly, bed=args.bed, genes=args.genes,
         exclude=args.exclude
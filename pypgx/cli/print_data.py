@@ -1,18 +1,13 @@
-import sys
-
-from ..api import utils
-
-import fuc
-import pysam
+from ._common import add_parser, script_name
 
 description = f"""
 Print the main data of specified archive.
 """
 
 def create_parser(subparsers):
-    parser = fuc.api.common._add_parser(
+    parser = add_parser(
         subparsers,
-        fuc.api.common._script_name(),
+        script_name(),
         description=description,
         help=
 """Print the main data of specified archive."""
@@ -24,4 +19,5 @@ def create_parser(subparsers):
     )
 
 def main(args):
+    from ..api import utils
     utils.print_data(args.input)
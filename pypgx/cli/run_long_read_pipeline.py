@@ -1,8 +1,4 @@
-import sys
-
-from ..api import pipeline
-
-import fuc
+from ._common import add_parser, script_name
 
 description = f"""
 Run genotyping pipeline for long-read sequencing data.
@@ -10,16 +6,17 @@ Run genotyping pipeline for long-read sequencing data.
 
 epilog = f"""
 [Example] To genotype the CYP3A5 gene from long-read sequencing data:
-  $ pypgx {fuc.api.common._script_name()} \\
+  $ pypgx {script_name()} \\
   CYP3A5 \\
   CYP3A5-pipeline \\
   variants.vcf.gz
 """
 
 def create_parser(subparsers):
-    parser = fuc.api.common._add_parser(
+    parser = add_parser(
         subparsers,
-        fuc.api.common._script_name(),
+        script_name(),
+        output='output',
         description=description,
         epilog=epilog,
         help=
@@ -71,9 +68,20 @@ can provide a list of samples."""
         help=
 """Exclude specified samples."""
     )
+    parser.add_argument(
+        '--openmetrics',
+        metavar='PATH',
+        help=
+"""Also write run metrics to this file in the OpenMetrics
+text format (e.g. for the textfile collector of the
+Prometheus node exporter). Metrics are always written
+to run-metrics.json in the output directory."""
+    )
 
 def main(args):
+    from ..api import pipeline
     pipeline.run_long_read_pipeline(
         args.gene, args.output, args.variants, assembly=args.assembly,
-        force=args.force, samples=args.samples, exclude=args.exclude
+        force=args.force, samples=args.samples, exclude=args.exclude,
+        openmetrics=args.openmetrics
     )
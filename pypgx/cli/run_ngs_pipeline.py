@@ -1,8 +1,4 @@
-import sys
-
-from ..api import pipeline
-
-import fuc
+from ._common import add_parser, script_name
 
 description = """
 Run genotyping pipeline for NGS data.
@@ -15,13 +11,13 @@ without SV using --samples-without-sv.
 
 epilog = f"""
 [Example] To genotype the CYP3A5 gene, which does not have SV, from WGS data:
-  $ pypgx {fuc.api.common._script_name()} \\
+  $ pypgx {script_name()} \\
   CYP3A5 \\
   CYP3A5-pipeline \\
   --variants variants.vcf.gz
 
 [Example] To genotype the CYP2D6 gene, which does have SV, from WGS data:
-  $ pypgx {fuc.api.common._script_name()} \\
+  $ pypgx {script_name()} \\
   CYP2D6 \\
   CYP2D6-pipeline \\
   --variants variants.vcf.gz \\
@@ -29,7 +25,7 @@ epilog = f"""
   --control-statistics control-statistics-VDR.zip
 
 [Example] To genotype the CYP2D6 gene from targeted sequencing data:
-  $ pypgx {fuc.api.common._script_name()} \\
+  $ pypgx {script_name()} \\
   CYP2D6 \\
   CYP2D6-pipeline \\
   --variants variants.vcf.gz \\
@@ -39,9 +35,10 @@ epilog = f"""
 """
 
 def create_parser(subparsers):
-    parser = fuc.api.common._add_parser(
+    parser = add_parser(
         subparsers,
-        fuc.api.common._script_name(),
+        script_name(),
+        output='output',
         description=description,
         epilog=epilog,
         help=
@@ -154,8 +151,27 @@ can provide a list of samples."""
 default, a pre-trained CNV caller in the pypgx-bundle
 directory will be used."""
     )
+    parser.add_argument(
+        '--plot-flagged-only',
+        action='store_true',
+        help=
+"""Only plot copy number and allele fraction profiles for
+samples flagged for review (e.g. non-normal CNV calls,
+indeterminate genotypes, and unexpected allele
+fractions)."""
+    )
+    parser.add_argument(
+        '--openmetrics',
+        metavar='PATH',
+        help=
+"""Also write run metrics to this file in the OpenMetrics
+text format (e.g. for the textfile collector of the
+Prometheus node exporter). Metrics are always written
+to run-metrics.json in the output directory."""
+    )
 
 def main(args):
+    from ..api import pipeline
     pipeline.run_ngs_pipeline(
         args.gene, args.output, variants=args.variants,
         depth_of_coverage=args.depth_of_coverage,
@@ -164,5 +180,7 @@ def main(args):
         exclude=args.exclude, samples_without_sv=args.samples_without_sv,
         do_not_plot_copy_number=args.do_not_plot_copy_number,
         do_not_plot_allele_fraction=args.do_not_plot_allele_fraction,
-        platform=args.platform, cnv_caller=args.cnv_caller
+        platform=args.platform, cnv_caller=args.cnv_caller,
+        plot_flagged_only=args.plot_flagged_only,
+        openmetrics=args.openmetrics
     )
@@ -0,0 +1,240 @@
+import os
+import sys
+import signal
+import codecs
+import secrets
+import threading
+import traceback
+from contextlib import redirect_stdout, redirect_stderr
+from multiprocessing.connection import Listener, Client
+
+from ._common import add_parser, script_name
+
+description = """
+Run a long-lived PyPGx server for batch jobs.
+
+The server imports PyPGx, loads all data tables, and loads pre-trained CNV
+callers once, then listens for jobs on a local Unix socket. Any other command
+can be submitted to the server by adding --server with the same socket path.
+Each job runs in a process forked from the warm server, in the working
+directory of the client, and its console output is streamed back to the
+client. Output archives are written directly by the job.
+
+Access is restricted to clients that can read the key file, which is created
+next to the socket (e.g. pypgx.sock.key) with owner-only permissions.
+"""
+
+epilog = f"""
+[Example] Start a server:
+  $ pypgx {script_name()} pypgx.sock
+
+[Example] Submit a job to the server:
+  $ pypgx call-phenotypes \\
+  genotypes.zip \\
+  phenotypes.zip \\
+  --server pypgx.sock
+"""
+
+def create_parser(subparsers):
+    parser = add_parser(
+        subparsers,
+        script_name(),
+        description=description,
+        epilog=epilog,
+        help=
+"""Run a long-lived PyPGx server for batch jobs."""
+    )
+    parser.add_argument(
+        'socket',
+        help=
+"""Path to the Unix socket to listen on."""
+    )
+    parser.add_argument(
+        '--jobs',
+        metavar='INT',
+        type=int,
+        default=os.cpu_count(),
+        help=
+"""Maximum number of jobs to run at the same time
+(default: number of CPUs)."""
+    )
+
+class _Stream:
+    """File-like object that sends written text to the client."""
+
+    def __init__(self, conn, name, lock):
+        self.conn = conn
+        self.name = name
+        self.lock = lock
+        self._fd = None
+        self._thread = None
+
+    def write(self, s):
+        if s:
+            with self.lock:
+                self.conn.send((self.name, s))
+        return len(s)
+
+    def flush(self):
+        pass
+
+    def isatty(self):
+        return False
+
+    def fileno(self):
+        """
+        Return a pipe whose output is also sent to the client, so that the
+        stream can be passed to subprocesses or redirected with os.dup2.
+        """
+        if self._fd is None:
+            r, self._fd = os.pipe()
+            self._thread = threading.Thread(
+                target=self._forward, args=(r,), daemon=True)
+            self._thread.start()
+        return self._fd
+
+    def _forward(self, fd):
+        decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+        while True:
+            b = os.read(fd, 65536)
+            try:
+                self.write(decoder.decode(b, final=not b))
+            except OSError:
+                pass
+            if not b:
+                break
+        os.close(fd)
+
+    def close(self):
+        """Close the pipe, if any, and wait for its output to be sent."""
+        if self._fd is not None:
+            os.close(self._fd)
+            self._thread.join()
+            self._fd = None
+
+def _warm_up():
+    """Import PyPGx and load tables and CNV callers into memory."""
+    from ..api import core, utils, genotype, plot, pipeline
+    from .. import sdk
+
+    for name in dir(core):
+        if name.startswith('load_') and name.endswith('_table'):
+            getattr(core, name)()
+
+    try:
+        bundle = sdk.get_bundle_path()
+    except sdk.utils.BundleNotFoundError:
+        return
+
+    for assembly in ['GRCh37', 'GRCh38']:
+        path = f'{bundle}/cnv/{assembly}'
+        if not os.path.isdir(path):
+            continue
+        for f in sorted(os.listdir(path)):
+            if f.endswith('.zip'):
+                utils._load_cnv_caller(f'{path}/{f}')
+
+def _run_job(conn, parser):
+    """Run one job in the current (forked) process and report the result."""
+    from ..__main__ import run
+
+    request = conn.recv()
+    lock = threading.Lock()
+    stdout = _Stream(conn, 'stdout', lock)
+    stderr = _Stream(conn, 'stderr', lock)
+    status = 0
+    with redirect_stdout(stdout), redirect_stderr(stderr):
+        try:
+            os.chdir(request['cwd'])
+            args = parser.parse_args(request['argv'])
+            run(args)
+        except SystemExit as e:
+            if isinstance(e.code, int):
+                status = e.code
+            elif e.code is not None:
+                print(e.code, file=sys.stderr)
+                status = 1
+        except BaseException:
+            traceback.print_exc()
+            status = 1
+    stdout.close()
+    stderr.close()
+    conn.send(('exit', status))
+
+def submit(socket, argv):
+    """
+    Submit a command to a running server and stream back its output.
+
+    Parameters
+    ----------
+    socket : str
+        Path to the server's Unix socket.
+    argv : list
+        Command line arguments. The --server option is ignored by the
+        server.
+
+    Returns
+    -------
+    int
+        Exit status of the command.
+    """
+    with open(f'{socket}.key', 'rb') as f:
+        authkey = f.read()
+    with Client(socket, family='AF_UNIX', authkey=authkey) as conn:
+        conn.send({'argv': argv, 'cwd': os.getcwd()})
+        while True:
+            name, value = conn.recv()
+            if name == 'exit':
+                return value
+            stream = sys.stdout if name == 'stdout' else sys.stderr
+            stream.write(value)
+            stream.flush()
+
+def main(args):
+    from ..__main__ import create_parser
+
+    parser = create_parser()
+    _warm_up()
+
+    authkey = secrets.token_bytes(32)
+    key_file = f'{args.socket}.key'
+    fd = os.open(key_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, 'wb') as f:
+        f.write(authkey)
+
+    listener = Listener(args.socket, family='AF_UNIX', authkey=authkey)
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+    print(f'Listening on: {args.socket}', flush=True)
+
+    children = set()
+
+    try:
+        while True:
+            try:
+                conn = listener.accept()
+            except Exception as e:
+                print(f'Rejected connection: {e}', file=sys.stderr)
+                continue
+            while len(children) >= args.jobs:
+                children.discard(os.waitpid(-1, 0)[0])
+            pid = os.fork()
+            if pid == 0:
+                listener.close()
+                try:
+                    _run_job(conn, parser)
+                finally:
+                    conn.close()
+                    os._exit(0)
+            conn.close()
+            children.add(pid)
+            while children:
+                pid, _ = os.waitpid(-1, os.WNOHANG)
+                if pid == 0:
+                    break
+                children.discard(pid)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        listener.close()
+        if os.path.exists(key_file):
+            os.remove(key_file)
@@ -1,18 +1,14 @@
-import sys
-
-from ..api import utils
-
-import fuc
-import pysam
+from ._common import add_parser, script_name
 
 description = f"""
 Slice BAM file for all genes used by PyPGx.
 """
 
 def create_parser(subparsers):
-    parser = fuc.api.common._add_parser(
+    parser = add_parser(
         subparsers,
-        fuc.api.common._script_name(),
+        script_name(),
+        output='output',
         description=description,
         help=
 """Slice BAM file for all genes used by PyPGx."""
@@ -20,8 +16,8 @@ def create_parser(subparsers):
     parser.add_argument(
         'input',
         help=
-"""Input BAM file. It must be already indexed to allow
-random access."""
+"""Input BAM or CRAM file. It must be already indexed to
+allow random access."""
     )
     parser.add_argument(
         'output',
@@ -50,9 +46,19 @@ random access."""
 """Exclude specified genes. Ignored when --genes is not
 used."""
     )
+    parser.add_argument(
+        '--fasta',
+        metavar='PATH',
+        help=
+"""Reference FASTA file used to decode CRAM input. If the
+REF_CACHE environment variable is set, reference
+sequences are read from this htslib cache, which is
+filled from the FASTA file as needed."""
+    )
 
 def main(args):
+    from ..api import utils
     utils.slice_bam(
         args.input, args.output, assembly=args.assembly, genes=args.genes,
-        exclude=args.exclude
+        exclude=args.exclude, fasta=args.fasta
     )
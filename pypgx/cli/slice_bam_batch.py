@@ -0,0 +1,130 @@
+from ._common import add_parser, script_name
+
+description = """
+Slice many BAM or CRAM files for all genes used by PyPGx.
+
+Each input file is sliced to an indexed BAM file in the output directory with
+the same name as the input (e.g. 1.cram becomes 1.bam). Files are sliced in
+parallel with --n-jobs worker processes, each of which uses --threads threads
+for BGZF compression and indexing.
+
+The output directory will also contain a manifest (manifest.tsv) with
+checksums of the input files, sliced regions, and output files. Files that
+match the manifest are skipped, so an interrupted run can be resumed by
+running the same command again.
+"""
+
+epilog = f"""
+[Example] Slice a list of BAM files with four workers:
+  $ pypgx {script_name()} \\
+  sliced \\
+  bam.list \\
+  --n-jobs 4
+
+[Example] Slice CRAM files with a shared reference cache:
+  $ export REF_CACHE=/path/to/ref_cache/%2s/%2s/%s
+  $ pypgx {script_name()} \\
+  sliced \\
+  cram.list \\
+  --fasta ref.fa \\
+  --n-jobs 4
+
+[Example] Slice selected genes with padding:
+  $ pypgx {script_name()} \\
+  sliced \\
+  1.bam 2.bam \\
+  --genes CYP2D6 CYP2C19 \\
+  --padding 1000
+"""
+
+def create_parser(subparsers):
+    parser = add_parser(
+        subparsers,
+        script_name(),
+        output='output',
+        description=description,
+        epilog=epilog,
+        help=
+"""Slice many BAM or CRAM files for all genes used by
+PyPGx."""
+    )
+    parser.add_argument(
+        'output',
+        help=
+"""Output directory."""
+    )
+    parser.add_argument(
+        'bams',
+        nargs='+',
+        help=
+"""One or more input BAM or CRAM files. They must be
+already indexed to allow random access. Alternatively,
+you can provide a text file (.txt, .tsv, .csv, or .list)
+containing one file per line."""
+    )
+    parser.add_argument(
+        '--assembly',
+        metavar='TEXT',
+        default='GRCh37',
+        help=
+"""Reference genome assembly (default: 'GRCh37')
+(choices: 'GRCh37', 'GRCh38')."""
+    )
+    parser.add_argument(
+        '--genes',
+        metavar='TEXT',
+        nargs='+',
+        help=
+"""List of genes to include."""
+    )
+    parser.add_argument(
+        '--exclude',
+        action='store_true',
+        help=
+"""Exclude specified genes. Ignored when --genes is not
+used."""
+    )
+    parser.add_argument(
+        '--padding',
+        metavar='INT',
+        type=int,
+        default=0,
+        help=
+"""Number of base pairs to add on both sides of each gene
+(default: 0)."""
+    )
+    parser.add_argument(
+        '--n-jobs',
+        metavar='INT',
+        type=int,
+        default=1,
+        help=
+"""Number of files to slice in parallel (default: 1)."""
+    )
+    parser.add_argument(
+        '--threads',
+        metavar='INT',
+        type=int,
+        default=1,
+        help=
+"""Number of additional threads used by each worker for
+compression and indexing (default: 1)."""
+    )
+    parser.add_argument(
+        '--fasta',
+        metavar='PATH',
+        help=
+"""Reference FASTA file used to decode CRAM input. If the
+REF_CACHE environment variable is set, reference
+sequences are read from this htslib cache, which is
+filled from the FASTA file as needed and shared by all
+workers."""
+    )
+
+def main(args):
+    from ..api import utils
+    utils.slice_bam_batch(
+        args.bams, args.output, assembly=args.assembly, genes=args.genes,
+        exclude=args.exclude, padding=args.padding, n_jobs=args.n_jobs,
+        threads=args.threads, fasta=args.fasta
+    )
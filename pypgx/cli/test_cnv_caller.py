@@ -1,18 +1,14 @@
-import sys
-
-from ..api import utils
-
-import fuc
-import pysam
+from ._common import add_parser, script_name
 
 description = f"""
 Test CNV caller for target gene.
 """
 
 def create_parser(subparsers):
-    parser = fuc.api.common._add_parser(
+    parser = add_parser(
         subparsers,
-        fuc.api.common._script_name(),
+        script_name(),
+        output='confusion_matrix',
         description=description,
         help=
 """Test CNV caller for target gene."""
@@ -54,6 +50,7 @@ calls for each sample."""
     )
 
 def main(args):
+    from ..api import utils
     utils.test_cnv_caller(
         args.cnv_caller, args.copy_number, args.cnv_calls,
         confusion_matrix=args.confusion_matrix,
@@ -1,21 +1,20 @@
-import sys
-
-from ..api import utils
-
-import fuc
-import pysam
+from ._common import add_parser, script_name
 
 description = f"""
 Train CNV caller for target gene.
 
 This command will return a SVM-based multiclass classifier that makes CNV
 calls using the one-vs-rest strategy.
+
+If any of --C, --gamma, or --kernel is provided, SVM hyperparameters will be
+selected by cross-validated grid search before fitting the final model.
 """
 
 def create_parser(subparsers):
-    parser = fuc.api.common._add_parser(
+    parser = add_parser(
         subparsers,
-        fuc.api.common._script_name(),
+        script_name(),
+        output='cnv_caller',
         description=description,
         help=
 """Train CNV caller for target gene."""
@@ -55,11 +54,79 @@ class."""
 """Write a CSV file comparing actual vs. predicted CNV
 calls for each sample."""
     )
+    parser.add_argument(
+        '--bin-size',
+        metavar='INT',
+        type=int,
+        help=
+"""Summarize copy number as mean values in bins of this
+many positions instead of using every position as a
+feature. The bin size is stored in the output model."""
+    )
+    parser.add_argument(
+        '--C',
+        metavar='FLOAT',
+        type=float,
+        nargs='+',
+        help=
+"""Candidate values of the SVM regularization parameter
+for cross-validated grid search."""
+    )
+    parser.add_argument(
+        '--gamma',
+        metavar='TEXT',
+        nargs='+',
+        help=
+"""Candidate values of the SVM kernel coefficient for
+cross-validated grid search ('scale', 'auto', or a
+number)."""
+    )
+    parser.add_argument(
+        '--kernel',
+        metavar='TEXT',
+        nargs='+',
+        help=
+"""Candidate SVM kernels for cross-validated grid search
+(choices: 'linear', 'poly', 'rbf', 'sigmoid')."""
+    )
+    parser.add_argument(
+        '--cv',
+        metavar='INT',
+        type=int,
+        default=5,
+        help=
+"""Number of cross-validation folds for grid search
+(default: 5)."""
+    )
+    parser.add_argument(
+        '--n-jobs',
+        metavar='INT',
+        type=int,
+        default=1,
+        help=
+"""Number of CPU cores to use (default: 1)."""
+    )
+
+def parse_gamma(value):
+    try:
+        return float(value)
+    except ValueError:
+        return value
 
 def main(args):
+    from ..api import utils
+    param_grid = {}
+    if args.C:
+        param_grid['C'] = args.C
+    if args.gamma:
+        param_grid['gamma'] = [parse_gamma(x) for x in args.gamma]
+    if args.kernel:
+        param_grid['kernel'] = args.kernel
     result = utils.train_cnv_caller(
         args.copy_number, args.cnv_calls,
         confusion_matrix=args.confusion_matrix,
-        comparison_table=args.comparison_table
+        comparison_table=args.comparison_table,
+        bin_size=args.bin_size, param_grid=param_grid or None, cv=args.cv,
+        n_jobs=args.n_jobs
     )
     result.to_file(args.cnv_caller)
@@ -1,3 +1,3 @@
-from .utils import (Archive, add_cn_samples, compare_metadata, get_bundle_path, simulate_copy_number)
+from .utils import (Archive, Metrics, Profiler, add_cn_samples, compare_metadata, get_bundle_path, profile, simulate_copy_number)
 
-__all__ = ['Archive', 'add_cn_samples', 'compare_metadata', 'get_bundle_path', 'simulate_copy_number']
+__all__ = ['Archive', 'Metrics', 'Profiler', 'add_cn_samples', 'compare_metadata', 'get_bundle_path', 'profile', 'simulate_copy_number']
@@ -4,10 +4,19 @@ import zipfile
 import tempfile
 import copy
 import pickle
+import json
+import sys
+import time
+import threading
+import contextlib
+import collections
+from datetime import datetime, timezone
 
 import pandas as pd
 import numpy as np
-from fuc import pyvcf, pycov, common, pybam
+
+# Semantic types whose data are stored column by column as NumPy arrays.
+COLUMNAR_TYPES = ['SampleTable[CohortResults]']
 
 class AlleleNotFoundError(Exception):
     """Raise if specified allele is not present in the allele table."""
@@ -36,6 +45,240 @@ class VariantNotFoundError(Exception):
 class BundleNotFoundError(Exception):
     """Raise if the given path to the pypgx-bundle directory does not exist."""
 
+class OneVsRestSVC:
+    """
+    Class for predicting with a one-vs-rest SVM classifier in pure NumPy.
+
+    This is a lightweight, portable representation of a fitted
+    :class:`sklearn.multiclass.OneVsRestClassifier` of
+    :class:`sklearn.svm.SVC` estimators, which is how CNV callers are
+    trained. Support vectors shared by the binary estimators are stored only
+    once. The :meth:`predict` method reproduces the results of the original
+    classifier without importing scikit-learn.
+
+    Parameters
+    ----------
+    header : dict
+        Model parameters (classes, kernel, gamma, coef0, and degree).
+    arrays : dict
+        NumPy arrays with the support vectors ('vectors'), intercepts
+        ('intercepts'), and per-estimator support indices ('support_i') and
+        dual coefficients ('dual_coef_i').
+    """
+
+    def __init__(self, header, arrays):
+        self.header = header
+        self.classes_ = np.array(header['classes'])
+        self.vectors = np.asarray(arrays['vectors'], dtype=np.float64)
+        self.intercepts = np.asarray(arrays['intercepts'], dtype=np.float64)
+        self.supports = []
+        self.dual_coefs = []
+        for i in range(len(self.intercepts)):
+            self.supports.append(arrays[f'support_{i}'])
+            self.dual_coefs.append(arrays[f'dual_coef_{i}'])
+
+    @classmethod
+    def from_sklearn(cls, model):
+        """
+        Construct OneVsRestSVC from a fitted scikit-learn classifier.
+
+        Parameters
+        ----------
+        model : sklearn.multiclass.OneVsRestClassifier
+            One-vs-rest classifier of SVC estimators.
+
+        Raises
+        ------
+        TypeError
+            If the model is not a one-vs-rest classifier of dense SVC
+            estimators.
+        """
+        try:
+            estimators = model.estimators_
+            first = estimators[0]
+            header = {
+                'classes': model.classes_.tolist(),
+                'kernel': first.kernel,
+                'gamma': float(first._gamma),
+                'coef0': float(first.coef0),
+                'degree': int(first.degree),
+            }
+            supports = [x.support_ for x in estimators]
+            vectors = [x.support_vectors_ for x in estimators]
+            dual_coefs = [x.dual_coef_[0] for x in estimators]
+            intercepts = [x.intercept_[0] for x in estimators]
+        except (AttributeError, IndexError, TypeError):
+            raise TypeError(f'Unsupported model: {type(model).__name__}')
+        if not isinstance(header['kernel'], str) or any(
+            not isinstance(x, np.ndarray) for x in vectors
+        ):
+            raise TypeError(f'Unsupported model: {type(model).__name__}')
+        # Binary estimators are fitted on the same samples, so their support
+        # vectors are stored once and referenced by sample index.
+        index = np.unique(np.concatenate(supports))
+        n_features = vectors[0].shape[1]
+        arrays = {
+            'vectors': np.empty((index.size, n_features), dtype=np.float64),
+            'intercepts': np.array(intercepts, dtype=np.float64),
+        }
+        for i in range(len(estimators)):
+            support = np.searchsorted(index, supports[i])
+            arrays['vectors'][support] = vectors[i]
+            arrays[f'support_{i}'] = support
+            arrays[f'dual_coef_{i}'] = np.asarray(dual_coefs[i],
+                dtype=np.float64)
+        return cls(header, arrays)
+
+    @classmethod
+    def from_files(cls, header, arrays):
+        """
+        Construct OneVsRestSVC from a JSON header and an NPZ file.
+
+        Parameters
+        ----------
+        header : file-like
+            JSON file with the model parameters.
+        arrays : file-like
+            NPZ file with the model arrays.
+        """
+        header = json.load(header)
+        with np.load(arrays, allow_pickle=False) as f:
+            arrays = dict(f)
+        return cls(header, arrays)
+
+    def to_files(self, header, arrays):
+        """
+        Write the model as a JSON header and a compressed NPZ file.
+
+        Parameters
+        ----------
+        header : str
+            JSON file.
+        arrays : str
+            NPZ file.
+        """
+        with open(header, 'w') as f:
+            json.dump(self.header, f)
+        data = {'vectors': self.vectors, 'intercepts': self.intercepts}
+        for i in range(len(self.intercepts)):
+            data[f'support_{i}'] = self.supports[i]
+            data[f'dual_coef_{i}'] = self.dual_coefs[i]
+        np.savez_compressed(arrays, **data)
+
+    def _kernel(self, X):
+        """Return the kernel matrix between support vectors and samples."""
+        kernel = self.header['kernel']
+        gamma = self.header['gamma']
+        if kernel == 'rbf':
+            K = np.empty((self.vectors.shape[0], X.shape[0]))
+            for j, x in enumerate(X):
+                K[:, j] = np.exp(-gamma * ((self.vectors - x) ** 2).sum(axis=1))
+            return K
+        K = self.vectors @ X.T
+        if kernel == 'linear':
+            return K
+        if kernel == 'poly':
+            return (gamma * K + self.header['coef0']) ** self.header['degree']
+        if kernel == 'sigmoid':
+            return np.tanh(gamma * K + self.header['coef0'])
+        raise ValueError(f'Unsupported kernel: {kernel}')
+
+    def decision_function(self, X):
+        """
+        Return the decision function of each binary estimator.
+
+        Parameters
+        ----------
+        X : array-like
+            Feature matrix with one row per sample.
+
+        Returns
+        -------
+        numpy.ndarray
+            Array with one row per sample and one column per estimator.
+        """
+        X = np.asarray(X, dtype=np.float64)
+        K = self._kernel(X)
+        scores = np.empty((X.shape[0], len(self.intercepts)))
+        for i in range(len(self.intercepts)):
+            scores[:, i] = (
+                self.dual_coefs[i] @ K[self.supports[i]] + self.intercepts[i]
+            )
+        return scores
+
+    def predict(self, X):
+        """
+        Predict class labels for samples.
+
+        Parameters
+        ----------
+        X : array-like
+            Feature matrix with one row per sample.
+
+        Returns
+        -------
+        numpy.ndarray
+            Predicted class labels.
+        """
+        scores = self.decision_function(X)
+        if len(self.classes_) == 2:
+            return self.classes_[(scores[:, 0] > 0).astype(int)]
+        # Match scikit-learn, where the last estimator wins a tie.
+        maxima = scores.max(axis=1, keepdims=True)
+        last = scores.shape[1] - 1 - np.argmax(
+            (scores == maxima)[:, ::-1], axis=1)
+        return self.classes_[last]
+
+def _write_columnar(df, header, arrays):
+    """
+    Write a DataFrame as a JSON header and one NumPy array per column.
+
+    Text columns are stored as category codes with the categories listed in
+    the header, and numeric columns are stored as float64.
+    """
+    columns = []
+    data = {'index': df.index.to_numpy(dtype=str)}
+    for i, (name, s) in enumerate(df.items()):
+        name = list(name) if isinstance(name, tuple) else name
+        if pd.api.types.is_numeric_dtype(s.dtype):
+            data[f'c{i}'] = s.to_numpy(dtype=np.float64)
+            columns.append({'name': name, 'categories': None})
+        else:
+            s = s.astype('category')
+            data[f'c{i}'] = s.cat.codes.to_numpy()
+            columns.append({
+                'name': name,
+                'categories': s.cat.categories.astype(str).to_list(),
+            })
+    with open(header, 'w') as f:
+        json.dump({'columns': columns, 'names': list(df.columns.names)}, f)
+    np.savez_compressed(arrays, **data)
+
+def _read_columnar(header, arrays):
+    """
+    Read a DataFrame written by :func:`_write_columnar`.
+    """
+    header = json.load(header)
+    with np.load(arrays, allow_pickle=False) as f:
+        data = {}
+        names = []
+        for i, column in enumerate(header['columns']):
+            values = f[f'c{i}']
+            if column['categories'] is not None:
+                values = pd.Categorical.from_codes(values,
+                    categories=column['categories'])
+            name = column['name']
+            name = tuple(name) if isinstance(name, list) else name
+            names.append(name)
+            data[i] = values
+        index = f['index']
+    df = pd.DataFrame(data, index=index)
+    if len(header['names']) > 1:
+        df.columns = pd.MultiIndex.from_tuples(names, names=header['names'])
+    else:
+        df.columns = pd.Index(names, name=header['names'][0])
+    return df
+
 class Archive:
     """
     Class for storing various data.
@@ -70,6 +313,7 @@ class Archive:
         fn : str
             ZIP file.
         """
+        from fuc import common
         with tempfile.TemporaryDirectory() as t:
             with open(f'{t}/metadata.txt', 'w') as f:
                 for k, v in self.metadata.items():
@@ -78,12 +322,23 @@ class Archive:
                     f.write(f'{k}={v}\n')
             if 'CovFrame' in self.metadata['SemanticType']:
                 self.data.to_file(f'{t}/data.tsv')
+            elif self.metadata['SemanticType'] in COLUMNAR_TYPES:
+                _write_columnar(self.data, f'{t}/data.json', f'{t}/data.npz')
             elif 'SampleTable' in self.metadata['SemanticType']:
                 self.data.to_csv(f'{t}/data.tsv', sep='\t')
             elif 'VcfFrame' in self.metadata['SemanticType']:
                 self.data.to_file(f'{t}/data.vcf')
             elif 'Model' in self.metadata['SemanticType']:
-                pickle.dump(self.data, open(f'{t}/data.sav', 'wb'))
+                model = self.data
+                if not isinstance(model, OneVsRestSVC):
+                    try:
+                        model = OneVsRestSVC.from_sklearn(model)
+                    except TypeError:
+                        model = None
+                if model is None:
+                    pickle.dump(self.data, open(f'{t}/data.sav', 'wb'))
+                else:
+                    model.to_files(f'{t}/data.json', f'{t}/data.npz')
             else:
                 raise SemanticTypeNotFoundError(self.metadata['SemanticType'])
             zipf = zipfile.ZipFile(fn, 'w', zipfile.ZIP_DEFLATED)
@@ -91,9 +346,15 @@ class Archive:
                 for file in files:
                     if file == '.DS_Store':
                         continue
+                    # NPZ files are already archives, so store them as is.
+                    if file.endswith('.npz'):
+                        compress_type = zipfile.ZIP_STORED
+                    else:
+                        compress_type = None
                     zipf.write(os.path.join(root, file),
                                os.path.relpath(os.path.join(root, file),
-                                               os.path.join(t, '..')))
+                                               os.path.join(t, '..')),
+                               compress_type=compress_type)
             zipf.close()
 
             common.color_print(f'Saved {semantic_type} to: {fn}')
@@ -108,6 +369,7 @@ class Archive:
         fn : str
             ZIP file.
         """
+        from fuc import pyvcf, pycov
         metadata = {}
         zf = zipfile.ZipFile(fn)
         parent = zf.filelist[0].filename.split('/')[0]
@@ -118,6 +380,10 @@ class Archive:
         if 'CovFrame' in metadata['SemanticType']:
             with zf.open(f'{parent}/data.tsv') as fh:
                 data = pycov.CovFrame.from_file(fh)
+        elif metadata['SemanticType'] in COLUMNAR_TYPES:
+            with zf.open(f'{parent}/data.json') as f1, \
+                 zf.open(f'{parent}/data.npz') as f2:
+                data = _read_columnar(f1, io.BytesIO(f2.read()))
         elif 'SampleTable' in metadata['SemanticType']:
             with zf.open(f'{parent}/data.tsv') as fh:
                 data = pd.read_table(fh, dtype={0: str})
@@ -127,8 +393,14 @@ class Archive:
             with zf.open(f'{parent}/data.vcf') as fh:
                 data = pyvcf.VcfFrame.from_file(fh)
         elif 'Model' in metadata['SemanticType']:
-            with zf.open(f'{parent}/data.sav') as fh:
-                data = pickle.load(fh)
+            if f'{parent}/data.json' in zf.namelist():
+                with zf.open(f'{parent}/data.json') as f1, \
+                     zf.open(f'{parent}/data.npz') as f2:
+                    data = OneVsRestSVC.from_files(f1, io.BytesIO(f2.read()))
+            else:
+                # Legacy models are stored as pickled scikit-learn objects.
+                with zf.open(f'{parent}/data.sav') as fh:
+                    data = pickle.load(fh)
         else:
             raise SemanticTypeNotFoundError(metadata['SemanticType'])
         return cls(metadata, data)
@@ -169,6 +441,502 @@ class Archive:
                 f"Expected '{key}={value}' but found '{key}={actual_value}' "
                 f"for semantic type '{semantic_type}'")
 
+def _describe(obj):
+    """Return sizes and counts of an archive, file, or directory."""
+    if isinstance(obj, Archive):
+        result = {'SemanticType': obj.type}
+        if 'VcfFrame' in obj.type:
+            result['Samples'] = len(obj.data.samples)
+            result['Variants'] = obj.data.shape[0]
+        elif 'CovFrame' in obj.type:
+            result['Samples'] = len(obj.data.samples)
+            result['Positions'] = obj.data.shape[0]
+        elif 'SampleTable' in obj.type:
+            result['Samples'] = obj.data.shape[0]
+        return result
+    if os.path.isdir(obj):
+        files = [f'{obj}/{x}' for x in os.listdir(obj)]
+        files = [x for x in files if os.path.isfile(x)]
+        return {'Path': obj, 'Files': len(files),
+            'Bytes': sum(os.path.getsize(x) for x in files)}
+    return {'Path': obj, 'Bytes': os.path.getsize(obj)}
+
+def _reset_peak_rss():
+    """Reset the peak RSS of the current process, if supported (Linux)."""
+    try:
+        with open('/proc/self/clear_refs', 'w') as f:
+            f.write('5')
+        return True
+    except OSError:
+        return False
+
+def _peak_rss(who='self'):
+    """Return the peak RSS of the current process or its children in
+    bytes."""
+    if who == 'self':
+        try:
+            with open('/proc/self/status') as f:
+                for line in f:
+                    if line.startswith('VmHWM:'):
+                        return int(line.split()[1]) * 1024
+        except OSError:
+            pass
+    import resource
+    usage = resource.getrusage(
+        resource.RUSAGE_SELF if who == 'self' else resource.RUSAGE_CHILDREN)
+    # ru_maxrss is in bytes on macOS and in kilobytes elsewhere.
+    return usage.ru_maxrss * (1 if sys.platform == 'darwin' else 1024)
+
+class _Step:
+    """Record of one step, returned by :meth:`Metrics.step`."""
+
+    def __init__(self, record):
+        self.record = record
+
+    def input(self, *objs):
+        """Record sizes and counts of archives, files, or directories."""
+        self.record['Inputs'] += [_describe(x) for x in objs]
+
+    def output(self, *objs):
+        """Record sizes and counts of archives, files, or directories."""
+        self.record['Outputs'] += [_describe(x) for x in objs]
+
+class Metrics:
+    """
+    Class for recording resource usage of pipeline steps.
+
+    For each step, the wall time, CPU time, and peak resident set size
+    (RSS) are recorded along with the number of samples and variants (or
+    positions) and the size of the files going in and out. Peak RSS is
+    reset at the start of each step on Linux; elsewhere, it is the peak
+    since the process started. CPU time of child processes such as Beagle
+    is recorded separately for each step. The operating system only reports
+    the peak RSS of child processes over the lifetime of the process, so
+    for steps that run child processes it is recorded as
+    LifetimeChildPeakRSS: the largest peak of any child process finished
+    so far, which may belong to an earlier step.
+
+    Parameters
+    ----------
+    labels : dict, optional
+        Labels that describe the run (e.g. pipeline and gene).
+
+    Examples
+    --------
+
+    >>> from pypgx import sdk
+    >>> from pypgx.api import utils
+    >>> metrics = sdk.Metrics({'Pipeline': 'LongRead', 'Gene': 'CYP2D6'})
+    >>> alleles = metrics.run('predict-alleles', utils.predict_alleles, consolidated_variants)
+    >>> metrics.write(alleles, 'alleles.zip')
+    >>> with metrics.step('custom-step') as step:
+    ...     step.input('alleles.zip')
+    ...     # Do something.
+    >>> metrics.to_json('run-metrics.json')
+    >>> metrics.to_openmetrics('pypgx.prom')
+    """
+
+    def __init__(self, labels=None):
+        self.labels = {} if labels is None else dict(labels)
+        self.started = datetime.now(timezone.utc)
+        self.start = time.perf_counter()
+        self.steps = []
+
+    @contextlib.contextmanager
+    def step(self, name):
+        """
+        Record the resource usage of the code run in this context.
+
+        Parameters
+        ----------
+        name : str
+            Name of the step.
+
+        Yields
+        ------
+        _Step
+            Object for recording inputs and outputs of the step.
+        """
+        record = {'Name': name, 'Inputs': [], 'Outputs': []}
+        reset = _reset_peak_rss()
+        times = os.times()
+        start = time.perf_counter()
+        try:
+            yield _Step(record)
+        finally:
+            end = os.times()
+            record['WallTime'] = time.perf_counter() - start
+            # os.times() has a resolution of 10 ms at best.
+            cpu = end.user + end.system - times.user - times.system
+            child = (end.children_user + end.children_system
+                - times.children_user - times.children_system)
+            record['CPUTime'] = max(round(cpu, 3), 0.0)
+            record['ChildCPUTime'] = max(round(child, 3), 0.0)
+            record['PeakRSS'] = _peak_rss()
+            record['PeakRSSReset'] = reset
+            # Unlike the other fields, this is not specific to the step.
+            if record['ChildCPUTime'] > 0:
+                record['LifetimeChildPeakRSS'] = _peak_rss('children')
+            else:
+                record['LifetimeChildPeakRSS'] = None
+            self.steps.append(record)
+
+    def run(self, name, func, *args, **kwargs):
+        """
+        Call a function as a step.
+
+        Archives and existing files passed as arguments are recorded as
+        inputs, and a returned archive is recorded as output.
+
+        Parameters
+        ----------
+        name : str
+            Name of the step.
+        func : function
+            Function to call.
+        args, kwargs
+            Arguments for the function.
+
+        Returns
+        -------
+        object
+            Return value of the function.
+        """
+        inputs = [
+            x for x in list(args) + list(kwargs.values())
+            if isinstance(x, Archive) or
+                (isinstance(x, str) and os.path.isfile(x))
+        ]
+        with self.step(name) as step:
+            step.input(*inputs)
+            result = func(*args, **kwargs)
+            if isinstance(result, Archive):
+                step.output(result)
+        return result
+
+    def write(self, archive, path):
+        """
+        Write an archive to a file as a step.
+
+        Parameters
+        ----------
+        archive : pypgx.Archive
+            Archive object.
+        path : str
+            Archive file.
+        """
+        with self.step(f'write:{os.path.basename(path)}') as step:
+            archive.to_file(path)
+            step.output(path)
+
+    def to_dict(self):
+        """dict : Run summary and all steps."""
+        return {
+            **self.labels,
+            'Started': self.started.isoformat(timespec='seconds'),
+            'WallTime': time.perf_counter() - self.start,
+            'Steps': copy.deepcopy(self.steps),
+        }
+
+    def to_json(self, path):
+        """
+        Write the metrics to a JSON file.
+
+        Parameters
+        ----------
+        path : str
+            JSON file.
+        """
+        with open(path, 'w') as f:
+            json.dump(self.to_dict(), f, indent=4)
+
+    def to_openmetrics(self, path):
+        """
+        Write the metrics to a file in the OpenMetrics text format.
+
+        The file is replaced atomically, so it can be written directly to
+        the directory read by the Prometheus node exporter (with the
+        ``.prom`` extension).
+
+        Parameters
+        ----------
+        path : str
+            Output file.
+        """
+        def escape(value):
+            value = str(value).replace('\\', '\\\\').replace('"', '\\"')
+            return value.replace('\n', '\\n')
+
+        def labels(**extra):
+            items = {k.lower(): v for k, v in self.labels.items()}
+            items.update(extra)
+            return ','.join(f'{k}="{escape(v)}"' for k, v in items.items())
+
+        families = [
+            ('step_wall_time_seconds', 'Wall time of a pipeline step.',
+                lambda x: x['WallTime']),
+            ('step_cpu_time_seconds', 'CPU time of a pipeline step.',
+                lambda x: x['CPUTime']),
+            ('step_child_cpu_time_seconds',
+                'CPU time of child processes of a pipeline step.',
+                lambda x: x['ChildCPUTime']),
+            ('step_peak_rss_bytes', 'Peak resident set size of a pipeline '
+                'step.', lambda x: x['PeakRSS']),
+            ('step_output_bytes', 'Size of files written by a pipeline step.',
+                lambda x: sum(y.get('Bytes', 0) for y in x['Outputs'])),
+        ]
+
+        lines = []
+        for name, help, get in families:
+            lines.append(f'# HELP pypgx_{name} {help}')
+            lines.append(f'# TYPE pypgx_{name} gauge')
+            for step in self.steps:
+                lines.append(f'pypgx_{name}{{{labels(step=step["Name"])}}} '
+                    f'{get(step)}')
+        lines.append('# HELP pypgx_run_wall_time_seconds Wall time of a '
+            'pipeline run.')
+        lines.append('# TYPE pypgx_run_wall_time_seconds gauge')
+        lines.append(f'pypgx_run_wall_time_seconds{{{labels()}}} '
+            f'{time.perf_counter() - self.start}')
+        lines.append('# EOF')
+
+        temp = f'{path}.tmp'
+        with open(temp, 'w') as f:
+            f.write('\n'.join(lines) + '\n')
+        os.replace(temp, path)
+
+PROFILERS = ['cprofile', 'tracemalloc', 'sampling']
+
+def _frame_name(filename, lineno, name):
+    """Return a short label for a code location."""
+    for marker in ['site-packages/', 'dist-packages/']:
+        if marker in filename:
+            filename = filename.split(marker)[-1]
+            break
+    else:
+        filename = os.path.basename(filename)
+    return f'{name} ({filename}:{lineno})'
+
+def _stack(frame):
+    """Return the call stack ending at the frame, outermost call first."""
+    stack = []
+    while frame is not None:
+        code = frame.f_code
+        stack.append((code.co_filename, code.co_firstlineno, code.co_name))
+        frame = frame.f_back
+    return tuple(reversed(stack))
+
+class _Sampler(threading.Thread):
+    """Thread that periodically records the call stack of another
+    thread."""
+
+    def __init__(self, thread_id, interval, root):
+        super().__init__(name='pypgx-sampler', daemon=True)
+        self.thread_id = thread_id
+        self.interval = interval
+        self.root = root
+        self.stacks = collections.Counter()
+        self.done = threading.Event()
+
+    def run(self):
+        while not self.done.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = _stack(frame)
+            # Drop the frames that were already running when profiling
+            # started.
+            i = 0
+            for a, b in zip(stack, self.root):
+                if a != b:
+                    break
+                i += 1
+            if stack[i:]:
+                self.stacks[stack[i:]] += 1
+
+class Profiler:
+    """
+    Class for profiling PyPGx.
+
+    Three profilers are available:
+
+    - 'cprofile': Deterministic profiling of every function call with
+      :mod:`cProfile`. Most accurate, but slows down pure Python code.
+    - 'tracemalloc': Memory allocations by line with :mod:`tracemalloc`.
+      Reports the peak traced memory and the allocations still held at the
+      end.
+    - 'sampling': Records the call stack of the profiled thread at a fixed
+      interval from a background thread. The overhead is low enough to
+      leave it on for production runs.
+
+    Each profiler writes a text summary of the top functions or lines
+    (``<name>.txt``) and a full profile for other tools: ``<name>.prof``
+    for pstats or SnakeViz, ``<name>.tracemalloc`` for
+    :meth:`tracemalloc.Snapshot.load`, or ``<name>.folded`` with collapsed
+    stacks for flame graph tools such as speedscope.
+
+    Parameters
+    ----------
+    kind : {'cprofile', 'tracemalloc', 'sampling'}, default: 'cprofile'
+        Profiler to use.
+    top : int, default: 30
+        Number of functions or lines in the summary.
+    interval : float, default: 0.005
+        Seconds between samples (``kind='sampling'``).
+    """
+
+    def __init__(self, kind='cprofile', top=30, interval=0.005):
+        if kind not in PROFILERS:
+            raise ValueError(f"Incorrect profiler: '{kind}'")
+        self.kind = kind
+        self.top = top
+        self.interval = interval
+
+    def start(self):
+        """Start profiling the current thread."""
+        self.start_time = time.perf_counter()
+        if self.kind == 'cprofile':
+            import cProfile
+            self.profiler = cProfile.Profile()
+            self.profiler.enable()
+        elif self.kind == 'tracemalloc':
+            import tracemalloc
+            tracemalloc.start()
+        else:
+            self.sampler = _Sampler(threading.get_ident(), self.interval,
+                _stack(sys._getframe(1)))
+            self.sampler.start()
+
+    def stop(self):
+        """Stop profiling."""
+        self.seconds = time.perf_counter() - self.start_time
+        if self.kind == 'cprofile':
+            self.profiler.disable()
+        elif self.kind == 'tracemalloc':
+            import tracemalloc
+            self.snapshot = tracemalloc.take_snapshot().filter_traces([
+                tracemalloc.Filter(False, '<frozen importlib._bootstrap>'),
+                tracemalloc.Filter(False,
+                    '<frozen importlib._bootstrap_external>'),
+                tracemalloc.Filter(False, tracemalloc.__file__),
+            ])
+            self.current, self.peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+        else:
+            self.sampler.done.set()
+            self.sampler.join()
+
+    def save(self, path='.', name='pypgx'):
+        """
+        Write the profile and its summary.
+
+        Parameters
+        ----------
+        path : str, default: '.'
+            Output directory.
+        name : str, default: 'pypgx'
+            Prefix of the output files.
+
+        Returns
+        -------
+        list
+            Output files.
+        """
+        prefix = os.path.join(path, name)
+        summary = f'{prefix}.txt'
+
+        if self.kind == 'cprofile':
+            import pstats
+            output = f'{prefix}.prof'
+            self.profiler.dump_stats(output)
+            with open(summary, 'w') as f:
+                stats = pstats.Stats(self.profiler, stream=f)
+                stats.sort_stats('cumulative').print_stats(self.top)
+                stats.sort_stats('tottime').print_stats(self.top)
+
+        elif self.kind == 'tracemalloc':
+            output = f'{prefix}.tracemalloc'
+            self.snapshot.dump(output)
+            stats = self.snapshot.statistics('lineno')
+            with open(summary, 'w') as f:
+                f.write(f'Wall time: {self.seconds:.3f} s\n')
+                f.write(f'Peak traced memory: {self.peak / 2**20:.1f} MiB\n')
+                f.write(f'Traced memory at end: '
+                    f'{self.current / 2**20:.1f} MiB\n\n')
+                f.write(f'Top {self.top} lines by memory held at end:\n')
+                for stat in stats[:self.top]:
+                    f.write(f'{stat}\n')
+
+        else:
+            output = f'{prefix}.folded'
+            stacks = self.sampler.stacks
+            with open(output, 'w') as f:
+                for stack, count in stacks.most_common():
+                    names = [_frame_name(*x) for x in stack]
+                    f.write(f"{';'.join(names)} {count}\n")
+            total = sum(stacks.values())
+            inclusive = collections.Counter()
+            exclusive = collections.Counter()
+            for stack, count in stacks.items():
+                for frame in set(stack):
+                    inclusive[frame] += count
+                exclusive[stack[-1]] += count
+            with open(summary, 'w') as f:
+                f.write(f'Wall time: {self.seconds:.3f} s\n')
+                f.write(f'Samples: {total} (every {self.interval * 1000:g} '
+                    f'ms)\n')
+                for title, counter in [('total', inclusive),
+                                       ('self', exclusive)]:
+                    f.write(f'\nTop {self.top} functions by {title} '
+                        f'time:\n')
+                    f.write(f'{"Total%":>8}{"Self%":>8}  Function\n')
+                    for frame, count in counter.most_common(self.top):
+                        f.write(f'{inclusive[frame] / total:>8.1%}'
+                            f'{exclusive[frame] / total:>8.1%}  '
+                            f'{_frame_name(*frame)}\n')
+
+        return [output, summary]
+
+@contextlib.contextmanager
+def profile(kind='cprofile', path='.', name='pypgx', top=30, interval=0.005):
+    """
+    Profile the code run in this context.
+
+    The profile is written even if the code raises an error. See
+    :class:`Profiler` for the available profilers and output files.
+
+    Parameters
+    ----------
+    kind : {'cprofile', 'tracemalloc', 'sampling'}, default: 'cprofile'
+        Profiler to use.
+    path : str, default: '.'
+        Output directory.
+    name : str, default: 'pypgx'
+        Prefix of the output files.
+    top : int, default: 30
+        Number of functions or lines in the summary.
+    interval : float, default: 0.005
+        Seconds between samples (``kind='sampling'``).
+
+    Yields
+    ------
+    Profiler
+        Profiler object.
+
+    Examples
+    --------
+
+    >>> from pypgx import sdk
+    >>> from pypgx.api import utils
+    >>> with sdk.profile('sampling', path='grch37-CYP2D6-pipeline'):
+    ...     alleles = utils.predict_alleles('consolidated-variants.zip')
+    """
+    profiler = Profiler(kind=kind, top=top, interval=interval)
+    profiler.start()
+    try:
+        yield profiler
+    finally:
+        profiler.stop()
+        profiler.save(path=path, name=name)
+
 def compare_metadata(key, *archives):
     """
     Raise IncorrectMetadataError if two or more archives have different
@@ -214,6 +982,7 @@ def parse_pharmvar(fn):
     fn : str
         Gene data directory.
     """
+    from fuc import pyvcf
     gene = os.path.basename(fn).split('-')[0]
 
     rs_dict = {}
@@ -286,10 +1055,12 @@ def simulate_copy_number(
 
     Parameters
     ----------
-    target : str
-        Target archive file with the semantic type CovFrame[CopyNumber].
-    source : str
-        Source archive file with the semantic type CovFrame[CopyNumber].
+    target : str or pypgx.Archive
+        Target archive file or object with the semantic type
+        CovFrame[CopyNumber].
+    source : str or pypgx.Archive
+        Source archive file or object with the semantic type
+        CovFrame[CopyNumber].
     sample : str
         Name of the sample.
     sv : str
@@ -308,8 +1079,13 @@ def simulate_copy_number(
         Target archive the semantic type CovFrame[CopyNumber] with simultated
         samples appended.
     """
-    target = Archive.from_file(target)
-    source = Archive.from_file(source)
+    from fuc import pycov
+
+    if isinstance(target, str):
+        target = Archive.from_file(target)
+
+    if isinstance(source, str):
+        source = Archive.from_file(source)
 
     target.check_type('CovFrame[CopyNumber]')
     source.check_type('CovFrame[CopyNumber]')
@@ -317,23 +1093,31 @@ def simulate_copy_number(
 
     data = source.data.df[sample]
 
-    target.data.df[sample] = data
+    # Draw noise for all samples at once, which gives the same values as
+    # drawing it one sample at a time.
+    noise = np.random.normal(mu, sigma, (n, len(data)))
+    simulated = data.to_numpy() - noise
+    simulated[:, data == 0] = 0
+    simulated[simulated < 0] = 0
 
-    for i in range(n):
-        noise = np.random.normal(mu, sigma, len(data))
-        s = data - noise
-        s[data == 0] = 0
-        s[s < 0] = 0
+    df = target.data.df.copy()
+    names = target.data.samples + [sample]
+    columns = {}
 
+    for i in range(n):
         j = 1
         name = f'{sv}_{i+j}'
-        while name in target.data.samples:
+        while name in names:
             j += 1
             name = f'{sv}_{i+j}'
+        names.append(name)
+        columns[name] = simulated[i]
 
-        target.data.df[name] = s
+    df[sample] = data
+    columns = pd.DataFrame(columns, index=data.index).reindex(df.index)
+    df = pd.concat([df, columns], axis=1)
 
-    return target
+    return Archive(target.copy_metadata(), pycov.CovFrame(df))
 
 def add_cn_samples(target, source, samples):
     """
@@ -356,6 +1140,7 @@ def add_cn_samples(target, source, samples):
         Target archive the semantic type CovFrame[CopyNumber] with new
         samples appended.
     """
+    from fuc import common
     target = Archive.from_file(target)
     source = Archive.from_file(source)
     samples = common.parse_list_or_file(samples)
@@ -1,3 +1,5 @@
+import os
+import tempfile
 import unittest
 
 import pypgx
@@ -85,5 +87,49 @@ class TestPypgx(unittest.TestCase):
         b = pypgx.predict_alleles('test-data/CYP4F2-GRCh38.zip')
         self.assertEqual(['*1;', '*2;', ';', '*2:19-16008388-A-C:0.5;*1:default;'], a.data.loc['A'].to_list(), b.data.loc['A'].to_list())
 
+    def test_cohort_results_archive(self):
+        data = pd.concat({
+            'CYP2D6': pd.DataFrame({
+                'Genotype': ['*1/*2', '*4/*5', np.nan],
+                'ActivityScore': [2.0, 0.0, np.nan],
+            }, index=['A', 'B', 'C']),
+            'CYP2C19': pd.DataFrame({
+                'Genotype': ['*1/*17', '*2/*2', '*1/*1'],
+                'ActivityScore': [np.nan, np.nan, np.nan],
+            }, index=['A', 'B', 'C']),
+        }, axis=1, names=['Gene', 'Field'])
+        for column in data.columns:
+            if column[1] == 'Genotype':
+                data[column] = data[column].astype('category')
+        metadata = {
+            'Assembly': 'GRCh37',
+            'SemanticType': 'SampleTable[CohortResults]',
+        }
+        with tempfile.TemporaryDirectory() as t:
+            fn = os.path.join(t, 'cohort.zip')
+            pypgx.Archive(metadata, data).to_file(fn)
+            result = pypgx.Archive.from_file(fn)
+        self.assertEqual(metadata, result.metadata)
+        self.assertEqual(data.index.to_list(), result.data.index.to_list())
+        pd.testing.assert_frame_equal(data, result.data, check_index_type=False)
+
+    def test_one_vs_rest_svc(self):
+        from sklearn.multiclass import OneVsRestClassifier
+        from sklearn.svm import SVC
+        rng = np.random.default_rng(0)
+        X = rng.normal(size=(60, 5))
+        y = np.repeat(['1,1', '1,2', '2,2'], 20)
+        X[y == '1,2'] += 2
+        X[y == '2,2'] += 4
+        model = OneVsRestClassifier(SVC(random_state=1)).fit(X, y)
+        Z = rng.normal(loc=2, scale=2, size=(100, 5))
+        with tempfile.TemporaryDirectory() as t:
+            header = os.path.join(t, 'model.json')
+            arrays = os.path.join(t, 'model.npz')
+            pypgx.sdk.utils.OneVsRestSVC.from_sklearn(model).to_files(header, arrays)
+            with open(header) as f1, open(arrays, 'rb') as f2:
+                svc = pypgx.sdk.utils.OneVsRestSVC.from_files(f1, f2)
+        self.assertEqual(model.predict(Z).tolist(), svc.predict(Z).tolist())
+
 if __name__ == '__main__':
     unittest.main()